@@ -0,0 +1,169 @@
+"""Background execution of long computations for the Tk GUI
+
+Jobs run on a thread pool; their progress and results are handed back to
+the Tk thread by polling with root.after, so callbacks may touch widgets.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from config import Config
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that noticed it was cancelled"""
+
+    pass
+
+
+class Job:
+    """Handle shared between the GUI and a running computation"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.future: Optional[Future] = None
+        self.on_done = None
+        self.on_progress = None
+        self.on_error = None
+        self._cancel_event = threading.Event()
+        self._progress: Optional[Tuple[int, int]] = None
+        self._reported: Optional[Tuple[int, int]] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; its result will never be delivered"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Call periodically from the job to stop early once cancelled"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def report_progress(self, done: int, total: int):
+        """Record progress from the worker thread (delivered on next poll)"""
+        self._progress = (done, total)
+
+    def checkpoint(self, done: int, total: int):
+        """
+        Report progress and stop if cancelled. Pass it as the progress
+        callback of chunked work (simulate, ScenarioSet.compare, ...) so a
+        single long computation can be followed and cancelled chunk by chunk.
+        """
+        self.report_progress(done, total)
+        self.check_cancelled()
+
+
+class BackgroundRunner:
+    """
+    Runs jobs on a thread pool and delivers progress, results and errors
+    on the Tk thread. Submitting a job under a name already in use cancels
+    the older one, so stale results are never shown. Without a root,
+    jobs run inline and callbacks fire immediately (headless use).
+    """
+
+    def __init__(
+        self,
+        root=None,
+        workers: int = Config.BACKGROUND["workers"],
+        poll_ms: int = Config.BACKGROUND["poll_ms"],
+    ):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.jobs: Dict[str, Job] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers) if root else None
+        self.polling = None
+
+    def submit(
+        self,
+        name: str,
+        function: Callable,
+        *args,
+        on_done: Optional[Callable] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> Job:
+        """
+        Run function(job, *args) in the background
+        Args:
+            name: Job slot; a running job with the same name is cancelled
+            on_done: Called with the result on the Tk thread
+            on_progress: Called with (done, total) as the job reports it
+            on_error: Called with the exception if the job fails
+        """
+        self.cancel(name)
+        job = Job(name)
+        job.on_done, job.on_progress, job.on_error = on_done, on_progress, on_error
+
+        if self.executor is None:
+            self._run_inline(job, function, args)
+            return job
+
+        job.future = self.executor.submit(function, job, *args)
+        self.jobs[name] = job
+        if self.polling is None:
+            self.polling = self.root.after(self.poll_ms, self.poll)
+        return job
+
+    def _run_inline(self, job: Job, function: Callable, args: tuple):
+        try:
+            result = function(job, *args)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if job.on_error:
+                job.on_error(e)
+                return
+            raise
+        if job.on_done:
+            job.on_done(result)
+
+    def is_running(self, name: str) -> bool:
+        return name in self.jobs
+
+    def cancel(self, name: Optional[str] = None):
+        """Cancel the named job, or every job if name is None"""
+        names = list(self.jobs) if name is None else [name]
+        for job_name in names:
+            job = self.jobs.pop(job_name, None)
+            if job is not None:
+                job.cancel()
+
+    def poll(self):
+        """Deliver progress and finished results; reschedules while busy"""
+        self.polling = None
+        for name, job in list(self.jobs.items()):
+            progress = job._progress
+            if progress != job._reported and job.on_progress:
+                job._reported = progress
+                job.on_progress(*progress)
+
+            if not job.future.done():
+                continue
+            del self.jobs[name]
+            if job.cancelled:
+                continue
+            error = job.future.exception()
+            if isinstance(error, JobCancelled):
+                continue
+            if error is not None:
+                if job.on_error:
+                    job.on_error(error)
+                continue
+            if job.on_done:
+                job.on_done(job.future.result())
+
+        if self.jobs:
+            self.polling = self.root.after(self.poll_ms, self.poll)
+
+    def shutdown(self):
+        """Cancel everything and stop the worker threads"""
+        self.cancel()
+        if self.polling is not None:
+            self.root.after_cancel(self.polling)
+            self.polling = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
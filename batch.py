@@ -0,0 +1,155 @@
+"""Headless batch processing of calculator input records"""
+
+import csv
+import json
+from typing import IO, Dict, Iterator, Optional, Tuple
+
+from cents import default_calculator
+from config import Config
+from loan import InputValidator, LoanCalculator, LoanSummary, ValidationError
+
+INPUT_FIELDS = (
+    "cijena_po_kvadratu",
+    "ukupno_kvadrata",
+    "cijena_parkirnog_mjesta",
+    "vlastito_ucesce",
+    "postotak_za_kaparu",
+    "stambeni_kredit_kamata",
+    "stambeni_kredit_godine",
+    "gotovinski_kredit_kamata",
+    "gotovinski_kredit_godine",
+)
+
+RESULT_FIELDS = LoanSummary._fields
+
+FORMATS = ("csv", "jsonl")
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Lazily yield (row_number, record) pairs from a CSV or JSONL stream.
+    Records that cannot be parsed are yielded as ValidationError instances.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        row_number = 0
+        while True:
+            row_number += 1
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # The reader resumes at the next line, so skip just this one
+                yield row_number, ValidationError(f"Neispravan CSV zapis: {e}.")
+                continue
+            yield row_number, record
+
+    row_number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, ValidationError(f"Neispravan JSON zapis: {e.msg}.")
+            continue
+        if not isinstance(record, dict):
+            yield row_number, ValidationError("JSON zapis mora biti objekt.")
+            continue
+        yield row_number, record
+
+
+def validate_record(record: Dict[str, object]) -> Dict[str, float]:
+    """Fill in default loan parameters and validate a single input record"""
+    inputs = dict(Config.DEFAULTS)
+    inputs.update(
+        (field_id, str(value))
+        for field_id, value in record.items()
+        if value is not None and value != ""
+    )
+    missing = [field_id for field_id in INPUT_FIELDS if field_id not in inputs]
+    if missing:
+        raise ValidationError(f"Nedostaju polja: {', '.join(missing)}.")
+
+    return InputValidator.validate_inputs(inputs)
+
+
+def calculate_record(
+    calculator: LoanCalculator, record: Dict[str, object]
+) -> LoanSummary:
+    """Validate a single input record and calculate both loans"""
+    validated = validate_record(record)
+    total_price = calculator.calculate_property_costs(
+        validated["price_per_sqm"],
+        validated["total_sqm"],
+        validated["parking_price"],
+    )
+    return calculator.calculate_loan_summary(
+        total_price=total_price,
+        own_money=validated["down_payment"],
+        down_payment_percentage=validated["advance_percentage"],
+        mortgage_rate=validated["mortgage_rate"],
+        mortgage_years=validated["mortgage_years"],
+        cash_loan_rate=validated["cash_loan_rate"],
+        cash_loan_years=validated["cash_loan_years"],
+    )
+
+
+class RowWriter:
+    """Writes result or error rows to a stream in CSV or JSONL format"""
+
+    def __init__(self, stream: IO[str], fmt: str, fields: Tuple[str, ...]):
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = fields
+        if fmt == "csv":
+            self.writer = csv.writer(stream)
+            self.writer.writerow(fields)
+
+    def write(self, values: tuple):
+        """Write one row of values in field order"""
+        if self.fmt == "csv":
+            self.writer.writerow(values)
+        else:
+            self.stream.write(json.dumps(dict(zip(self.fields, values))))
+            self.stream.write("\n")
+
+
+def process_stream(
+    source: IO[str],
+    output: IO[str],
+    errors: IO[str],
+    fmt: str,
+    calculator: Optional[LoanCalculator] = None,
+) -> Tuple[int, int]:
+    """
+    Stream records from source to output, one result row per valid record.
+    Invalid records, and records whose calculation fails, are reported to
+    errors instead; either way the stream carries on with the next record.
+    The engine follows Config.EXACT unless a calculator is given.
+    Returns: (processed_rows, error_rows)
+    """
+    calculator = calculator or default_calculator()
+    result_writer = RowWriter(output, fmt, ("row",) + RESULT_FIELDS)
+    error_writer = RowWriter(errors, fmt, ("row", "error"))
+    processed = failed = 0
+
+    for row_number, record in read_records(source, fmt):
+        try:
+            if isinstance(record, ValidationError):
+                raise record
+            results = calculate_record(calculator, record)
+        except ValidationError as e:
+            message = str(e)
+        except Exception as e:
+            message = f"Greška u izračunu: {e}"
+        else:
+            result_writer.write((row_number,) + results)
+            processed += 1
+            continue
+        error_writer.write((row_number, message))
+        failed += 1
+
+    return processed, failed
@@ -0,0 +1,248 @@
+"""Reproducible benchmarks for the loan engine and the GUI calculate path
+
+Usage:
+    python benchmark.py --size small medium --output results.json
+    python benchmark.py --repeat 5 --save-baseline benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from incremental import IncrementalLoanEvaluator
+from loan import InputValidator, LoanCalculator
+
+SIZES = {
+    "small": 1_000,
+    "medium": 20_000,
+    "large": 200_000,
+}
+
+SEED = 20240101
+
+
+def generate_inputs(count: int, seed: int = SEED) -> List[Dict[str, str]]:
+    """Generate raw GUI-style input records within validation limits"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        records.append(
+            {
+                "cijena_po_kvadratu": f"{rng.uniform(1500, 5000):.2f}",
+                "ukupno_kvadrata": f"{rng.uniform(30, 200):.2f}",
+                "cijena_parkirnog_mjesta": rng.choice(["0", "15000", "25000"]),
+                "vlastito_ucesce": f"{rng.choice([0, 5000, 20000, 60000]):d}",
+                "postotak_za_kaparu": rng.choice(["10", "15", "20"]),
+                "stambeni_kredit_kamata": rng.choice(["2.89", "3.2", "3.75"]),
+                "stambeni_kredit_godine": rng.choice(["20", "30", "40"]),
+                "gotovinski_kredit_kamata": rng.choice(["4.5", "5.9", "6.99"]),
+                "gotovinski_kredit_godine": rng.choice(["5", "7", "10"]),
+            }
+        )
+    return records
+
+
+class StubEntry:
+    """Stands in for tk.Entry, returning a fixed value"""
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def get(self) -> str:
+        return self.value
+
+
+class StubLabel:
+    """Stands in for tk.Label, recording the last configured text"""
+
+    def __init__(self):
+        self.text = ""
+
+    def config(self, **options):
+        self.text = options.get("text", self.text)
+
+    configure = config
+
+
+def make_stub_gui(calculator: LoanCalculator):
+    """Build a LoanCalculatorGUI without a display, widgets replaced by stubs"""
+    from gui import LoanCalculatorGUI
+
+    gui = LoanCalculatorGUI.__new__(LoanCalculatorGUI)
+    gui.init_state(None)
+    gui.calculator = calculator
+    gui.evaluator = IncrementalLoanEvaluator(calculator)
+    gui.output_labels = {
+        field_id: StubLabel()
+        for field_id in (
+            "ukupna_cijena",
+            "za_stambeni_kredit",
+            "za_gotovinski_kredit",
+            "anuitet_stambeni",
+            "ukupno_stambeni",
+            "kamata_stambeni",
+            "anuitet_gotovinski",
+            "ukupno_gotovinski",
+            "kamata_gotovinski",
+        )
+    }
+    return gui
+
+
+def build_cases(records: List[Dict[str, str]]) -> Dict[str, Callable[[], None]]:
+    """Return benchmark name -> callable processing every record once"""
+    calculator = LoanCalculator()
+    validated = [InputValidator.validate_inputs(record) for record in records]
+    prices = [
+        calculator.calculate_property_costs(
+            v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+        )
+        for v in validated
+    ]
+    amounts = [
+        calculator.calculate_loan_amounts(
+            price, v["down_payment"], v["advance_percentage"]
+        )
+        for price, v in zip(prices, validated)
+    ]
+
+    def validate_inputs():
+        for record in records:
+            InputValidator.validate_inputs(record)
+
+    def calculate_loan_amounts():
+        for price, v in zip(prices, validated):
+            calculator.calculate_loan_amounts(
+                price, v["down_payment"], v["advance_percentage"]
+            )
+
+    def calculate_loan_details():
+        for (mortgage_amount, _), v in zip(amounts, validated):
+            calculator.calculate_loan_details(
+                mortgage_amount, v["mortgage_rate"], v["mortgage_years"]
+            )
+
+    def calculate_complete_loan_details():
+        for price, v in zip(prices, validated):
+            calculator.calculate_complete_loan_details(
+                total_price=price,
+                own_money=v["down_payment"],
+                down_payment_percentage=v["advance_percentage"],
+                mortgage_rate=v["mortgage_rate"],
+                mortgage_years=v["mortgage_years"],
+                cash_loan_rate=v["cash_loan_rate"],
+                cash_loan_years=v["cash_loan_years"],
+            )
+
+    gui = make_stub_gui(calculator)
+    entries = [
+        {field_id: StubEntry(value) for field_id, value in record.items()}
+        for record in records
+    ]
+
+    def gui_calculate():
+        for inputs in entries:
+            gui.inputs = inputs
+            gui.calculate()
+
+    return {
+        "validate_inputs": validate_inputs,
+        "calculate_loan_amounts": calculate_loan_amounts,
+        "calculate_loan_details": calculate_loan_details,
+        "calculate_complete_loan_details": calculate_complete_loan_details,
+        "gui_calculate": gui_calculate,
+    }
+
+
+def run_benchmarks(sizes: List[str], repeat: int) -> dict:
+    """Run every case for every size, keeping the best of repeat runs"""
+    results = {}
+    for size in sizes:
+        count = SIZES[size]
+        cases = build_cases(generate_inputs(count))
+        for name, case in cases.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                case()
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results[f"{name}[{size}]"] = {
+                "calls": count,
+                "best_seconds": best,
+                "per_call_us": best / count * 1e6,
+            }
+            print(f"{name}[{size}]: {best / count * 1e6:.3f} µs/call", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return descriptions of benchmarks slower than baseline by > threshold"""
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["per_call_us"] / reference["per_call_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {reference['per_call_us']:.3f} -> "
+                f"{result['per_call_us']:.3f} µs/call ({ratio - 1:+.1%})"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size", nargs="+", choices=SIZES, default=["small", "medium"]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="store results as a new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed slowdown against the baseline (default: 0.10 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.size, args.repeat)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
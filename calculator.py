@@ -1,15 +1,107 @@
 """Main entry point for the loan calculator application"""
 
-import tkinter as tk
-from gui import LoanCalculatorGUI
+import argparse
+import sys
 
+from config import Config
 
-def main():
-    """Main application entry point"""
+
+def run_gui():
+    """Start the Tkinter application"""
+    import tkinter as tk
+    from gui import LoanCalculatorGUI
+    from instrumentation import configure_from_env
+
+    configure_from_env(include_gui=True)
     root = tk.Tk()
     app = LoanCalculatorGUI(root)
     root.mainloop()
 
 
+def run_batch(args: argparse.Namespace) -> int:
+    """Process input records without a display"""
+    from batch import process_stream
+    from cents import default_calculator
+    from instrumentation import configure_from_env
+
+    configure_from_env()
+    source = sys.stdin
+    output = sys.stdout
+    errors = sys.stderr
+    try:
+        if args.input != "-":
+            source = open(args.input, newline="", encoding="utf-8")
+        if args.output:
+            output = open(args.output, "w", newline="", encoding="utf-8")
+        if args.errors:
+            errors = open(args.errors, "w", newline="", encoding="utf-8")
+        _, failed = process_stream(
+            source, output, errors, args.format, default_calculator(args.exact)
+        )
+    finally:
+        for stream in (source, output, errors):
+            if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                stream.close()
+
+    return 1 if failed else 0
+
+
+def run_service(args: argparse.Namespace) -> int:
+    """Serve the calculator over local HTTP"""
+    from instrumentation import configure_from_env
+    from service import serve
+
+    configure_from_env()
+    serve(args.host, args.port)
+    return 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Kalkulator kredita za nekretninu")
+    parser.add_argument(
+        "--batch",
+        dest="input",
+        nargs="?",
+        const="-",
+        metavar="INPUT",
+        help="obradi zapise iz datoteke ili standardnog ulaza (-) bez sučelja",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        default="csv",
+        help="format ulaznih i izlaznih zapisa (zadano: csv)",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        default=None,
+        help="računaj u centima s bankovnim zaokruživanjem rata",
+    )
+    parser.add_argument("--output", help="datoteka za rezultate (zadano: stdout)")
+    parser.add_argument("--errors", help="datoteka za greške (zadano: stderr)")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="pokreni lokalni HTTP/JSON servis umjesto sučelja",
+    )
+    parser.add_argument("--host", default=Config.SERVICE["host"])
+    parser.add_argument("--port", type=int, default=Config.SERVICE["port"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Main application entry point"""
+    args = parse_args(argv)
+    if args.input is not None:
+        return run_batch(args)
+    if args.serve:
+        return run_service(args)
+
+    run_gui()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
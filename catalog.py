@@ -0,0 +1,267 @@
+"""Indexed catalog of new-build projects and their unit types"""
+
+import functools
+import json
+import os
+import sqlite3
+import urllib.request
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import Config, InvestorPreset
+
+ENV_CATALOG = "KALKULATOR_CATALOG"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    investor TEXT NOT NULL,
+    project TEXT NOT NULL,
+    search_key TEXT NOT NULL,
+    updates TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    position INTEGER NOT NULL,
+    unit_type TEXT NOT NULL,
+    area TEXT NOT NULL,
+    search_key TEXT NOT NULL,
+    PRIMARY KEY (project_id, position)
+);
+CREATE INDEX IF NOT EXISTS projects_by_investor ON projects(investor, project);
+CREATE INDEX IF NOT EXISTS projects_by_project ON projects(project);
+CREATE INDEX IF NOT EXISTS units_by_type ON units(unit_type);
+CREATE UNIQUE INDEX IF NOT EXISTS units_by_project ON units(project_id, unit_type);
+"""
+
+
+CATALOG_TABLES = {"projects", "units"}
+
+
+class CatalogError(Exception):
+    """Catalog source missing, unreadable or not a catalog"""
+
+    pass
+
+
+def _search_key(text: str) -> str:
+    return text.casefold()
+
+
+def _like_pattern(query: str) -> str:
+    """Case-insensitive substring pattern for LIKE ... ESCAPE '\\'"""
+    escaped = (
+        _search_key(query)
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+    return f"%{escaped}%"
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """Split a display name like "Pionir - Čavićeva" into investor and project"""
+    investor, separator, project = name.partition(" - ")
+    return (investor, project) if separator else (name, name)
+
+
+class PresetCatalog:
+    """
+    Investor presets and unit types stored in SQLite with indexes by
+    investor, project and unit type. The source is loaded on first use:
+        None              built from Config.PRESETS
+        *.json            imported into an in-memory database
+        anything else     opened as an existing SQLite database file
+    A source that cannot be opened raises CatalogError on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        try:
+            return self._connect()
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            raise CatalogError(
+                f"Katalog '{self.path}' nije moguće otvoriti: {e}"
+            ) from e
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path and not self.path.endswith(".json"):
+            # mode=ro: a mistyped path must fail instead of creating an
+            # empty database, and an unrelated database is never modified
+            uri = urllib.request.pathname2url(os.path.abspath(self.path))
+            connection = sqlite3.connect(
+                f"file:{uri}?mode=ro", uri=True, check_same_thread=False
+            )
+            tables = {
+                name
+                for (name,) in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            missing = CATALOG_TABLES - tables
+            if missing:
+                connection.close()
+                raise CatalogError(
+                    f"Katalog '{self.path}' nije katalog novogradnje"
+                    f" (nedostaju tablice: {', '.join(sorted(missing))})."
+                )
+            return connection
+
+        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        connection.executescript(SCHEMA)
+        if self.path:
+            with open(self.path, encoding="utf-8") as f:
+                projects = json.load(f)["projects"]
+        else:
+            projects = self.config_projects()
+        self.import_projects(connection, projects)
+        return connection
+
+    @staticmethod
+    def config_projects() -> List[dict]:
+        """Config.PRESETS investors in the catalog's JSON project format"""
+        projects = []
+        for name, preset in Config.PRESETS["investor_type"].options.items():
+            if preset is None:
+                continue
+            updates = dict(preset.updates)
+            apartment_types = updates.pop("apartment_types", {})
+            projects.append(
+                {"name": name, "updates": updates, "apartment_types": apartment_types}
+            )
+        return projects
+
+    @staticmethod
+    def import_projects(connection: sqlite3.Connection, projects: List[dict]):
+        """
+        Insert projects given as dicts with "name", "updates" and
+        "apartment_types" keys, plus optional "investor" and "project"
+        """
+        with connection:
+            for project in projects:
+                name = project["name"]
+                investor, project_name = split_name(name)
+                cursor = connection.execute(
+                    "INSERT INTO projects"
+                    " (name, investor, project, search_key, updates)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        name,
+                        project.get("investor", investor),
+                        project.get("project", project_name),
+                        _search_key(name),
+                        json.dumps(project.get("updates", {}), ensure_ascii=False),
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO units"
+                    " (project_id, position, unit_type, area, search_key)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (
+                            cursor.lastrowid,
+                            position,
+                            unit_type,
+                            str(area),
+                            _search_key(unit_type),
+                        )
+                        for position, (unit_type, area) in enumerate(
+                            project.get("apartment_types", {}).items()
+                        )
+                    ),
+                )
+
+    def save(self, path: str):
+        """Write the catalog to an SQLite database file"""
+        with sqlite3.connect(path) as target:
+            self.connection.backup(target)
+
+    def names(self, query: str = "", limit: Optional[int] = None) -> List[str]:
+        """Display names containing query (case-insensitive), in catalog order"""
+        rows = self.connection.execute(
+            "SELECT name FROM projects WHERE search_key LIKE ? ESCAPE '\\'"
+            " ORDER BY id LIMIT ?",
+            (_like_pattern(query), -1 if limit is None else limit),
+        )
+        return [name for (name,) in rows]
+
+    def projects_by_investor(self, investor: str) -> List[str]:
+        """Display names of every project of an investor"""
+        rows = self.connection.execute(
+            "SELECT name FROM projects WHERE investor = ? ORDER BY project",
+            (investor,),
+        )
+        return [name for (name,) in rows]
+
+    def projects_with_unit_type(self, unit_type: str) -> List[str]:
+        """Display names of every project offering a unit type"""
+        rows = self.connection.execute(
+            "SELECT p.name FROM units u JOIN projects p ON p.id = u.project_id"
+            " WHERE u.unit_type = ? ORDER BY p.id",
+            (unit_type,),
+        )
+        return [name for (name,) in rows]
+
+    def apartment_types(
+        self, name: str, query: str = "", limit: Optional[int] = None
+    ) -> List[str]:
+        """Unit types of a project containing query, in catalog order"""
+        rows = self.connection.execute(
+            "SELECT u.unit_type FROM units u JOIN projects p ON p.id = u.project_id"
+            " WHERE p.name = ? AND u.search_key LIKE ? ESCAPE '\\'"
+            " ORDER BY u.position LIMIT ?",
+            (name, _like_pattern(query), -1 if limit is None else limit),
+        )
+        return [unit_type for (unit_type,) in rows]
+
+    def area(self, name: str, unit_type: str) -> Optional[str]:
+        """Area of a unit type in a project, or None if unknown"""
+        row = self.connection.execute(
+            "SELECT u.area FROM units u JOIN projects p ON p.id = u.project_id"
+            " WHERE p.name = ? AND u.unit_type = ?",
+            (name, unit_type),
+        ).fetchone()
+        return row[0] if row else None
+
+    def preset(self, name: str) -> Optional[InvestorPreset]:
+        """Full preset for a project, including its apartment types"""
+        row = self.connection.execute(
+            "SELECT id, updates FROM projects WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        project_id, updates = row
+        updates = json.loads(updates)
+        updates["apartment_types"] = dict(
+            self.connection.execute(
+                "SELECT unit_type, area FROM units WHERE project_id = ?"
+                " ORDER BY position",
+                (project_id,),
+            )
+        )
+        return InvestorPreset(name=name, updates=updates)
+
+    def iter_units(self) -> Iterator[Tuple[str, str, str, Dict[str, str]]]:
+        """Yield (name, unit_type, area, updates) for every unit in the catalog"""
+        rows = self.connection.execute(
+            "SELECT p.name, u.unit_type, u.area, p.updates"
+            " FROM projects p JOIN units u ON u.project_id = p.id"
+            " ORDER BY p.id, u.position"
+        )
+        for name, unit_type, area, updates in rows:
+            yield name, unit_type, area, json.loads(updates)
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog() -> PresetCatalog:
+    """Shared catalog from KALKULATOR_CATALOG, Config.CATALOG or Config.PRESETS"""
+    return PresetCatalog(os.environ.get(ENV_CATALOG) or Config.CATALOG["path"])
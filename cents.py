@@ -0,0 +1,360 @@
+"""Exact amortization in integer cents, rounded per installment like a bank
+
+Amounts are whole cents and annual rates whole units of 1 / RATE_SCALE, so
+every step is integer arithmetic with an explicit rounding mode; no float
+or decimal.Decimal is involved once the inputs are converted.
+"""
+
+import decimal
+import functools
+import itertools
+import math
+from array import array
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from config import Config
+from loan import (
+    ArrayLike,
+    LoanBatchResult,
+    LoanCalculator,
+    LoanResult,
+    ValidationError,
+    _broadcast,
+)
+from schedule import ScheduleRow
+
+RATE_SCALE = 10**8  # Annual rates are exact to 0.000001 %
+ROUNDING_MODES = (
+    decimal.ROUND_HALF_UP,
+    decimal.ROUND_HALF_EVEN,
+    decimal.ROUND_HALF_DOWN,
+    decimal.ROUND_DOWN,
+    decimal.ROUND_UP,
+    decimal.ROUND_CEILING,
+    decimal.ROUND_FLOOR,
+    decimal.ROUND_05UP,
+)
+
+
+def round_div(numerator: int, denominator: int, mode: str) -> int:
+    """numerator / denominator rounded to an integer (denominator > 0)"""
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder == 0:
+        return quotient
+    # divmod floors, so the exact value lies between quotient and quotient + 1
+    twice = 2 * remainder
+    if mode == decimal.ROUND_HALF_UP:
+        round_up = twice >= denominator if quotient >= 0 else twice > denominator
+    elif mode == decimal.ROUND_HALF_EVEN:
+        round_up = twice > denominator or (twice == denominator and quotient % 2)
+    elif mode == decimal.ROUND_HALF_DOWN:
+        round_up = twice > denominator if quotient >= 0 else twice >= denominator
+    elif mode == decimal.ROUND_DOWN:
+        round_up = quotient < 0
+    elif mode == decimal.ROUND_UP:
+        round_up = quotient >= 0
+    elif mode == decimal.ROUND_CEILING:
+        round_up = True
+    elif mode == decimal.ROUND_FLOOR:
+        round_up = False
+    elif mode == decimal.ROUND_05UP:
+        # Away from zero only if the result toward zero ends in 0 or 5
+        toward_zero = quotient if quotient >= 0 else quotient + 1
+        round_up = (toward_zero % 5 == 0) == (quotient >= 0)
+    else:
+        raise ValueError(
+            f"Unknown rounding mode {mode!r}, use one of {ROUNDING_MODES}"
+        )
+    return quotient + 1 if round_up else quotient
+
+
+def to_cents(amount: float, mode: str = decimal.ROUND_HALF_UP) -> int:
+    """Exact value of a float amount in cents, rounded with mode"""
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValidationError(f"Iznos mora biti konačan broj, a ne {amount}.")
+    numerator, denominator = amount.as_integer_ratio()
+    return round_div(numerator * 100, denominator, mode)
+
+
+def to_rate_units(annual_rate: float) -> int:
+    """Annual rate as a decimal (0.0289 for 2.89%) in units of 1 / RATE_SCALE"""
+    return round(annual_rate * RATE_SCALE)
+
+
+@functools.lru_cache(maxsize=Config.CACHE["annuity_factor_size"])
+def annuity_ratio(rate_units: int, months: int) -> Tuple[int, int]:
+    """
+    Exact monthly payment per cent of principal as (numerator, denominator)
+    With i = r / D monthly, P * i * (1 + i)^n / ((1 + i)^n - 1) equals
+    P * r * (D + r)^n / (D * ((D + r)^n - D^n)).
+    """
+    if rate_units == 0:
+        return 1, months
+    scale = 12 * RATE_SCALE
+    growth = (scale + rate_units) ** months
+    return rate_units * growth, scale * (growth - scale**months)
+
+
+class CentLoanResult(NamedTuple):
+    """Loan totals in cents; the last installment absorbs rounding"""
+
+    monthly_payment: int
+    last_payment: int
+    installments: int
+    total_payment: int
+    total_interest: int
+
+    def to_loan_result(self) -> LoanResult:
+        """Same values in euros, shaped like LoanCalculator's results"""
+        return LoanResult(
+            self.monthly_payment / 100,
+            self.total_payment / 100,
+            self.total_interest / 100,
+        )
+
+
+def iter_cent_schedule(
+    principal: int,
+    rate_units: int,
+    months: int,
+    payment_rounding: str = Config.EXACT["payment_rounding"],
+    interest_rounding: str = Config.EXACT["interest_rounding"],
+) -> Iterator[ScheduleRow]:
+    """
+    Yield the installments of a loan with every amount in whole cents
+    Args:
+        principal: Loan amount in cents
+        rate_units: Annual rate from to_rate_units
+        months: Number of installments
+    Interest is rounded each month; the last installment pays off whatever
+    balance remains, which also ends the loan early if rounding the payment
+    up has already covered it.
+    """
+    if principal <= 0:
+        return
+    numerator, denominator = annuity_ratio(rate_units, months)
+    payment = round_div(principal * numerator, denominator, payment_rounding)
+    scale = 12 * RATE_SCALE
+    balance = principal
+
+    for month in range(1, months + 1):
+        interest = round_div(balance * rate_units, scale, interest_rounding)
+        if month == months or balance + interest <= payment:
+            yield ScheduleRow(month, balance + interest, interest, balance, 0)
+            return
+        balance -= payment - interest
+        yield ScheduleRow(month, payment, interest, payment - interest, balance)
+
+
+def amortize_cents(
+    principal: int,
+    rate_units: int,
+    months: int,
+    payment_rounding: str = Config.EXACT["payment_rounding"],
+    interest_rounding: str = Config.EXACT["interest_rounding"],
+) -> CentLoanResult:
+    """Totals of iter_cent_schedule without building the rows"""
+    if principal <= 0:
+        return CentLoanResult(0, 0, 0, 0, 0)
+    numerator, denominator = annuity_ratio(rate_units, months)
+    payment = round_div(principal * numerator, denominator, payment_rounding)
+    scale = 12 * RATE_SCALE
+    balance = principal
+    total_interest = 0
+
+    if interest_rounding == decimal.ROUND_HALF_UP:
+        # Inlined round_div for the common mode; this loop is the hot path
+        half = scale // 2
+        for month in range(1, months + 1):
+            interest = (balance * rate_units + half) // scale
+            total_interest += interest
+            if month == months or balance + interest <= payment:
+                break
+            balance -= payment - interest
+    else:
+        for month in range(1, months + 1):
+            interest = round_div(balance * rate_units, scale, interest_rounding)
+            total_interest += interest
+            if month == months or balance + interest <= payment:
+                break
+            balance -= payment - interest
+
+    last_payment = balance + interest
+    return CentLoanResult(
+        payment,
+        last_payment,
+        month,
+        payment * (month - 1) + last_payment,
+        total_interest,
+    )
+
+
+class CentSchedule:
+    """
+    iter_cent_schedule in euros, with the interface of schedule.LazySchedule
+    so the GUI views show exactly the installments the exact engine totals.
+    Rows are built up front; even a 40-year loan has only 480 of them.
+    """
+
+    def __init__(
+        self,
+        principal: float,
+        annual_rate: float,
+        years: int,
+        payment_rounding: str = Config.EXACT["payment_rounding"],
+        interest_rounding: str = Config.EXACT["interest_rounding"],
+        amount_rounding: str = Config.EXACT["amount_rounding"],
+    ):
+        cents = to_cents(max(principal, 0), amount_rounding)
+        self.principal = cents / 100
+        self.monthly_rate = annual_rate / 12
+        self.cent_rows = list(
+            iter_cent_schedule(
+                cents,
+                to_rate_units(annual_rate),
+                int(years * 12),
+                payment_rounding,
+                interest_rounding,
+            )
+        )
+        self.months = len(self.cent_rows)
+        self.payment = self.cent_rows[0].payment / 100 if self.cent_rows else 0.0
+        # Interest paid up to and including each month, in cents
+        self.interest_paid = list(
+            itertools.accumulate(row.interest for row in self.cent_rows)
+        )
+
+    def __len__(self) -> int:
+        return self.months
+
+    def balance(self, month: int) -> float:
+        """Outstanding balance after month installments"""
+        if month <= 0:
+            return self.principal
+        if month >= self.months:
+            return 0.0
+        return self.cent_rows[month - 1].balance / 100
+
+    def cumulative_interest(self, month: int) -> float:
+        """Interest paid with the first month installments"""
+        month = min(month, self.months)
+        return self.interest_paid[month - 1] / 100 if month > 0 else 0.0
+
+    def __getitem__(self, index: int) -> ScheduleRow:
+        month, payment, interest, principal, balance = self.cent_rows[index]
+        return ScheduleRow(
+            month, payment / 100, interest / 100, principal / 100, balance / 100
+        )
+
+    def rows(self, start: int, stop: int) -> Iterator[ScheduleRow]:
+        """Rows start..stop-1 (0-based), clipped to the schedule"""
+        for index in range(max(start, 0), min(stop, self.months)):
+            yield self[index]
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        return self.rows(0, self.months)
+
+
+class ExactLoanCalculator(LoanCalculator):
+    """
+    LoanCalculator whose loan details come from the integer-cent schedule.
+    Everything built on calculate_loan_details(_batch) - complete details,
+    summaries, the incremental evaluator, batch jobs - follows automatically.
+    """
+
+    def __init__(
+        self,
+        payment_rounding: str = Config.EXACT["payment_rounding"],
+        interest_rounding: str = Config.EXACT["interest_rounding"],
+        amount_rounding: str = Config.EXACT["amount_rounding"],
+    ):
+        super().__init__()
+        for mode in (payment_rounding, interest_rounding, amount_rounding):
+            if mode not in ROUNDING_MODES:
+                raise ValueError(
+                    f"Unknown rounding mode {mode!r}, use one of {ROUNDING_MODES}"
+                )
+        self.payment_rounding = payment_rounding
+        self.interest_rounding = interest_rounding
+        self.amount_rounding = amount_rounding
+
+    def calculate_loan_details_cents(
+        self, principal: float, annual_rate: float, years: int
+    ) -> CentLoanResult:
+        """Exact loan details in cents for a principal given in euros"""
+        return amortize_cents(
+            to_cents(principal, self.amount_rounding),
+            to_rate_units(annual_rate),
+            int(years * 12),
+            self.payment_rounding,
+            self.interest_rounding,
+        )
+
+    def calculate_loan_details(
+        self, principal: float, annual_rate: float, years: int
+    ) -> LoanResult:
+        """Loan details in euros, exact to the cent"""
+        return self.calculate_loan_details_cents(
+            principal, annual_rate, years
+        ).to_loan_result()
+
+    def calculate_loan_details_batch(
+        self, principals: ArrayLike, annual_rates: ArrayLike, years: ArrayLike
+    ) -> LoanBatchResult:
+        """
+        Exact loan details for many loans. Inputs are converted to integers
+        once per row and identical loans are amortized only once per batch.
+        """
+        principals, annual_rates, years = _broadcast(principals, annual_rates, years)
+        size = len(principals)
+        monthly_payments = array("d", bytes(8 * size))
+        total_payments = array("d", bytes(8 * size))
+        total_interests = array("d", bytes(8 * size))
+
+        amount_rounding = self.amount_rounding
+        payment_rounding = self.payment_rounding
+        interest_rounding = self.interest_rounding
+        rate_units = {}
+        loans = {}
+
+        for i in range(size):
+            principal = to_cents(principals[i], amount_rounding)
+            if principal <= 0:
+                continue
+            rate = annual_rates[i]
+            units = rate_units.get(rate)
+            if units is None:
+                units = rate_units[rate] = to_rate_units(rate)
+
+            key = (principal, units, int(years[i] * 12))
+            result = loans.get(key)
+            if result is None:
+                result = loans[key] = amortize_cents(
+                    *key, payment_rounding, interest_rounding
+                )
+            monthly_payments[i] = result.monthly_payment / 100
+            total_payments[i] = result.total_payment / 100
+            total_interests[i] = result.total_interest / 100
+
+        return LoanBatchResult(monthly_payments, total_payments, total_interests)
+
+    def schedule(
+        self, principal: float, annual_rate: float, years: int
+    ) -> CentSchedule:
+        """Month-by-month schedule in whole cents, as the totals are computed"""
+        return CentSchedule(
+            principal,
+            annual_rate,
+            years,
+            self.payment_rounding,
+            self.interest_rounding,
+            self.amount_rounding,
+        )
+
+
+def default_calculator(exact: Optional[bool] = None) -> LoanCalculator:
+    """Float or exact calculator, following Config.EXACT unless exact is given"""
+    if Config.EXACT["enabled"] if exact is None else exact:
+        return ExactLoanCalculator()
+    return LoanCalculator()
@@ -44,6 +44,75 @@ class Config:
         "max_years": 40,
     }
 
+    LIVE = {
+        "enabled": True,
+        "debounce_ms": 300,
+    }
+
+    SCHEDULE_VIEW = {
+        "visible_rows": 15,  # Rows of labels created, whatever the term
+        "column_width": 12,
+        "wheel_rows": 3,
+    }
+
+    CHART = {
+        "width": 360,
+        "height": 200,
+        "padding": 30,
+        "font_size": 8,
+        "bg_color": "white",
+        "axis_color": "#999999",
+        "colors": {"stambeni": "#1f77b4", "gotovinski": "#d62728"},
+    }
+
+    COMPARISON = {
+        "better_color": "#2e7d32",  # Cheaper than the baseline
+        "worse_color": "#c62828",
+    }
+
+    BACKGROUND = {
+        "workers": 2,
+        "poll_ms": 50,
+        "busy_delay_ms": 150,  # Only flag labels as busy for slow jobs
+        "chunk_rows": 5000,  # Rows per batch call between progress reports
+    }
+
+    CATALOG = {
+        "path": None,  # SQLite or JSON catalog, None uses PRESETS below
+        "filter_limit": 50,
+    }
+
+    SERVICE = {
+        "host": "127.0.0.1",
+        "port": 8765,
+        "batch_window_ms": 5,
+        "max_batch_size": 512,
+        "latency_samples": 10000,
+    }
+
+    SIMULATION = {
+        "paths": 10000,
+        "chunk_size": 2000,  # Paths per batch call and per worker task
+        "bins": 4096,  # Histogram resolution of each simulated outcome
+        "seed": 0,
+    }
+
+    EXPORT = {
+        "chunk_rows": 65536,  # Schedule rows held in memory while exporting
+    }
+
+    EXACT = {
+        "enabled": False,  # Integer-cent amortization instead of float formulas
+        # Any decimal.ROUND_* mode name, e.g. "ROUND_HALF_EVEN" for banker's
+        "payment_rounding": "ROUND_HALF_UP",
+        "interest_rounding": "ROUND_HALF_UP",
+        "amount_rounding": "ROUND_HALF_UP",  # Loan principals to whole cents
+    }
+
+    CACHE = {
+        "annuity_factor_size": 1024,
+    }
+
     TOOLTIP = {
         "font_size": 8,
         "x_offset": 15,
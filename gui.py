@@ -1,12 +1,24 @@
 """GUI implementation for the loan calculator"""
 
+import threading
 import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import messagebox
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
+from background import BackgroundRunner
+from catalog import CatalogError, PresetCatalog, get_catalog
+from cents import default_calculator
 from config import Config, InvestorPreset
-from loan import LoanCalculator, InputValidator, ValidationError
+from incremental import IncrementalLoanEvaluator
+from loan import (
+    LoanSummary,
+    InputValidator,
+    ValidationError,
+    result_getter,
+)
+from scenarios import ScenarioSet
+from widgets import BalanceChart, ComparisonTable, ScheduleTable
 
 
 class ToolTip:
@@ -54,15 +66,46 @@ class LoanCalculatorGUI:
 
     def __init__(self, root: tk.Tk):
         self.last_input_row = 0
-        self.root = root
-        self.calculator = LoanCalculator()
-        self.inputs = {}
-        self.output_labels = {}
+        self.init_state(root)
+        try:
+            self.catalog.connection
+        except CatalogError as e:
+            messagebox.showerror(
+                "Greška kataloga", f"{e}\nKoriste se ugrađene postavke."
+            )
+            self.catalog = PresetCatalog()
+        self.live_var = tk.BooleanVar(master=root, value=Config.LIVE["enabled"])
+        self.baseline_var = tk.StringVar(master=root)
         self.validation_command = (
             self.root.register(self.validate_numeric_input),
             "%P",
         )
         self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def init_state(self, root: tk.Tk = None):
+        """
+        Initialize everything except widgets. Without a root, background
+        jobs run inline, which lets the calculate path run headless.
+        """
+        self.root = root
+        self.calculator = default_calculator()
+        self.evaluator = IncrementalLoanEvaluator(self.calculator)
+        self.evaluator_lock = threading.Lock()
+        self.runner = BackgroundRunner(root)
+        self.catalog = get_catalog()
+        self.inputs = {}
+        self.output_labels = {}
+        self.output_texts = {}
+        self.last_validated = None
+        self.last_results = None
+        self.pending_validated = None
+        self.pending_recalculation = None
+        self.busy = False
+        self.schedule_table = None
+        self.chart = None
+        self.scenarios = ScenarioSet()
+        self.comparison_table = None
 
     def setup_gui(self):
         """Initialize all GUI components"""
@@ -71,6 +114,8 @@ class LoanCalculatorGUI:
         self.create_frames()
         self.create_input_fields()
         self.create_output_fields()
+        self.create_schedule_panel()
+        self.create_scenario_panel()
         self.create_buttons()
         self.add_tooltips()
 
@@ -82,6 +127,19 @@ class LoanCalculatorGUI:
         self.output_frame = tk.Frame(self.root, bg=Config.STYLES["bg_color"])
         self.output_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
 
+    def create_schedule_panel(self):
+        """Create the month-by-month schedule view next to the results"""
+        self.schedule_frame = tk.Frame(self.root, bg=Config.STYLES["bg_color"])
+        self.schedule_frame.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
+
+        separator = self.create_labeled_separator(
+            "Otplata po mjesecima", self.schedule_frame
+        )
+        separator.pack(fill="x", padx=10, pady=10)
+
+        self.schedule_table = ScheduleTable(self.schedule_frame)
+        self.schedule_table.pack(fill="both", expand=True, padx=10)
+
     def create_input_field(self, field_id: str, label_text: str):
         """Create individual input field"""
         label = tk.Label(
@@ -99,6 +157,7 @@ class LoanCalculatorGUI:
             validatecommand=self.validation_command,  # Use the validation command here
         )
         entry.grid(row=self.last_input_row, column=1, padx=10, pady=5, sticky="w")
+        entry.bind("<KeyRelease>", self.on_input_changed)
         self.last_input_row += 1
         self.inputs[field_id] = entry
 
@@ -126,6 +185,59 @@ class LoanCalculatorGUI:
 
         self.output_labels[field_id] = value_label
 
+    def create_scenario_panel(self):
+        """Create the side-by-side scenario comparison below the main panels"""
+        font = (Config.STYLES["font_family"], Config.STYLES["font_size"])
+        self.scenario_frame = tk.Frame(self.root, bg=Config.STYLES["bg_color"])
+        self.scenario_frame.grid(
+            row=1, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="nsew"
+        )
+
+        separator = self.create_labeled_separator(
+            "Usporedba scenarija", self.scenario_frame
+        )
+        separator.pack(fill="x", padx=10, pady=10)
+
+        controls = tk.Frame(self.scenario_frame, bg=Config.STYLES["bg_color"])
+        controls.pack(fill="x", padx=10)
+
+        tk.Label(
+            controls, text="Naziv:", bg=Config.STYLES["bg_color"], font=font
+        ).pack(side=tk.LEFT)
+        self.scenario_name_entry = tk.Entry(controls, width=20, font=font)
+        self.scenario_name_entry.pack(side=tk.LEFT, padx=5)
+
+        tk.Button(
+            controls,
+            text="Dodaj scenarij",
+            command=self.add_scenario,
+            bg=Config.STYLES["button_color"],
+            fg=Config.STYLES["button_text_color"],
+            font=font,
+        ).pack(side=tk.LEFT, padx=5)
+        tk.Button(
+            controls, text="Ukloni", command=self.remove_scenario, font=font
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(
+            controls, text="Osnova:", bg=Config.STYLES["bg_color"], font=font
+        ).pack(side=tk.LEFT, padx=(15, 0))
+        self.baseline_dropdown = ttk.Combobox(
+            controls, textvariable=self.baseline_var, state="readonly", width=20
+        )
+        self.baseline_dropdown.pack(side=tk.LEFT, padx=5)
+        self.baseline_dropdown.bind(
+            "<<ComboboxSelected>>", lambda event: self.refresh_comparison()
+        )
+
+        self.comparison_status = tk.Label(
+            controls, bg=Config.STYLES["bg_color"], font=font
+        )
+        self.comparison_status.pack(side=tk.LEFT, padx=5)
+
+        self.comparison_table = ComparisonTable(self.scenario_frame)
+        self.comparison_table.pack(fill="x", padx=10, pady=10)
+
     def create_buttons(self):
         """Create action buttons"""
         button_frame = tk.Frame(self.input_frame, bg=Config.STYLES["bg_color"])
@@ -151,6 +263,16 @@ class LoanCalculatorGUI:
         )
         clear_button.pack(side=tk.LEFT, padx=5)
 
+        live_checkbox = tk.Checkbutton(
+            button_frame,
+            text="Automatski izračun",
+            variable=self.live_var,
+            command=self.schedule_recalculation,
+            bg=Config.STYLES["bg_color"],
+            font=(Config.STYLES["font_family"], Config.STYLES["font_size"]),
+        )
+        live_checkbox.pack(side=tk.LEFT, padx=5)
+
     def add_tooltips(self):
         """Add tooltips to input fields"""
         tooltips = {
@@ -192,68 +314,259 @@ class LoanCalculatorGUI:
                 self.inputs[field_id].insert(0, value)
 
         # Reset presets
-        for preset_id, preset_field in Config.PRESETS.items():
-            self.preset_dropdowns[preset_id].set(list(preset_field.options.keys())[0])
+        for preset_id in Config.PRESETS:
+            self.preset_queries[preset_id] = ""
+            self.preset_dropdowns[preset_id]["values"] = self.preset_values(preset_id)
+            self.preset_dropdowns[preset_id].set(self.default_option(preset_id))
 
         # Clear results
-        for label in self.output_labels.values():
-            label.config(text="0.00 EUR")
-
-    def update_results(self, results: dict):
-        """Update result displays"""
+        self.cancel_calculation()
+        for field_id in self.output_labels:
+            self.set_output_text(field_id, "0.00 EUR")
+        for view in (self.schedule_table, self.chart):
+            if view is not None:
+                view.clear()
+        self.last_validated = None
+        self.last_results = None
+
+    def update_results(self, results: Union[dict, LoanSummary]):
+        """Update result displays from a results dict or a LoanSummary"""
+        value_of = result_getter(results)
         updates = {
-            "ukupna_cijena": results["total_price"],
-            "za_stambeni_kredit": results["mortgage_amount"],
-            "za_gotovinski_kredit": results["cash_loan_amount"],
-            "anuitet_stambeni": results["mortgage_monthly"],
-            "ukupno_stambeni": results["mortgage_total"],
-            "kamata_stambeni": results["mortgage_interest"],
-            "anuitet_gotovinski": results["cash_loan_monthly"],
-            "ukupno_gotovinski": results["cash_loan_total"],
-            "kamata_gotovinski": results["cash_loan_interest"],
+            "ukupna_cijena": value_of("total_price"),
+            "za_stambeni_kredit": value_of("mortgage_amount"),
+            "za_gotovinski_kredit": value_of("cash_loan_amount"),
+            "anuitet_stambeni": value_of("mortgage_monthly"),
+            "ukupno_stambeni": value_of("mortgage_total"),
+            "kamata_stambeni": value_of("mortgage_interest"),
+            "anuitet_gotovinski": value_of("cash_loan_monthly"),
+            "ukupno_gotovinski": value_of("cash_loan_total"),
+            "kamata_gotovinski": value_of("cash_loan_interest"),
         }
 
+        # Cash loan fields are moot when nothing has to be borrowed; the exact
+        # engine also charges nothing for an amount that rounds to 0 cents
+        needs_cash_loan = (
+            value_of("cash_loan_amount") > 0 and value_of("cash_loan_monthly") > 0
+        )
         for field_id, value in updates.items():
             if field_id in self.output_labels:
-                if value <= 10 and "gotovinski" in field_id:
-                    self.output_labels[field_id].config(text="Nije potreban")
+                if not needs_cash_loan and "gotovinski" in field_id:
+                    self.set_output_text(field_id, "Nije potreban")
                 else:
-                    self.output_labels[field_id].config(text=f"{value:.2f} EUR")
+                    self.set_output_text(field_id, f"{value:.2f} EUR")
 
-    def calculate(self):
-        """Perform calculations and update display"""
-        try:
-            # Get and validate inputs
-            input_values = {
-                field_id: entry.get() for field_id, entry in self.inputs.items()
-            }
-            validated = InputValidator.validate_inputs(input_values)
-
-            # Calculate total price
-            total_price = self.calculator.calculate_property_costs(
-                validated["price_per_sqm"],
-                validated["total_sqm"],
-                validated["parking_price"],
+    def update_schedule(
+        self, validated: Dict[str, float], results: Union[dict, LoanSummary]
+    ):
+        """Point the schedule table and chart at the loans of the results"""
+        value_of = result_getter(results)
+        # From the same engine as the results, so exact mode shows cent rows
+        schedules = {
+            "stambeni": self.calculator.schedule(
+                value_of("mortgage_amount"),
+                validated["mortgage_rate"],
+                validated["mortgage_years"],
+            ),
+            "gotovinski": self.calculator.schedule(
+                value_of("cash_loan_amount"),
+                validated["cash_loan_rate"],
+                validated["cash_loan_years"],
+            ),
+        }
+        for view in (self.schedule_table, self.chart):
+            if view is not None:
+                view.set_schedules(schedules)
+
+    def set_output_text(self, field_id: str, text: str):
+        """Update an output label, skipping the Tk call if text is unchanged"""
+        if self.output_texts.get(field_id) != text:
+            self.output_labels[field_id].config(text=text)
+            self.output_texts[field_id] = text
+
+    def read_validated_inputs(self) -> Dict[str, float]:
+        """Read all input fields and validate them"""
+        input_values = {
+            field_id: entry.get() for field_id, entry in self.inputs.items()
+        }
+        return InputValidator.validate_inputs(input_values)
+
+    def compute_results(self, validated: Dict[str, float]) -> dict:
+        """Run the loan calculation, reusing results of unchanged inputs"""
+        with self.evaluator_lock:
+            return self.evaluator.evaluate(validated)
+
+    def start_calculation(self, validated: Dict[str, float]):
+        """Calculate in the background and show the results when done"""
+        self.pending_validated = validated
+
+        def finished(results):
+            self.pending_validated = None
+            self.busy = False
+            self.update_results(results)
+            self.update_schedule(validated, results)
+            self.last_results = results
+            self.last_validated = validated
+
+        def failed(error: Exception):
+            self.cancel_calculation()
+            messagebox.showerror(
+                "Error", f"An unexpected error occurred: {str(error)}"
             )
 
-            # Calculate complete loan details
-            results = self.calculator.calculate_complete_loan_details(
-                total_price=total_price,
-                own_money=validated["down_payment"],
-                down_payment_percentage=validated["advance_percentage"],
-                mortgage_rate=validated["mortgage_rate"],
-                mortgage_years=validated["mortgage_years"],
-                cash_loan_rate=validated["cash_loan_rate"],
-                cash_loan_years=validated["cash_loan_years"],
+        job = self.runner.submit(
+            "calculate",
+            lambda job, values: self.compute_results(values),
+            validated,
+            on_done=finished,
+            on_error=failed,
+        )
+        if self.runner.is_running("calculate"):
+            self.root.after(Config.BACKGROUND["busy_delay_ms"], self.show_busy, job)
+
+    def show_busy(self, job, text: str = "Računam..."):
+        """Mark the output labels as stale while a slow job is still running"""
+        if self.runner.jobs.get(job.name) is job:
+            self.busy = True
+            for field_id in self.output_labels:
+                self.set_output_text(field_id, text)
+
+    def cancel_calculation(self):
+        """Cancel a running calculation and put back the last results shown"""
+        self.runner.cancel("calculate")
+        self.pending_validated = None
+        if self.busy:
+            self.busy = False
+            if self.last_results is not None:
+                self.update_results(self.last_results)
+            else:
+                for field_id in self.output_labels:
+                    self.set_output_text(field_id, "0.00 EUR")
+
+    def on_close(self):
+        """Stop pending timers and background workers, then close the window"""
+        if self.pending_recalculation is not None:
+            self.root.after_cancel(self.pending_recalculation)
+            self.pending_recalculation = None
+        self.runner.shutdown()
+        self.root.destroy()
+
+    def on_input_changed(self, event=None):
+        """
+        Any edit makes a running calculation stale, live mode or not, so
+        cancel it before scheduling the live recalculation
+        """
+        self.cancel_calculation()
+        self.schedule_recalculation()
+
+    def schedule_recalculation(self, event=None):
+        """
+        Debounce live recalculation: every call restarts the timer, so a
+        burst of keystrokes results in a single recalculation
+        """
+        if self.pending_recalculation is not None:
+            self.root.after_cancel(self.pending_recalculation)
+            self.pending_recalculation = None
+        if self.live_var.get():
+            self.pending_recalculation = self.root.after(
+                Config.LIVE["debounce_ms"], self.recalculate_live
             )
 
-            # Update display
-            self.update_results(results)
+    def recalculate_live(self):
+        """Recalculate quietly if the validated inputs changed"""
+        self.pending_recalculation = None
+        try:
+            validated = self.read_validated_inputs()
+        except ValidationError:
+            # Input is incomplete while typing, keep showing the last results
+            return
+
+        if validated in (self.last_validated, self.pending_validated):
+            return
 
+        self.start_calculation(validated)
+
+    def calculate(self):
+        """Perform calculations and update display"""
+        try:
+            validated = self.read_validated_inputs()
         except ValidationError as e:
             messagebox.showerror("Validation Error", str(e))
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+            return
+
+        self.start_calculation(validated)
+
+    def scenario_name(self) -> str:
+        """Name typed by the user, or the next free Scenarij N"""
+        name = self.scenario_name_entry.get().strip()
+        number = len(self.scenarios) + 1
+        while not name:
+            if f"Scenarij {number}" not in self.scenarios:
+                name = f"Scenarij {number}"
+            number += 1
+        return name
+
+    def add_scenario(self):
+        """Store the current inputs as a named scenario (same name replaces it)"""
+        try:
+            validated = self.read_validated_inputs()
+        except ValidationError as e:
+            messagebox.showerror("Validation Error", str(e))
+            return
+
+        self.scenarios.add(self.scenario_name(), validated)
+        self.scenario_name_entry.delete(0, tk.END)
+        self.update_scenario_names()
+        self.refresh_comparison()
+
+    def remove_scenario(self):
+        """Remove the scenario named in the entry, or the baseline if empty"""
+        name = self.scenario_name_entry.get().strip() or self.baseline_var.get()
+        if name not in self.scenarios:
+            messagebox.showerror("Greška", f"Scenarij '{name}' ne postoji")
+            return
+
+        self.scenarios.remove(name)
+        self.scenario_name_entry.delete(0, tk.END)
+        self.update_scenario_names()
+        self.refresh_comparison()
+
+    def update_scenario_names(self):
+        """Offer every scenario as baseline, keeping the chosen one if it exists"""
+        names = list(self.scenarios)
+        self.baseline_dropdown["values"] = names
+        if self.baseline_var.get() not in names:
+            self.baseline_var.set(names[0] if names else "")
+
+    def refresh_comparison(self):
+        """Evaluate all scenarios in batches in the background"""
+        baseline = self.baseline_var.get() or None
+
+        def finished(comparisons):
+            self.comparison_status.config(text="")
+            self.comparison_table.show(comparisons)
+
+        def failed(error: Exception):
+            self.comparison_status.config(text="")
+            messagebox.showerror(
+                "Error", f"An unexpected error occurred: {str(error)}"
+            )
+
+        self.runner.submit(
+            "compare",
+            # job.checkpoint reports progress and stops a superseded job
+            # between chunks
+            lambda job, scenarios: scenarios.compare(
+                baseline, self.calculator, job.checkpoint
+            ),
+            # Snapshot, so adding scenarios meanwhile does not race the job
+            self.scenarios.copy(),
+            on_done=finished,
+            on_progress=lambda done, total: self.comparison_status.config(
+                text=f"Računam... {done}/{total}"
+            ),
+            on_error=failed,
+        )
 
     def create_labeled_separator(self, text: str, parent_frame: tk.Frame) -> tk.Frame:
         """Create a labeled separator"""
@@ -366,6 +679,12 @@ class LoanCalculatorGUI:
                 self.create_output_field(self.last_input_row, field_id, label_text)
                 self.last_input_row += 1
 
+        self.chart = BalanceChart(self.output_frame)
+        self.chart.grid(
+            row=self.last_input_row, column=0, columnspan=2, padx=10, pady=10
+        )
+        self.last_input_row += 1
+
     def create_preset_selectors(self) -> int:
         """
         Create dropdown menus for presets
@@ -385,6 +704,7 @@ class LoanCalculatorGUI:
         # Store preset variables and dropdowns
         self.preset_vars = {}
         self.preset_dropdowns = {}
+        self.preset_queries = {}
 
         # Create dropdowns for each preset type
         column = 0
@@ -405,38 +725,107 @@ class LoanCalculatorGUI:
             self.preset_dropdowns[preset_id] = ttk.Combobox(
                 preset_frame,
                 textvariable=self.preset_vars[preset_id],
-                values=list(preset_field.options.keys()),
-                state="readonly",
+                values=self.preset_values(preset_id),
                 width=preset_field.width,
+                state="readonly",
             )
             self.preset_dropdowns[preset_id].grid(
                 row=self.last_input_row, column=column + 1, padx=5, pady=5, sticky="w"
             )
-            self.preset_dropdowns[preset_id].set(list(preset_field.options.keys())[0])
+            self.preset_dropdowns[preset_id].set(self.default_option(preset_id))
 
-            # Bind selection event
+            # Bind selection event, typing filters the options
+            self.preset_queries[preset_id] = ""
             self.preset_dropdowns[preset_id].bind(
                 "<<ComboboxSelected>>",
                 lambda e, pid=preset_id: self.on_preset_selected(pid),
             )
+            self.preset_dropdowns[preset_id].bind(
+                "<Return>",
+                lambda e, pid=preset_id: self.commit_dropdown(pid, e),
+            )
+            self.preset_dropdowns[preset_id].bind(
+                "<KeyRelease>",
+                lambda e, pid=preset_id: self.filter_dropdown(pid, e),
+            )
 
             column += 2
 
         self.last_input_row += 1
 
+    @staticmethod
+    def default_option(preset_id: str) -> str:
+        """Placeholder option shown when nothing is selected"""
+        return next(iter(Config.PRESETS[preset_id].options))
+
+    def preset_values(self, preset_id: str, query: str = "") -> list:
+        """Dropdown options matching query, capped at the catalog filter limit"""
+        limit = Config.CATALOG["filter_limit"]
+        if preset_id == "investor_type":
+            options = self.catalog.names(query, limit)
+        elif preset_id == "apartment_type":
+            options = self.catalog.apartment_types(
+                self.preset_vars["investor_type"].get(), query, limit
+            )
+        else:
+            options = list(Config.PRESETS[preset_id].options)[1:]
+        return [self.default_option(preset_id)] + options
+
+    def filter_dropdown(self, preset_id: str, event=None):
+        """
+        Narrow dropdown options down to those containing the typed text.
+        The dropdowns are readonly, so keystrokes are collected here. The
+        shown value stays the applied preset until a choice is committed
+        from the list or with Return (see commit_dropdown).
+        """
+        query = self.preset_queries[preset_id]
+        if event.keysym == "BackSpace":
+            query = query[:-1]
+        elif event.keysym == "Escape":
+            query = ""
+        elif event.char and event.char.isprintable():
+            query += event.char
+        else:
+            return
+
+        self.preset_queries[preset_id] = query
+        self.preset_dropdowns[preset_id]["values"] = self.preset_values(
+            preset_id, query
+        )
+
+    def commit_dropdown(self, preset_id: str, event=None):
+        """Select and apply the best match of the typed text (Return key)"""
+        query = self.preset_queries[preset_id]
+        if query:
+            values = self.preset_values(preset_id, query)
+            if len(values) > 1:
+                self.preset_dropdowns[preset_id].set(values[1])
+        self.on_preset_selected(preset_id)
+
+    def lookup_preset(self, preset_id: str, selected_value: str):
+        """Find the preset behind a dropdown option"""
+        if preset_id == "investor_type":
+            return self.catalog.preset(selected_value)
+        return Config.PRESETS[preset_id].options.get(selected_value)
+
     def on_preset_selected(self, preset_id: str):
         """
         Handle preset selection dynamically based on preset dependencies
         and field updates defined in config
         """
+        self.preset_queries[preset_id] = ""
         selected_value = self.preset_vars[preset_id].get()
-        preset_options = Config.PRESETS[preset_id].options
-        preset = preset_options.get(selected_value)
+        preset = self.lookup_preset(preset_id, selected_value)
 
         # Get preset dependencies from config
         dependencies = Config.PRESET_DEPENDENCIES.get(preset_id, {})
 
-        if preset_id == "apartment_type" and selected_value != "Odaberi tip stana":
+        self.on_input_changed()
+
+        if (
+            preset_id == "apartment_type"
+            and selected_value != self.default_option(preset_id)
+        ):
             # Special handling for apartment type selection
             self.handle_apartment_selection(selected_value)
         elif preset:
@@ -459,16 +848,12 @@ class LoanCalculatorGUI:
         """Handle apartment type selection and update area"""
         # Get current investor
         investor_name = self.preset_vars["investor_type"].get()
-        investor_preset = Config.PRESETS["investor_type"].options.get(investor_name)
+        area = self.catalog.area(investor_name, selected_apartment)
 
-        if investor_preset and "apartment_types" in investor_preset.updates:
-            apartment_types = investor_preset.updates["apartment_types"]
-            if selected_apartment in apartment_types:
-                # Update the area field
-                area = apartment_types[selected_apartment]
-                if "ukupno_kvadrata" in self.inputs:
-                    self.inputs["ukupno_kvadrata"].delete(0, tk.END)
-                    self.inputs["ukupno_kvadrata"].insert(0, str(area))
+        if area is not None and "ukupno_kvadrata" in self.inputs:
+            # Update the area field
+            self.inputs["ukupno_kvadrata"].delete(0, tk.END)
+            self.inputs["ukupno_kvadrata"].insert(0, str(area))
 
     def apply_preset_updates(self, updates: dict):
         """Apply updates to input fields and handle special cases"""
@@ -486,15 +871,10 @@ class LoanCalculatorGUI:
         if field_id == "apartment_types":
             # Update apartment type dropdown with new values
             if "apartment_type" in self.preset_dropdowns:
-                current_default = (
-                    Config.PRESETS["apartment_type"]
-                    .options.keys()
-                    .__iter__()
-                    .__next__()
-                )
+                current_default = self.default_option("apartment_type")
                 self.preset_dropdowns["apartment_type"]["values"] = [
                     current_default
-                ] + list(value.keys())
+                ] + list(value.keys())[: Config.CATALOG["filter_limit"]]
                 self.preset_dropdowns["apartment_type"].set(current_default)
 
     def update_dependent_dropdown(
@@ -502,20 +882,17 @@ class LoanCalculatorGUI:
     ):
         """Update dependent dropdown based on parent preset"""
         if update_method == "apartment_types":
-            apartment_types = parent_preset.updates.get("apartment_types", {})
-            default_option = (
-                Config.PRESETS[dependent_id].options.keys().__iter__().__next__()
-            )
-            self.preset_dropdowns[dependent_id]["values"] = [default_option] + list(
-                apartment_types.keys()
+            default_option = self.default_option(dependent_id)
+            self.preset_dropdowns[dependent_id]["values"] = [
+                default_option
+            ] + self.catalog.apartment_types(
+                parent_preset.name, limit=Config.CATALOG["filter_limit"]
             )
             self.preset_dropdowns[dependent_id].set(default_option)
 
     def reset_dropdown(self, dropdown_id: str):
         """Reset dropdown to its default state"""
         if dropdown_id in Config.PRESETS:
-            default_options = [
-                Config.PRESETS[dropdown_id].options.keys().__iter__().__next__()
-            ]
+            default_options = [self.default_option(dropdown_id)]
             self.preset_dropdowns[dropdown_id]["values"] = default_options
             self.preset_dropdowns[dropdown_id].set(default_options[0])
@@ -0,0 +1,99 @@
+"""Incremental loan evaluation driven by an input dependency graph"""
+
+from typing import Dict, Optional
+
+from loan import LoanCalculator, LoanResult
+
+_MISSING = object()
+
+
+class IncrementalLoanEvaluator:
+    """
+    Caches every intermediate value of calculate_complete_loan_details and
+    recomputes only the nodes whose inputs changed since the last call
+    """
+
+    # Node -> validated inputs and upstream nodes it is computed from
+    DEPENDENCIES = {
+        "total_price": ("price_per_sqm", "total_sqm", "parking_price"),
+        "loan_split": ("total_price", "down_payment", "advance_percentage"),
+        "mortgage": ("loan_split", "mortgage_rate", "mortgage_years"),
+        "cash_loan": ("loan_split", "cash_loan_rate", "cash_loan_years"),
+    }
+
+    # Topological order of DEPENDENCIES
+    ORDER = ("total_price", "loan_split", "mortgage", "cash_loan")
+
+    def __init__(self, calculator: Optional[LoanCalculator] = None):
+        self.calculator = calculator or LoanCalculator()
+        self.inputs = {}
+        self.values = {}
+        self.recompute_counts = dict.fromkeys(self.ORDER, 0)
+
+    def compute_node(self, node: str, inputs: Dict[str, float]):
+        """Compute a single node from the inputs and cached upstream values"""
+        calculator = self.calculator
+        if node == "total_price":
+            return calculator.calculate_property_costs(
+                inputs["price_per_sqm"], inputs["total_sqm"], inputs["parking_price"]
+            )
+        if node == "loan_split":
+            return calculator.calculate_loan_amounts(
+                self.values["total_price"],
+                inputs["down_payment"],
+                inputs["advance_percentage"],
+            )
+        if node == "mortgage":
+            return calculator.calculate_loan_details(
+                self.values["loan_split"][0],
+                inputs["mortgage_rate"],
+                inputs["mortgage_years"],
+            )
+        if node == "cash_loan":
+            cash_loan_amount = self.values["loan_split"][1]
+            if cash_loan_amount > 0:
+                return calculator.calculate_loan_details(
+                    cash_loan_amount,
+                    inputs["cash_loan_rate"],
+                    inputs["cash_loan_years"],
+                )
+            return LoanResult(0, 0, 0)
+        raise KeyError(node)
+
+    def evaluate(self, validated: Dict[str, float]) -> dict:
+        """
+        Return the same dict as calculate_complete_loan_details for the
+        validated inputs, recomputing only dirty nodes. A node whose new
+        value equals the cached one does not dirty its dependents.
+        """
+        dirty = {
+            key
+            for key, value in validated.items()
+            if self.inputs.get(key, _MISSING) != value
+        }
+
+        for node in self.ORDER:
+            if node in self.values and dirty.isdisjoint(self.DEPENDENCIES[node]):
+                continue
+            value = self.compute_node(node, validated)
+            self.recompute_counts[node] += 1
+            if self.values.get(node, _MISSING) != value:
+                self.values[node] = value
+                dirty.add(node)
+
+        self.inputs = dict(validated)
+        mortgage_amount, cash_loan_amount = self.values["loan_split"]
+        return self.calculator.combine_loan_details(
+            self.values["total_price"],
+            validated["down_payment"],
+            validated["advance_percentage"],
+            mortgage_amount,
+            cash_loan_amount,
+            self.values["mortgage"],
+            self.values["cash_loan"],
+        )
+
+    def invalidate(self):
+        """Drop all cached values, forcing a full recomputation"""
+        self.inputs = {}
+        self.values = {}
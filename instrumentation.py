@@ -0,0 +1,201 @@
+"""Opt-in timing instrumentation and profiling hooks
+
+Instrumentation works by swapping timed wrappers onto the hot-path methods
+when it is installed and restoring the originals when it is removed, so
+there is no overhead at all while it is off.
+
+Environment variables:
+    KALKULATOR_INSTRUMENT=1        install timers when calculator.py starts
+    KALKULATOR_INSTRUMENT_OUTPUT   write the JSON summary here on exit
+                                   (default: print a table to stderr)
+    KALKULATOR_PROFILE             capture a cProfile and save it here on exit
+"""
+
+import atexit
+import cProfile
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+ENV_FLAG = "KALKULATOR_INSTRUMENT"
+ENV_OUTPUT = "KALKULATOR_INSTRUMENT_OUTPUT"
+ENV_PROFILE = "KALKULATOR_PROFILE"
+
+# (module, class, methods); None instruments every public method
+TARGETS = (
+    ("loan", "InputValidator", ("validate_inputs", "validate_columns")),
+    ("loan", "LoanCalculator", None),
+    # Its overrides replace the LoanCalculator wrappers when Config.EXACT is on
+    ("cents", "ExactLoanCalculator", None),
+    # One span per step of a GUI recalculation: validate, compute (on a
+    # worker thread), then update the labels and the schedule views
+    (
+        "gui",
+        "LoanCalculatorGUI",
+        (
+            "calculate",
+            "recalculate_live",
+            "read_validated_inputs",
+            "compute_results",
+            "update_results",
+            "update_schedule",
+        ),
+    ),
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Instrumentation:
+    """Collects call counts and durations of instrumented methods"""
+
+    def __init__(self):
+        self.timings = defaultdict(lambda: array("d"))
+        self.originals = {}
+        self.profiler = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.originals)
+
+    def timed(self, name: str, function):
+        """Wrap function so every call's duration is recorded under name"""
+        record = self.timings[name].append
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        return wrapper
+
+    def install(self, include_gui: bool = False):
+        """
+        Swap timed wrappers onto every target method. The GUI is only
+        instrumented on request, so headless use never imports tkinter.
+        Install before creating LoanCalculatorGUI, as Tk keeps references
+        to the bound methods it is given.
+        """
+        for module_name, class_name, methods in TARGETS:
+            if module_name == "gui" and not include_gui:
+                continue
+            owner = getattr(importlib.import_module(module_name), class_name)
+            if methods is None:
+                methods = [
+                    name
+                    for name, member in vars(owner).items()
+                    if not name.startswith("_") and inspect.isfunction(member)
+                ]
+
+            for method in methods:
+                key = (owner, method)
+                if key in self.originals:
+                    continue
+                original = vars(owner)[method]
+                name = f"{class_name}.{method}"
+                if isinstance(original, staticmethod):
+                    wrapped = staticmethod(self.timed(name, original.__func__))
+                else:
+                    wrapped = self.timed(name, original)
+                self.originals[key] = original
+                setattr(owner, method, wrapped)
+
+    def uninstall(self):
+        """Restore the original methods"""
+        for (owner, method), original in self.originals.items():
+            setattr(owner, method, original)
+        self.originals.clear()
+
+    def reset(self):
+        """Forget all recorded timings"""
+        # Installed wrappers hold the arrays, so empty them in place
+        for durations in self.timings.values():
+            del durations[:]
+
+    def start_profile(self):
+        """Start a cProfile capture"""
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_profile(self, path: str):
+        """Stop the cProfile capture and save its stats to path"""
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(path)
+            self.profiler = None
+
+    def summary(self) -> Dict[str, dict]:
+        """Aggregated calls, total time and percentiles per method, in seconds"""
+        summary = {}
+        for name, durations in sorted(self.timings.items()):
+            if not durations:
+                continue
+            ordered = sorted(durations)
+            stats = {"calls": len(ordered), "total": sum(ordered)}
+            for percent in PERCENTILES:
+                stats[f"p{percent}"] = percentile(ordered, percent)
+            stats["max"] = ordered[-1]
+            summary[name] = stats
+        return summary
+
+    def dump(self, path: Optional[str] = None):
+        """Write the summary as JSON to path, or as a table to stderr"""
+        summary = self.summary()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            return
+
+        lines = [
+            f"{'method':<56} {'calls':>8} {'total ms':>10}"
+            + "".join(f" {'p' + str(p) + ' µs':>10}" for p in PERCENTILES)
+        ]
+        for name, stats in summary.items():
+            lines.append(
+                f"{name:<56} {stats['calls']:>8} {stats['total'] * 1e3:>10.2f}"
+                + "".join(f" {stats[f'p{p}'] * 1e6:>10.1f}" for p in PERCENTILES)
+            )
+        print("\n".join(lines), file=sys.stderr)
+
+
+instrumentation = Instrumentation()
+
+
+def configure_from_env(include_gui: bool = False) -> List[str]:
+    """
+    Enable instrumentation and profiling as requested by the environment,
+    registering the exit hooks that write their output.
+    Returns the names of the features that were enabled.
+    """
+    enabled = []
+    if os.environ.get(ENV_FLAG, "").lower() in ("1", "true", "yes", "on"):
+        instrumentation.install(include_gui=include_gui)
+        atexit.register(instrumentation.dump, os.environ.get(ENV_OUTPUT))
+        enabled.append("instrumentation")
+
+    profile_path = os.environ.get(ENV_PROFILE)
+    if profile_path:
+        instrumentation.start_profile()
+        atexit.register(instrumentation.stop_profile, profile_path)
+        enabled.append("profile")
+
+    return enabled
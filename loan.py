@@ -1,7 +1,26 @@
 """Loan calculation logic and validation"""
 
+import functools
+import math
+import numbers
+import re
+from array import array
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from config import Config
+
+ArrayLike = Union[float, Iterable[float]]
 
 
 class ValidationError(Exception):
@@ -13,91 +32,195 @@ class ValidationError(Exception):
 class InputValidator:
     """Handles all input validation"""
 
+    # (input field, validated key, min, max, divisor, integer) in check order
+    FIELD_RULES = (
+        (
+            "cijena_po_kvadratu",
+            "price_per_sqm",
+            Config.VALIDATION["min_price_per_sqm"],
+            Config.VALIDATION["max_price_per_sqm"],
+            1,
+            False,
+        ),
+        (
+            "ukupno_kvadrata",
+            "total_sqm",
+            Config.VALIDATION["min_area"],
+            Config.VALIDATION["max_area"],
+            1,
+            False,
+        ),
+        ("cijena_parkirnog_mjesta", "parking_price", 0, None, 1, False),
+        ("vlastito_ucesce", "down_payment", 0, None, 1, False),
+        ("postotak_za_kaparu", "advance_percentage", 0, 100, 1, False),
+        (
+            "stambeni_kredit_kamata",
+            "mortgage_rate",
+            Config.VALIDATION["min_interest"],
+            Config.VALIDATION["max_interest"],
+            100,
+            False,
+        ),
+        (
+            "stambeni_kredit_godine",
+            "mortgage_years",
+            Config.VALIDATION["min_years"],
+            Config.VALIDATION["max_years"],
+            1,
+            True,
+        ),
+        (
+            "gotovinski_kredit_kamata",
+            "cash_loan_rate",
+            Config.VALIDATION["min_interest"],
+            Config.VALIDATION["max_interest"],
+            100,
+            False,
+        ),
+        (
+            "gotovinski_kredit_godine",
+            "cash_loan_years",
+            Config.VALIDATION["min_years"],
+            Config.VALIDATION["max_years"],
+            1,
+            True,
+        ),
+    )
+
+    INVALID_NUMBER_MESSAGE = "Molimo unesite valjanu brojčanu vrijednost u sva polja."
+
+    # Finite decimal literals as float() spells them (underscores between
+    # digits, surrounding whitespace); nan and inf are rejected anyway
+    NUMBER_PATTERN = re.compile(
+        r"\s*[+-]?(?:\d(?:_?\d)*(?:\.(?:\d(?:_?\d)*)?)?|\.\d(?:_?\d)*)"
+        r"(?:[eE][+-]?\d(?:_?\d)*)?\s*"
+    )
+
+    @staticmethod
+    def parse_number(value) -> Optional[float]:
+        """
+        Parse one raw input the way both validation paths do: anything
+        float() accepts, except nan and infinities (including overflow such
+        as 1e400). Returns None for invalid input. Strings are screened
+        with NUMBER_PATTERN first, so invalid input never raises.
+        """
+        if isinstance(value, str):
+            if InputValidator.NUMBER_PATTERN.fullmatch(value) is None:
+                return None
+        elif not isinstance(value, numbers.Real):
+            return None
+        num = float(value)
+        return num if math.isfinite(num) else None
+
     @staticmethod
     def validate_numeric(
         value: str, min_val: float = None, max_val: float = None
     ) -> float:
         """Validate numeric input within optional range"""
-        try:
-            num = float(value)
-            if min_val is not None and num < min_val:
-                raise ValidationError(
-                    f"Brojčana vrijednost ne smije biti manja od {min_val}."
-                )
-            if max_val is not None and num > max_val:
-                raise ValidationError(
-                    f"Brojčana vrijednost ne smije biti veća od {max_val}."
-                )
-            return num
-        except ValueError:
+        num = InputValidator.parse_number(value)
+        if num is None:
+            raise ValidationError(InputValidator.INVALID_NUMBER_MESSAGE)
+        if min_val is not None and num < min_val:
+            raise ValidationError(
+                f"Brojčana vrijednost ne smije biti manja od {min_val}."
+            )
+        if max_val is not None and num > max_val:
             raise ValidationError(
-                "Molimo unesite valjanu brojčanu vrijednost u sva polja."
+                f"Brojčana vrijednost ne smije biti veća od {max_val}."
             )
+        return num
 
     @staticmethod
     def validate_inputs(inputs: Dict[str, str]) -> Dict[str, float]:
         """Validate all input fields"""
-        from config import Config
-
         validated = {}
 
-        # Validate property details
-        validated["price_per_sqm"] = InputValidator.validate_numeric(
-            inputs["cijena_po_kvadratu"],
-            Config.VALIDATION["min_price_per_sqm"],
-            Config.VALIDATION["max_price_per_sqm"],
-        )
+        for field_id, key, min_val, max_val, divisor, integer in (
+            InputValidator.FIELD_RULES
+        ):
+            value = InputValidator.validate_numeric(inputs[field_id], min_val, max_val)
+            if integer:
+                value = int(value)
+            elif divisor != 1:
+                value = value / divisor
+            validated[key] = value
 
-        validated["total_sqm"] = InputValidator.validate_numeric(
-            inputs["ukupno_kvadrata"],
-            Config.VALIDATION["min_area"],
-            Config.VALIDATION["max_area"],
-        )
+        return validated
 
-        validated["parking_price"] = InputValidator.validate_numeric(
-            inputs["cijena_parkirnog_mjesta"], 0
-        )
+    @staticmethod
+    def validate_columns(columns: Dict[str, Sequence[str]]) -> "BulkValidationResult":
+        """
+        Validate columns of raw input strings keyed by input field
+        Every row goes through the same parse_number and range checks as
+        validate_inputs, but failures are recorded instead of raised.
+        Returns:
+            BulkValidationResult with typed columns and per-row error flags
+        """
+        lengths = {
+            len(columns[field_id]) for field_id, *_ in InputValidator.FIELD_RULES
+        }
+        if len(lengths) > 1:
+            raise ValueError(
+                f"Input columns have mismatched lengths: {sorted(lengths)}"
+            )
+        size = lengths.pop()
 
-        # Validate loan parameters
-        validated["down_payment"] = InputValidator.validate_numeric(
-            inputs["vlastito_ucesce"], 0
+        result = BulkValidationResult(
+            columns={}, errors={}, messages={}, valid=bytearray(b"\x01" * size)
         )
+        parse = InputValidator.parse_number
+        valid = result.valid
+        messages = result.messages
 
-        validated["advance_percentage"] = InputValidator.validate_numeric(
-            inputs["postotak_za_kaparu"], 0, 100
-        )
+        for field_id, key, min_val, max_val, divisor, integer in (
+            InputValidator.FIELD_RULES
+        ):
+            typecode = "l" if integer else "d"
+            typed = array(typecode, bytes(array(typecode).itemsize * size))
+            flags = bytearray(size)
+            too_small = f"Brojčana vrijednost ne smije biti manja od {min_val}."
+            too_large = f"Brojčana vrijednost ne smije biti veća od {max_val}."
 
-        validated["mortgage_rate"] = (
-            InputValidator.validate_numeric(
-                inputs["stambeni_kredit_kamata"],
-                Config.VALIDATION["min_interest"],
-                Config.VALIDATION["max_interest"],
-            )
-            / 100
-        )
+            for row, raw in enumerate(columns[field_id]):
+                num = parse(raw)
+                if num is None:
+                    message = InputValidator.INVALID_NUMBER_MESSAGE
+                elif min_val is not None and num < min_val:
+                    message = too_small
+                elif max_val is not None and num > max_val:
+                    message = too_large
+                else:
+                    if integer:
+                        typed[row] = int(num)
+                    else:
+                        typed[row] = num / divisor if divisor != 1 else num
+                    continue
 
-        validated["mortgage_years"] = int(
-            InputValidator.validate_numeric(
-                inputs["stambeni_kredit_godine"],
-                Config.VALIDATION["min_years"],
-                Config.VALIDATION["max_years"],
-            )
-        )
+                flags[row] = 1
+                valid[row] = 0
+                messages.setdefault(row, {})[field_id] = message
 
-        validated["cash_loan_rate"] = InputValidator.validate_numeric(
-            inputs["gotovinski_kredit_kamata"],
-            Config.VALIDATION["min_interest"],
-            Config.VALIDATION["max_interest"]
-        ) / 100
-        
-        validated["cash_loan_years"] = int(InputValidator.validate_numeric(
-            inputs["gotovinski_kredit_godine"],
-            Config.VALIDATION["min_years"],
-            Config.VALIDATION["max_years"]
-        ))
+            result.columns[key] = typed
+            result.errors[field_id] = flags
 
+        return result
 
-        return validated
+
+@dataclass
+class BulkValidationResult:
+    """Typed columns and error masks produced by validate_columns"""
+    columns: Dict[str, array]  # Validated key -> typed values (0 where invalid)
+    errors: Dict[str, bytearray]  # Input field -> 1 for every invalid row
+    messages: Dict[int, Dict[str, str]]  # Row -> {input field: message}
+    valid: bytearray  # 1 for every row where all fields are valid
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def error_count(self) -> int:
+        """Number of rows with at least one invalid field"""
+        return len(self.valid) - sum(self.valid)
 
 
 @dataclass
@@ -107,8 +230,149 @@ class LoanResult:
     total_payment: float
     total_interest: float
 
+
+@dataclass
+class LoanBatchResult:
+    """Columnar loan calculation results, one entry per loan"""
+    monthly_payment: array
+    total_payment: array
+    total_interest: array
+
+    def __len__(self) -> int:
+        return len(self.monthly_payment)
+
+    def __getitem__(self, index: int) -> LoanResult:
+        return LoanResult(
+            self.monthly_payment[index],
+            self.total_payment[index],
+            self.total_interest[index],
+        )
+
+
+class LoanSummary(NamedTuple):
+    """Compact immutable record of calculate_complete_loan_details results"""
+    total_price: float
+    own_money: float
+    required_down_payment: float
+    mortgage_amount: float
+    cash_loan_amount: float
+    mortgage_monthly: float
+    mortgage_total: float
+    mortgage_interest: float
+    cash_loan_monthly: float
+    cash_loan_total: float
+    cash_loan_interest: float
+    total_monthly: float
+
+
+class LoanSummaryColumns:
+    """
+    Columnar container of many LoanSummary records, one array('d') per field.
+    Indexing by field name returns the column itself, by position a record.
+    """
+
+    fields = LoanSummary._fields
+
+    def __init__(self, columns: Optional[Dict[str, array]] = None):
+        self.columns = columns or {field: array("d") for field in self.fields}
+
+    def __len__(self) -> int:
+        return len(self.columns["total_price"])
+
+    def __getitem__(self, key: Union[str, int]) -> Union[array, LoanSummary]:
+        if isinstance(key, str):
+            return self.columns[key]
+        return LoanSummary(*(self.columns[field][key] for field in self.fields))
+
+    def __iter__(self) -> Iterable[LoanSummary]:
+        return map(LoanSummary._make, zip(*(self.columns[f] for f in self.fields)))
+
+    def append(self, summary: LoanSummary):
+        """Append a single record"""
+        for field, value in zip(self.fields, summary):
+            self.columns[field].append(value)
+
+
+def result_getter(results: Union[dict, LoanSummary]) -> Callable[[str], float]:
+    """Field accessor for results given as a dict or as a LoanSummary"""
+    if isinstance(results, dict):
+        return results.__getitem__
+    return functools.partial(getattr, results)
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of annuity factor cache counters"""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _growth_factor(monthly_rate: float, months: int) -> float:
+    return (1 + monthly_rate) ** months
+
+
+class AnnuityFactorCache:
+    """
+    Bounded LRU cache of growth factors (1 + monthly_rate) ** months
+    Backed by functools.lru_cache: its C implementation is thread-safe
+    without a Python-level lock, so a hit costs about as much as the power.
+    """
+
+    def __init__(self, maxsize: int = Config.CACHE["annuity_factor_size"]):
+        self.maxsize = maxsize
+        # Return (1 + monthly_rate) ** months, computing it only on a miss
+        self.growth = functools.lru_cache(maxsize=maxsize)(_growth_factor)
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss/eviction counters and current size"""
+        info = self.growth.cache_info()
+        return CacheStats(
+            info.hits,
+            info.misses,
+            info.misses - info.currsize,
+            info.currsize,
+            self.maxsize,
+        )
+
+    def clear(self):
+        """Drop all cached factors and reset the counters"""
+        self.growth.cache_clear()
+
+
+# Shared by every LoanCalculator unless one is given its own cache
+annuity_cache = AnnuityFactorCache()
+
+
+def _broadcast(*columns: ArrayLike) -> List[Sequence[float]]:
+    """
+    Turn scalars and array-likes into sequences of a common length.
+    Scalars are repeated to match the longest column.
+    """
+    sequences = [
+        None if isinstance(column, numbers.Number) else list(column)
+        for column in columns
+    ]
+    lengths = {len(sequence) for sequence in sequences if sequence is not None}
+    if len(lengths) > 1:
+        raise ValueError(f"Batch columns have mismatched lengths: {sorted(lengths)}")
+    size = lengths.pop() if lengths else 1
+    return [
+        [column] * size if sequence is None else sequence
+        for column, sequence in zip(columns, sequences)
+    ]
+
 class LoanCalculator:
     """Handles all loan calculation business logic"""
+
+    def __init__(self, cache: Optional[AnnuityFactorCache] = None):
+        self.cache = cache or annuity_cache
     
     def calculate_property_costs(self, price_per_sqm: float, total_sqm: float, 
                                parking_price: float) -> float:
@@ -155,11 +419,8 @@ class LoanCalculator:
         
         if monthly_rate > 0:
             # Standard loan amortization formula
-            monthly_payment = (
-                principal
-                * (monthly_rate * (1 + monthly_rate) ** months)
-                / ((1 + monthly_rate) ** months - 1)
-            )
+            growth = self.cache.growth(monthly_rate, months)
+            monthly_payment = principal * (monthly_rate * growth) / (growth - 1)
         else:
             # No interest, simple division
             monthly_payment = principal / months
@@ -169,6 +430,72 @@ class LoanCalculator:
         
         return LoanResult(monthly_payment, total_payment, total_interest)
 
+    def payment_factor(self, annual_rate: float, years: int) -> float:
+        """Monthly payment per unit of principal, as in calculate_loan_details"""
+        monthly_rate = annual_rate / 12
+        months = years * 12
+        if monthly_rate > 0:
+            growth = self.cache.growth(monthly_rate, months)
+            return monthly_rate * growth / (growth - 1)
+        return 1 / months
+
+    def schedule(self, principal: float, annual_rate: float,
+                 years: int) -> "LazySchedule":
+        """Month-by-month schedule consistent with calculate_loan_details"""
+        from schedule import LazySchedule  # schedule.py imports this module
+
+        return LazySchedule(principal, annual_rate, years)
+
+    def calculate_loan_details_batch(self, principals: ArrayLike,
+                                     annual_rates: ArrayLike,
+                                     years: ArrayLike) -> LoanBatchResult:
+        """
+        Calculate loan payment details for many loans in one pass
+        Args:
+            principals: Loan amounts
+            annual_rates: Annual interest rates (as decimals)
+            years: Loan terms in years
+        Any argument may be a scalar, which is applied to every loan.
+        Results match calculate_loan_details, which stays the reference.
+        Returns:
+            LoanBatchResult with one monthly/total/interest entry per loan
+        """
+        principals, annual_rates, years = _broadcast(principals, annual_rates, years)
+        size = len(principals)
+        monthly_payments = array("d", bytes(8 * size))
+        total_payments = array("d", bytes(8 * size))
+        total_interests = array("d", bytes(8 * size))
+
+        # Rate/term pairs repeat heavily in batch runs, so look each growth
+        # factor up in the shared cache only once per batch
+        growth_factors = {}
+
+        for i in range(size):
+            principal = principals[i]
+            if principal == 0:
+                continue
+
+            monthly_rate = annual_rates[i] / 12
+            months = years[i] * 12
+
+            if monthly_rate > 0:
+                key = (monthly_rate, months)
+                growth = growth_factors.get(key)
+                if growth is None:
+                    growth = growth_factors[key] = self.cache.growth(
+                        monthly_rate, months
+                    )
+                monthly_payment = principal * (monthly_rate * growth) / (growth - 1)
+            else:
+                monthly_payment = principal / months
+
+            total_payment = monthly_payment * months
+            monthly_payments[i] = monthly_payment
+            total_payments[i] = total_payment
+            total_interests[i] = total_payment - principal
+
+        return LoanBatchResult(monthly_payments, total_payments, total_interests)
+
     def calculate_complete_loan_details(self, 
                                      total_price: float,
                                      own_money: float,
@@ -177,6 +504,20 @@ class LoanCalculator:
                                      mortgage_years: int,
                                      cash_loan_rate: float,
                                      cash_loan_years: int) -> dict:
+        """Calculate complete details for both loans, as a dict"""
+        return self.calculate_loan_summary(
+            total_price, own_money, down_payment_percentage,
+            mortgage_rate, mortgage_years, cash_loan_rate, cash_loan_years
+        )._asdict()
+
+    def calculate_loan_summary(self,
+                               total_price: float,
+                               own_money: float,
+                               down_payment_percentage: float,
+                               mortgage_rate: float,
+                               mortgage_years: int,
+                               cash_loan_rate: float,
+                               cash_loan_years: int) -> LoanSummary:
         """Calculate complete details for both loans"""
         
         # Calculate basic amounts
@@ -193,18 +534,184 @@ class LoanCalculator:
                 cash_loan_amount, cash_loan_rate, cash_loan_years)
         else:
             cash_loan_details = LoanResult(0, 0, 0)
-            
-        return {
-            'total_price': total_price,
-            'own_money': own_money,
-            'required_down_payment': total_price * (down_payment_percentage / 100),
-            'mortgage_amount': mortgage_amount,
-            'cash_loan_amount': cash_loan_amount,
-            'mortgage_monthly': mortgage_details.monthly_payment,
-            'mortgage_total': mortgage_details.total_payment,
-            'mortgage_interest': mortgage_details.total_interest,
-            'cash_loan_monthly': cash_loan_details.monthly_payment,
-            'cash_loan_total': cash_loan_details.total_payment,
-            'cash_loan_interest': cash_loan_details.total_interest,
-            'total_monthly': mortgage_details.monthly_payment + cash_loan_details.monthly_payment
-        }
\ No newline at end of file
+
+        return self.combine_loan_summary(
+            total_price, own_money, down_payment_percentage,
+            mortgage_amount, cash_loan_amount,
+            mortgage_details, cash_loan_details)
+
+    def calculate_complete_loan_details_batch(self,
+                                              total_prices: ArrayLike,
+                                              own_money: ArrayLike,
+                                              down_payment_percentage: ArrayLike,
+                                              mortgage_rate: ArrayLike,
+                                              mortgage_years: ArrayLike,
+                                              cash_loan_rate: ArrayLike,
+                                              cash_loan_years: ArrayLike
+                                              ) -> LoanSummaryColumns:
+        """
+        Calculate complete details for many purchases in one pass
+        Any argument may be a scalar. Values match
+        calculate_complete_loan_details row by row.
+        """
+        (total_prices, own_money, down_payment_percentage, mortgage_rate,
+         mortgage_years, cash_loan_rate, cash_loan_years) = _broadcast(
+            total_prices, own_money, down_payment_percentage, mortgage_rate,
+            mortgage_years, cash_loan_rate, cash_loan_years)
+
+        required = array("d")
+        mortgage_amounts = array("d")
+        cash_loan_amounts = array("d")
+        for total_price, own, percentage in zip(
+                total_prices, own_money, down_payment_percentage):
+            mortgage_amount, cash_loan_amount = self.calculate_loan_amounts(
+                total_price, own, percentage)
+            required.append(total_price * (percentage / 100))
+            mortgage_amounts.append(mortgage_amount)
+            cash_loan_amounts.append(cash_loan_amount)
+
+        mortgage = self.calculate_loan_details_batch(
+            mortgage_amounts, mortgage_rate, mortgage_years)
+        # Zero cash loan amounts come back as zeros, as in the scalar path
+        cash_loan = self.calculate_loan_details_batch(
+            cash_loan_amounts, cash_loan_rate, cash_loan_years)
+
+        return LoanSummaryColumns({
+            'total_price': array("d", total_prices),
+            'own_money': array("d", own_money),
+            'required_down_payment': required,
+            'mortgage_amount': mortgage_amounts,
+            'cash_loan_amount': cash_loan_amounts,
+            'mortgage_monthly': mortgage.monthly_payment,
+            'mortgage_total': mortgage.total_payment,
+            'mortgage_interest': mortgage.total_interest,
+            'cash_loan_monthly': cash_loan.monthly_payment,
+            'cash_loan_total': cash_loan.total_payment,
+            'cash_loan_interest': cash_loan.total_interest,
+            'total_monthly': array("d", map(
+                float.__add__, mortgage.monthly_payment, cash_loan.monthly_payment)),
+        })
+
+    def combine_loan_summary(self,
+                             total_price: float,
+                             own_money: float,
+                             down_payment_percentage: float,
+                             mortgage_amount: float,
+                             cash_loan_amount: float,
+                             mortgage_details: LoanResult,
+                             cash_loan_details: LoanResult) -> LoanSummary:
+        """Assemble the complete results from both loans' details"""
+        return LoanSummary(
+            total_price,
+            own_money,
+            total_price * (down_payment_percentage / 100),
+            mortgage_amount,
+            cash_loan_amount,
+            mortgage_details.monthly_payment,
+            mortgage_details.total_payment,
+            mortgage_details.total_interest,
+            cash_loan_details.monthly_payment,
+            cash_loan_details.total_payment,
+            cash_loan_details.total_interest,
+            mortgage_details.monthly_payment + cash_loan_details.monthly_payment,
+        )
+
+    def combine_loan_details(self,
+                             total_price: float,
+                             own_money: float,
+                             down_payment_percentage: float,
+                             mortgage_amount: float,
+                             cash_loan_amount: float,
+                             mortgage_details: LoanResult,
+                             cash_loan_details: LoanResult) -> dict:
+        """Same as combine_loan_summary, as the results dict"""
+        return self.combine_loan_summary(
+            total_price, own_money, down_payment_percentage,
+            mortgage_amount, cash_loan_amount,
+            mortgage_details, cash_loan_details)._asdict()
+
+    def calculate_max_affordable_price(self,
+                                       monthly_budgets: ArrayLike,
+                                       own_money: ArrayLike,
+                                       down_payment_percentage: ArrayLike,
+                                       mortgage_rate: ArrayLike,
+                                       mortgage_years: ArrayLike,
+                                       cash_loan_rate: ArrayLike,
+                                       cash_loan_years: ArrayLike) -> array:
+        """
+        Highest total price whose total_monthly fits each monthly budget
+        Inverse of calculate_complete_loan_details. Total monthly payment is
+        piecewise linear in the price, with a break where the required down
+        payment equals own money:
+            price <= own / q: mortgage = price - own, no cash loan
+            price >  own / q: mortgage = price * (1 - q), cash = price * q - own
+        where q is the down payment fraction, so each budget is solved
+        directly instead of searching. Any argument may be a scalar.
+        Returns:
+            array of total prices, one per budget
+        """
+        columns = _broadcast(
+            monthly_budgets,
+            own_money,
+            down_payment_percentage,
+            mortgage_rate,
+            mortgage_years,
+            cash_loan_rate,
+            cash_loan_years,
+        )
+        size = len(columns[0])
+        prices = array("d", bytes(8 * size))
+        factors = {}
+
+        for i, (budget, own, percentage, m_rate, m_years, c_rate, c_years) in (
+            enumerate(zip(*columns))
+        ):
+            mortgage_factor = factors.get((m_rate, m_years))
+            if mortgage_factor is None:
+                mortgage_factor = factors[(m_rate, m_years)] = self.payment_factor(
+                    m_rate, m_years
+                )
+
+            share = percentage / 100
+            # Budget at which own money exactly covers the required down payment
+            if share > 0:
+                break_budget = mortgage_factor * (own / share - own)
+            else:
+                break_budget = float("inf")
+
+            if budget <= break_budget:
+                prices[i] = own + budget / mortgage_factor
+                continue
+
+            cash_factor = factors.get((c_rate, c_years))
+            if cash_factor is None:
+                cash_factor = factors[(c_rate, c_years)] = self.payment_factor(
+                    c_rate, c_years
+                )
+            prices[i] = (budget + cash_factor * own) / (
+                mortgage_factor * (1 - share) + cash_factor * share
+            )
+
+        return prices
+
+    def calculate_max_affordable_price_per_sqm(self,
+                                               monthly_budgets: ArrayLike,
+                                               total_sqm: float,
+                                               parking_price: float,
+                                               own_money: ArrayLike,
+                                               down_payment_percentage: ArrayLike,
+                                               mortgage_rate: ArrayLike,
+                                               mortgage_years: ArrayLike,
+                                               cash_loan_rate: ArrayLike,
+                                               cash_loan_years: ArrayLike) -> array:
+        """Highest price per m² affordable for each monthly budget"""
+        prices = self.calculate_max_affordable_price(
+            monthly_budgets,
+            own_money,
+            down_payment_percentage,
+            mortgage_rate,
+            mortgage_years,
+            cash_loan_rate,
+            cash_loan_years,
+        )
+        return array("d", ((price - parking_price) / total_sqm for price in prices))
@@ -0,0 +1,204 @@
+"""Search for the cheapest way to split own money between the loans"""
+
+import itertools
+from array import array
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Sequence
+
+from loan import LoanCalculator
+
+OBJECTIVES = ("total_interest", "total_monthly")
+
+
+@dataclass
+class AllocationConstraints:
+    """Limits applied to every candidate allocation"""
+
+    reserve: float = 0  # Own money that must stay in the bank
+    max_total_monthly: Optional[float] = None
+    mortgage_years: Sequence[int] = ()  # Candidate terms, empty keeps the given
+    cash_loan_years: Sequence[int] = ()
+
+
+class AllocationCandidate(NamedTuple):
+    """One way of using own money, with the resulting loans"""
+
+    to_down_payment: float  # Own money covering the required kapara
+    to_mortgage: float  # Own money paying down the mortgage principal
+    kept: float
+    mortgage_years: int
+    cash_loan_years: int
+    mortgage_amount: float
+    cash_loan_amount: float
+    total_monthly: float
+    total_interest: float
+
+
+class AllocationResult(NamedTuple):
+    """Best allocation found, next to the default calculate_loan_amounts split"""
+
+    best: Optional[AllocationCandidate]
+    default: AllocationCandidate
+    ranked: List[AllocationCandidate]
+    evaluated: int
+    feasible: int
+
+    @property
+    def interest_saved(self) -> float:
+        if self.best is None:
+            return 0.0
+        return self.default.total_interest - self.best.total_interest
+
+
+def _steps(upper: float, steps: int) -> List[float]:
+    """Evenly spaced values from 0 to upper inclusive"""
+    if upper <= 0:
+        return [0.0]
+    return [upper * i / steps for i in range(steps + 1)]
+
+
+class OwnMoneyOptimizer:
+    """
+    Evaluates a grid of own-money allocations (and optionally loan terms)
+    in single batch calls and picks the one minimizing the objective
+    """
+
+    def __init__(self, calculator: Optional[LoanCalculator] = None):
+        self.calculator = calculator or LoanCalculator()
+
+    def evaluate(
+        self,
+        total_price: float,
+        own_money: float,
+        down_payment_percentage: float,
+        to_down_payment: Sequence[float],
+        to_mortgage: Sequence[float],
+        mortgage_rate: float,
+        mortgage_years: Sequence[int],
+        cash_loan_rate: float,
+        cash_loan_years: Sequence[int],
+    ) -> List[AllocationCandidate]:
+        """Evaluate explicit candidate columns in two batch calls"""
+        required_down_payment = total_price * (down_payment_percentage / 100)
+        financed = total_price - required_down_payment
+        mortgage_amounts = array("d", (financed - b for b in to_mortgage))
+        cash_loan_amounts = array(
+            "d", (required_down_payment - a for a in to_down_payment)
+        )
+
+        mortgage = self.calculator.calculate_loan_details_batch(
+            mortgage_amounts, mortgage_rate, mortgage_years
+        )
+        cash_loan = self.calculator.calculate_loan_details_batch(
+            cash_loan_amounts, cash_loan_rate, cash_loan_years
+        )
+
+        return [
+            AllocationCandidate(
+                a,
+                b,
+                own_money - a - b,
+                m_years,
+                c_years,
+                mortgage_amounts[i],
+                cash_loan_amounts[i],
+                mortgage.monthly_payment[i] + cash_loan.monthly_payment[i],
+                mortgage.total_interest[i] + cash_loan.total_interest[i],
+            )
+            for i, (a, b, m_years, c_years) in enumerate(
+                zip(to_down_payment, to_mortgage, mortgage_years, cash_loan_years)
+            )
+        ]
+
+    def optimize(
+        self,
+        total_price: float,
+        own_money: float,
+        down_payment_percentage: float,
+        mortgage_rate: float,
+        mortgage_years: int,
+        cash_loan_rate: float,
+        cash_loan_years: int,
+        objective: str = "total_interest",
+        constraints: Optional[AllocationConstraints] = None,
+        steps: int = 40,
+        keep_ranked: int = 10,
+    ) -> AllocationResult:
+        """
+        Search own-money allocations for the lowest objective
+        Args:
+            objective: "total_interest" or "total_monthly"
+            constraints: Reserve, payment cap and candidate loan terms
+            steps: Grid resolution for each of the two allocation amounts
+            keep_ranked: Number of best candidates returned in ranked
+        The grid covers every pair (to kapara, to mortgage) that fits in
+        own money minus the reserve; whatever is left over is kept.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(
+                f"Unknown objective {objective!r}, use one of {OBJECTIVES}"
+            )
+        constraints = constraints or AllocationConstraints()
+
+        required_down_payment = total_price * (down_payment_percentage / 100)
+        available = max(own_money - constraints.reserve, 0)
+        financed = total_price - required_down_payment
+
+        to_down_payment = []
+        to_mortgage = []
+        for a in _steps(min(available, required_down_payment), steps):
+            for b in _steps(min(available - a, financed), steps):
+                to_down_payment.append(a)
+                to_mortgage.append(b)
+
+        term_pairs = list(
+            itertools.product(
+                constraints.mortgage_years or (mortgage_years,),
+                constraints.cash_loan_years or (cash_loan_years,),
+            )
+        )
+        size = len(to_down_payment)
+        candidates = self.evaluate(
+            total_price,
+            own_money,
+            down_payment_percentage,
+            to_down_payment * len(term_pairs),
+            to_mortgage * len(term_pairs),
+            mortgage_rate,
+            [m for m, _ in term_pairs for _ in range(size)],
+            cash_loan_rate,
+            [c for _, c in term_pairs for _ in range(size)],
+        )
+
+        feasible = [
+            candidate
+            for candidate in candidates
+            if constraints.max_total_monthly is None
+            or candidate.total_monthly <= constraints.max_total_monthly
+        ]
+        ranked = sorted(
+            feasible,
+            key=lambda c: (getattr(c, objective), c.total_interest, -c.kept),
+        )
+
+        # The split calculate_loan_amounts applies: kapara first, rest to mortgage
+        default_a = min(own_money, required_down_payment)
+        (default,) = self.evaluate(
+            total_price,
+            own_money,
+            down_payment_percentage,
+            [default_a],
+            [own_money - default_a],
+            mortgage_rate,
+            [mortgage_years],
+            cash_loan_rate,
+            [cash_loan_years],
+        )
+
+        return AllocationResult(
+            ranked[0] if ranked else None,
+            default,
+            ranked[:keep_ranked],
+            len(candidates),
+            len(feasible),
+        )
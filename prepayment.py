@@ -0,0 +1,298 @@
+"""Prepayment (prijevremena otplata) strategies and their effect on both loans
+
+Each loan is simulated event by event: between prepayments the balance
+follows the closed-form annuity recurrence, so a one-off prepayment costs a
+handful of operations however long the loan is.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from loan import LoanCalculator
+from sweep import chunked, map_chunks
+
+MODES = ("shorten_term", "lower_annuity")
+RANKINGS = ("net_saved", "interest_saved")
+
+
+class Prepayment(NamedTuple):
+    """
+    Extra payment made together with installment month. With every > 0
+    it repeats every that many months, up to and including month until.
+    """
+
+    month: int
+    amount: float
+    every: int = 0
+    until: Optional[int] = None
+
+    def months(self, last_month: int) -> range:
+        if self.every <= 0:
+            return range(self.month, self.month + 1)
+        end = last_month if self.until is None else min(self.until, last_month)
+        return range(self.month, end + 1, self.every)
+
+
+class LoanTerms(NamedTuple):
+    amount: float
+    annual_rate: float  # As decimal, e.g. 0.0289
+    years: int
+
+
+@dataclass
+class PrepaymentFees:
+    """Fees as a fraction of each prepaid amount, e.g. 0.01 for 1%"""
+
+    mortgage: float = 0.0
+    cash_loan: float = 0.0
+
+
+@dataclass
+class PrepaymentStrategy:
+    """Prepayments for each loan and what the bank does with them"""
+
+    name: str
+    mortgage: Sequence[Prepayment] = ()
+    cash_loan: Sequence[Prepayment] = ()
+    mode: str = "shorten_term"  # Or "lower_annuity"
+    # Keep paying recurring cash loan prepayments into the mortgage once
+    # the cash loan is cleared
+    rollover: bool = False
+
+
+class LoanOutcome(NamedTuple):
+    """One loan under a strategy"""
+
+    installments: int
+    final_monthly: float  # Annuity after the last prepayment
+    total_installments: float
+    prepaid: float
+    fees: float
+    total_interest: float
+
+
+class StrategyResult(NamedTuple):
+    strategy: PrepaymentStrategy
+    mortgage: LoanOutcome
+    cash_loan: LoanOutcome
+    interest_saved: float  # Against no prepayments at all
+
+    @property
+    def total_interest(self) -> float:
+        return self.mortgage.total_interest + self.cash_loan.total_interest
+
+    @property
+    def fees(self) -> float:
+        return self.mortgage.fees + self.cash_loan.fees
+
+    @property
+    def net_saved(self) -> float:
+        """Interest saved minus prepayment fees"""
+        return self.interest_saved - self.fees
+
+
+def _annuity(balance: float, monthly_rate: float, months: int) -> float:
+    if monthly_rate > 0:
+        growth = (1 + monthly_rate) ** months
+        return balance * (monthly_rate * growth) / (growth - 1)
+    return balance / months
+
+
+def _payoff_months(balance: float, payment: float, monthly_rate: float) -> int:
+    """Installments of payment needed to clear balance"""
+    if monthly_rate > 0:
+        exact = -math.log(1 - balance * monthly_rate / payment) / math.log1p(
+            monthly_rate
+        )
+    else:
+        exact = balance / payment
+    # Tolerate float residue so an untouched loan keeps its full term
+    return max(1, math.ceil(exact - 1e-9))
+
+
+def _advance(
+    balance: float, payment: float, monthly_rate: float, months: int
+) -> float:
+    """Balance after months regular installments"""
+    if monthly_rate > 0:
+        growth = (1 + monthly_rate) ** months
+        return balance * growth - payment * (growth - 1) / monthly_rate
+    return balance - payment * months
+
+
+def simulate_loan(
+    terms: LoanTerms,
+    prepayments: Sequence[Tuple[int, float]],
+    mode: str = "shorten_term",
+    fee_rate: float = 0.0,
+) -> LoanOutcome:
+    """
+    Simulate one loan with (month, amount) prepayments sorted by month
+    In shorten_term mode the annuity stays and the loan ends earlier; in
+    lower_annuity mode the term stays and the annuity is recalculated.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, use one of {MODES}")
+    term = terms.years * 12
+    if terms.amount <= 0:
+        return LoanOutcome(0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    monthly_rate = terms.annual_rate / 12
+    balance = terms.amount
+    payment = _annuity(balance, monthly_rate, term)
+    month = 0
+    paid = prepaid = fees = 0.0
+
+    for prepay_month, amount in prepayments:
+        if prepay_month > term:
+            break
+        # Does the loan run out before this prepayment?
+        payoff = _payoff_months(balance, payment, monthly_rate)
+        if month + payoff <= prepay_month:
+            break
+        balance = _advance(balance, payment, monthly_rate, prepay_month - month)
+        paid += payment * (prepay_month - month)
+        month = prepay_month
+
+        amount = min(amount, balance)
+        balance -= amount
+        prepaid += amount
+        fees += amount * fee_rate
+        if balance <= 1e-9:
+            balance = 0.0
+            break
+        if mode == "lower_annuity":
+            payment = _annuity(balance, monthly_rate, term - month)
+
+    if balance > 0:
+        # Regular installments to the end; the last one only clears the rest
+        remaining = min(_payoff_months(balance, payment, monthly_rate), term - month)
+        before_last = _advance(balance, payment, monthly_rate, remaining - 1)
+        paid += payment * (remaining - 1) + before_last * (1 + monthly_rate)
+        month += remaining
+
+    return LoanOutcome(
+        month,
+        payment,
+        paid,
+        prepaid,
+        fees,
+        paid + prepaid - terms.amount,
+    )
+
+
+def expand(
+    prepayments: Sequence[Prepayment], last_month: int
+) -> List[Tuple[int, float]]:
+    """Every (month, amount) of one-off and recurring prepayments, by month"""
+    events = {}
+    for prepayment in prepayments:
+        for month in prepayment.months(last_month):
+            events[month] = events.get(month, 0.0) + prepayment.amount
+    return sorted(events.items())
+
+
+class PrepaymentSimulator:
+    """Compares prepayment strategies for one borrower's mortgage and cash loan"""
+
+    def __init__(
+        self,
+        mortgage: LoanTerms,
+        cash_loan: LoanTerms,
+        fees: Optional[PrepaymentFees] = None,
+    ):
+        self.mortgage = mortgage
+        self.cash_loan = cash_loan
+        self.fees = fees or PrepaymentFees()
+        self.baseline_interest = 0.0
+        baseline = self.evaluate(PrepaymentStrategy("Bez prijevremene otplate"))
+        self.baseline_interest = baseline.total_interest
+        self.baseline = baseline._replace(interest_saved=0.0)
+
+    @classmethod
+    def from_inputs(
+        cls,
+        total_price: float,
+        own_money: float,
+        down_payment_percentage: float,
+        mortgage_rate: float,
+        mortgage_years: int,
+        cash_loan_rate: float,
+        cash_loan_years: int,
+        fees: Optional[PrepaymentFees] = None,
+    ) -> "PrepaymentSimulator":
+        """Simulator for the loans calculate_complete_loan_details would take"""
+        mortgage_amount, cash_loan_amount = LoanCalculator().calculate_loan_amounts(
+            total_price, own_money, down_payment_percentage
+        )
+        return cls(
+            LoanTerms(mortgage_amount, mortgage_rate, mortgage_years),
+            LoanTerms(cash_loan_amount, cash_loan_rate, cash_loan_years),
+            fees,
+        )
+
+    def evaluate(self, strategy: PrepaymentStrategy) -> StrategyResult:
+        """Simulate both loans under one strategy"""
+        cash_loan = simulate_loan(
+            self.cash_loan,
+            expand(strategy.cash_loan, self.cash_loan.years * 12),
+            strategy.mode,
+            self.fees.cash_loan,
+        )
+
+        mortgage_prepayments = list(strategy.mortgage)
+        if strategy.rollover and cash_loan.installments:
+            start = cash_loan.installments + 1
+            for prepayment in strategy.cash_loan:
+                if prepayment.every > 0:
+                    # Continue the same rhythm on the mortgage
+                    offset = max(start - prepayment.month, 0)
+                    first = prepayment.month + -(-offset // prepayment.every) * (
+                        prepayment.every
+                    )
+                    mortgage_prepayments.append(
+                        Prepayment(first, prepayment.amount, prepayment.every)
+                    )
+        mortgage = simulate_loan(
+            self.mortgage,
+            expand(mortgage_prepayments, self.mortgage.years * 12),
+            strategy.mode,
+            self.fees.mortgage,
+        )
+
+        return StrategyResult(
+            strategy,
+            mortgage,
+            cash_loan,
+            self.baseline_interest
+            - mortgage.total_interest
+            - cash_loan.total_interest,
+        )
+
+    def evaluate_many(
+        self, strategies: Sequence[PrepaymentStrategy]
+    ) -> List[StrategyResult]:
+        return [self.evaluate(strategy) for strategy in strategies]
+
+    def compare(
+        self,
+        strategies: Sequence[PrepaymentStrategy],
+        rank_by: str = "net_saved",
+        workers: int = 1,
+        chunk_size: int = 500,
+    ) -> List[StrategyResult]:
+        """
+        Evaluate every strategy and rank them, best first
+        Args:
+            rank_by: "net_saved" (interest saved minus fees) or "interest_saved"
+            workers: Processes for large comparisons; 1 evaluates inline
+        """
+        if rank_by not in RANKINGS:
+            raise ValueError(f"Unknown ranking {rank_by!r}, use one of {RANKINGS}")
+        results = []
+        for _, evaluated in map_chunks(
+            self.evaluate_many, chunked(strategies, chunk_size), workers
+        ):
+            results.extend(evaluated)
+        return sorted(results, key=lambda result: -getattr(result, rank_by))
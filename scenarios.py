@@ -0,0 +1,144 @@
+"""Named scenarios compared side by side, evaluated in one batch call"""
+
+from array import array
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from config import Config
+from loan import InputValidator, LoanCalculator, LoanSummary, LoanSummaryColumns
+
+# Validated input keys, in InputValidator order
+INPUT_KEYS = tuple(rule[1] for rule in InputValidator.FIELD_RULES)
+# array typecode per key: loan terms are ints, as InputValidator returns them
+TYPECODES = {
+    rule[1]: "l" if rule[5] else "d" for rule in InputValidator.FIELD_RULES
+}
+
+
+class ScenarioComparison(NamedTuple):
+    """One scenario's results and their difference to the baseline"""
+
+    name: str
+    results: LoanSummary
+    deltas: LoanSummary  # results - baseline results, field by field
+    is_baseline: bool
+
+
+class ScenarioSet:
+    """
+    Ordered set of named scenarios, stored as one array('d') per input key
+    rather than a dict per scenario
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.columns: Dict[str, array] = {
+            key: array(TYPECODES[key]) for key in INPUT_KEYS
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def add(self, name: str, validated: Dict[str, float]):
+        """Add a scenario from validated inputs, replacing one of the same name"""
+        if name in self.names:
+            index = self.names.index(name)
+            for key in INPUT_KEYS:
+                self.columns[key][index] = validated[key]
+            return
+        self.names.append(name)
+        for key in INPUT_KEYS:
+            self.columns[key].append(validated[key])
+
+    def remove(self, name: str):
+        index = self.names.index(name)
+        del self.names[index]
+        for column in self.columns.values():
+            del column[index]
+
+    def inputs(self, name: str) -> Dict[str, float]:
+        """Validated inputs of a scenario, as InputValidator returns them"""
+        index = self.names.index(name)
+        return {key: self.columns[key][index] for key in INPUT_KEYS}
+
+    def copy(self) -> "ScenarioSet":
+        """Snapshot, e.g. to evaluate in the background while editing"""
+        scenarios = ScenarioSet()
+        scenarios.names = list(self.names)
+        scenarios.columns = {
+            key: array(column.typecode, column) for key, column in self.columns.items()
+        }
+        return scenarios
+
+    def evaluate(
+        self,
+        calculator: Optional[LoanCalculator] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        chunk_size: int = Config.BACKGROUND["chunk_rows"],
+    ) -> LoanSummaryColumns:
+        """
+        Results of every scenario, one batch call per chunk_size scenarios
+        (a single call for any realistic set). progress(done, total) is
+        called after each chunk; job.checkpoint makes it cancellable.
+        """
+        calculator = calculator or LoanCalculator()
+        results = LoanSummaryColumns()
+        total = len(self)
+        for start in range(0, total, chunk_size):
+            c = {
+                key: column[start : start + chunk_size]
+                for key, column in self.columns.items()
+            }
+            total_prices = array(
+                "d",
+                map(
+                    calculator.calculate_property_costs,
+                    c["price_per_sqm"],
+                    c["total_sqm"],
+                    c["parking_price"],
+                ),
+            )
+            chunk = calculator.calculate_complete_loan_details_batch(
+                total_prices,
+                c["down_payment"],
+                c["advance_percentage"],
+                c["mortgage_rate"],
+                c["mortgage_years"],
+                c["cash_loan_rate"],
+                c["cash_loan_years"],
+            )
+            for field, column in chunk.columns.items():
+                results.columns[field].extend(column)
+            if progress:
+                progress(min(start + chunk_size, total), total)
+        return results
+
+    def compare(
+        self,
+        baseline: Optional[str] = None,
+        calculator: Optional[LoanCalculator] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[ScenarioComparison]:
+        """
+        Evaluate all scenarios and express each against the baseline
+        (the first scenario unless another name is given)
+        """
+        if not self.names:
+            return []
+        baseline_index = self.names.index(baseline) if baseline else 0
+        results = list(self.evaluate(calculator, progress))
+        base = results[baseline_index]
+        return [
+            ScenarioComparison(
+                name,
+                summary,
+                LoanSummary._make(map(float.__sub__, summary, base)),
+                index == baseline_index,
+            )
+            for index, (name, summary) in enumerate(zip(self.names, results))
+        ]
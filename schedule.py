@@ -0,0 +1,158 @@
+"""Month-by-month amortization schedules"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, NamedTuple
+
+from loan import LoanCalculator
+
+
+class ScheduleRow(NamedTuple):
+    """Single installment of an amortization schedule"""
+
+    month: int
+    payment: float
+    interest: float
+    principal: float
+    balance: float
+
+
+@dataclass
+class ScheduleArrays:
+    """Compact columnar amortization schedule, one entry per month"""
+
+    payment: array
+    interest: array
+    principal: array
+    balance: array
+
+    def __len__(self) -> int:
+        return len(self.payment)
+
+    def __getitem__(self, index: int) -> ScheduleRow:
+        if index < 0:
+            index += len(self)
+        return ScheduleRow(
+            index + 1,
+            self.payment[index],
+            self.interest[index],
+            self.principal[index],
+            self.balance[index],
+        )
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def iter_schedule(principal: float, annual_rate: float, years: int) -> Iterator[ScheduleRow]:
+    """
+    Lazily yield the amortization schedule of a loan
+    Args:
+        principal: Loan amount
+        annual_rate: Annual interest rate (as decimal, e.g., 0.0289 for 2.89%)
+        years: Loan term in years
+    The final installment absorbs floating point residue so the loan
+    closes at exactly zero.
+    """
+    if principal <= 0:
+        return
+
+    monthly_payment = LoanCalculator().calculate_loan_details(
+        principal, annual_rate, years
+    ).monthly_payment
+    monthly_rate = annual_rate / 12
+    months = years * 12
+    balance = principal
+
+    for month in range(1, months):
+        interest = balance * monthly_rate
+        principal_part = monthly_payment - interest
+        balance -= principal_part
+        yield ScheduleRow(month, monthly_payment, interest, principal_part, balance)
+
+    interest = balance * monthly_rate
+    yield ScheduleRow(months, interest + balance, interest, balance, 0.0)
+
+
+def build_schedule(principal: float, annual_rate: float, years: int) -> ScheduleArrays:
+    """Build the full amortization schedule in compact array form"""
+    schedule = ScheduleArrays(array("d"), array("d"), array("d"), array("d"))
+    for row in iter_schedule(principal, annual_rate, years):
+        schedule.payment.append(row.payment)
+        schedule.interest.append(row.interest)
+        schedule.principal.append(row.principal)
+        schedule.balance.append(row.balance)
+    return schedule
+
+
+class LazySchedule:
+    """
+    Amortization schedule with random access to any month in O(1)
+    Rows come from the closed-form balance
+        B_k = P * g^k - A * (g^k - 1) / i,  g = 1 + i
+    and are only computed when asked for, so views can show a window of a
+    long schedule without building it. Values agree with iter_schedule to
+    floating point precision.
+    """
+
+    def __init__(self, principal: float, annual_rate: float, years: int):
+        self.principal = max(principal, 0)
+        self.annual_rate = annual_rate
+        self.years = years
+        self.monthly_rate = annual_rate / 12
+        self.months = int(years * 12) if self.principal > 0 else 0
+        self.payment = (
+            LoanCalculator()
+            .calculate_loan_details(self.principal, annual_rate, years)
+            .monthly_payment
+        )
+
+    def __len__(self) -> int:
+        return self.months
+
+    def balance(self, month: int) -> float:
+        """Outstanding balance after month installments"""
+        if month >= self.months:
+            return 0.0
+        rate = self.monthly_rate
+        if rate > 0:
+            growth = (1 + rate) ** month
+            return self.principal * growth - self.payment * (growth - 1) / rate
+        return self.principal - self.payment * month
+
+    def cumulative_interest(self, month: int) -> float:
+        """Interest paid with the first month installments"""
+        month = min(month, self.months)
+        if month == self.months and month:
+            # The final installment differs from the annuity, see __getitem__
+            last = self[month - 1]
+            return self.payment * (month - 1) + last.payment - self.principal
+        return self.payment * month - (self.principal - self.balance(month))
+
+    def __getitem__(self, index: int) -> ScheduleRow:
+        if index < 0:
+            index += self.months
+        if not 0 <= index < self.months:
+            raise IndexError("schedule index out of range")
+        month = index + 1
+        previous = self.balance(index)
+        interest = previous * self.monthly_rate
+        if month == self.months:
+            # Final installment closes the loan, as in iter_schedule
+            return ScheduleRow(month, previous + interest, interest, previous, 0.0)
+        principal_part = self.payment - interest
+        return ScheduleRow(
+            month, self.payment, interest, principal_part, self.balance(month)
+        )
+
+    def rows(self, start: int, stop: int) -> Iterator[ScheduleRow]:
+        """Rows start..stop-1 (0-based), clipped to the schedule"""
+        for index in range(max(start, 0), min(stop, self.months)):
+            yield self[index]
+
+    def __iter__(self) -> Iterator[ScheduleRow]:
+        """Every row in order, by the running recurrence of iter_schedule"""
+        if not self.months:
+            return iter(())
+        return iter_schedule(self.principal, self.annual_rate, int(self.years))
@@ -0,0 +1,299 @@
+"""Local HTTP/JSON service with request micro-batching
+
+Endpoints:
+    POST /calculate   body: one input record (GUI field ids) or a list of them
+    GET  /metrics     throughput, batch sizes and latency percentiles
+    GET  /health
+
+Concurrent requests arriving within Config.SERVICE["batch_window_ms"] are
+evaluated together in one calculate_complete_loan_details_batch call.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from batch import validate_record
+from cents import default_calculator
+from config import Config
+from instrumentation import percentile
+from loan import LoanCalculator, LoanSummary, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceMetrics:
+    """Request counters and a bounded window of recent latencies"""
+
+    def __init__(self, samples: int = Config.SERVICE["latency_samples"]):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.records = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_records = 0
+        self.latencies = deque(maxlen=samples)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        ordered = sorted(self.latencies)
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "records": self.records,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": (
+                self.batched_records / self.batches if self.batches else 0.0
+            ),
+            "records_per_s": self.records / uptime if uptime > 0 else 0.0,
+            "latency_ms": {
+                f"p{p}": percentile(ordered, p) * 1e3 for p in (50, 95, 99)
+            },
+        }
+
+
+class MicroBatcher:
+    """Collects validated inputs for a short window and evaluates them together"""
+
+    def __init__(
+        self,
+        calculator: LoanCalculator,
+        metrics: ServiceMetrics,
+        window: float = Config.SERVICE["batch_window_ms"] / 1000,
+        max_size: int = Config.SERVICE["max_batch_size"],
+    ):
+        self.calculator = calculator
+        self.metrics = metrics
+        self.window = window
+        self.max_size = max_size
+        self.queue = asyncio.Queue()
+
+    def submit(self, validated: Dict[str, float]) -> "asyncio.Future[LoanSummary]":
+        """Queue one validated record, resolving to its LoanSummary"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((validated, future))
+        return future
+
+    async def run(self):
+        """Batch loop; runs until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(pending) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            records = [validated for validated, _ in pending]
+            try:
+                outcomes = await loop.run_in_executor(None, self.evaluate, records)
+            except Exception:
+                # One bad record must not fail the requests batched with it
+                outcomes = await loop.run_in_executor(
+                    None, self.evaluate_each, records
+                )
+
+            self.metrics.batches += 1
+            self.metrics.batched_records += len(pending)
+            for outcome, (_, future) in zip(outcomes, pending):
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    def evaluate(self, batch: List[Dict[str, float]]):
+        """Run one batch through the columnar engine"""
+        calculator = self.calculator
+        return calculator.calculate_complete_loan_details_batch(
+            [
+                calculator.calculate_property_costs(
+                    v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+                )
+                for v in batch
+            ],
+            [v["down_payment"] for v in batch],
+            [v["advance_percentage"] for v in batch],
+            [v["mortgage_rate"] for v in batch],
+            [v["mortgage_years"] for v in batch],
+            [v["cash_loan_rate"] for v in batch],
+            [v["cash_loan_years"] for v in batch],
+        )
+
+    def evaluate_each(self, batch: List[Dict[str, float]]) -> list:
+        """Evaluate records one by one, giving each its LoanSummary or error"""
+        outcomes = []
+        for validated in batch:
+            try:
+                outcomes.append(self.evaluate([validated])[0])
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+
+class LoanService:
+    """Minimal HTTP/1.1 server in front of the micro-batcher"""
+
+    def __init__(self, calculator: Optional[LoanCalculator] = None):
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(calculator or default_calculator(), self.metrics)
+
+    async def calculate(self, body: bytes) -> Tuple[HTTPStatus, object]:
+        """Handle POST /calculate"""
+        try:
+            payload = json.loads(body or b"null")
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Neispravan JSON: {e.msg}."}
+
+        single = isinstance(payload, dict)
+        records = [payload] if single else payload
+        if not isinstance(records, list) or not all(
+            isinstance(record, dict) for record in records
+        ):
+            return HTTPStatus.BAD_REQUEST, {
+                "error": "Očekuje se JSON objekt ili lista objekata."
+            }
+
+        try:
+            validated = [validate_record(record) for record in records]
+        except ValidationError as e:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(e)}
+
+        try:
+            summaries = await asyncio.gather(
+                *(self.batcher.submit(v) for v in validated)
+            )
+        except Exception as e:
+            logger.exception("Greška u izračunu")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {
+                "error": f"Greška u izračunu: {e}"
+            }
+        self.metrics.records += len(summaries)
+        results = [summary._asdict() for summary in summaries]
+        return HTTPStatus.OK, results[0] if single else results
+
+    async def route(self, method: str, path: str, body: bytes):
+        if path == "/calculate" and method == "POST":
+            return await self.calculate(body)
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.metrics.snapshot()
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Serve requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                self.metrics.requests += 1
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self.reject(writer)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                start = time.perf_counter()
+                try:
+                    status, payload = await self.route(method, path, body)
+                except Exception:
+                    logger.exception("Neočekivana greška za %s %s", method, path)
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"error": "Neočekivana greška servisa."}
+                if status != HTTPStatus.OK:
+                    self.metrics.errors += 1
+                if path == "/calculate":
+                    self.metrics.latencies.append(time.perf_counter() - start)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ValueError:
+            # readline() raises it for lines longer than the stream limit
+            await self.reject(writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # The client went away mid-request, there is no one to answer
+            pass
+        finally:
+            writer.close()
+
+    async def reject(self, writer: asyncio.StreamWriter):
+        """
+        Answer a malformed request with 400 and close, since the position
+        of the next request in the stream is unknown
+        """
+        self.metrics.errors += 1
+        await self.respond(
+            writer,
+            HTTPStatus.BAD_REQUEST,
+            {"error": "Neispravan HTTP zahtjev."},
+            keep_alive=False,
+        )
+
+    @staticmethod
+    async def respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: object,
+        keep_alive: bool = True,
+    ):
+        """Write one JSON response"""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n".encode("latin-1")
+            + data
+        )
+        await writer.drain()
+
+    async def serve(self, host: str, port: int):
+        """Run the server and batch loop until cancelled"""
+        batch_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def serve(
+    host: str = Config.SERVICE["host"], port: int = Config.SERVICE["port"]
+):
+    """Blocking entry point used by calculator.py --serve"""
+    try:
+        asyncio.run(LoanService().serve(host, port))
+    except KeyboardInterrupt:
+        pass
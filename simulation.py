@@ -0,0 +1,309 @@
+"""Monte Carlo interest-rate risk for the mortgage and cash loan
+
+Index-rate paths are drawn from a seeded, mean-reverting model and every
+path is evaluated through the variable-rate engine in batches. Outcomes are
+folded into fixed-size histograms as they come in, so memory does not grow
+with the number of paths and chunks from worker processes merge exactly.
+"""
+
+import math
+import os
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from config import Config
+from sweep import map_chunks
+from variable_rate import RatePeriod, VariableRateCalculator, rate_path
+
+METRICS = ("mortgage_max_monthly", "total_max_monthly", "total_interest")
+
+
+@dataclass
+class IndexRateModel:
+    """
+    Mean-reverting index (e.g. EURIBOR), one draw per reset:
+        r += reversion * step * (long_run - r) + volatility * sqrt(step) * N(0, 1)
+    clamped to [floor, cap]. Rates are decimals, e.g. 0.025 for 2.5%.
+    """
+
+    initial: float = 0.025
+    long_run: float = 0.025
+    reversion: float = 0.15
+    volatility: float = 0.006
+    floor: float = 0.0
+    cap: float = 0.10
+
+    def sample(
+        self, rng: random.Random, resets: int, step_years: float
+    ) -> List[float]:
+        """Index value in effect after each of the next resets"""
+        drift = self.reversion * step_years
+        shock = self.volatility * math.sqrt(step_years)
+        rate = self.initial
+        path = []
+        for _ in range(resets):
+            rate += drift * (self.long_run - rate) + shock * rng.gauss(0.0, 1.0)
+            rate = min(max(rate, self.floor), self.cap)
+            path.append(rate)
+        return path
+
+
+@dataclass
+class SimulationSetup:
+    """Both loans and how their rates follow the index"""
+
+    mortgage_amount: float
+    mortgage_rate: float  # Fixed rate during the first fixed_years
+    mortgage_years: int
+    fixed_years: int  # Multiple of reset_years; 0 floats from the start
+    margin: float  # Added to the index after the fixed period
+    cash_loan_amount: float = 0.0
+    cash_loan_rate: float = 0.0
+    cash_loan_years: int = 1
+    cash_loan_margin: Optional[float] = None  # None keeps the cash loan fixed
+    reset_years: int = 1
+    model: IndexRateModel = field(default_factory=IndexRateModel)
+
+    def __post_init__(self):
+        if self.reset_years < 1:
+            raise ValueError("reset_years must be at least 1")
+        if self.fixed_years < 0 or self.fixed_years % self.reset_years:
+            raise ValueError(
+                f"fixed_years ({self.fixed_years}) must be a non-negative"
+                f" multiple of reset_years ({self.reset_years})"
+            )
+
+    @property
+    def resets(self) -> int:
+        """Index draws needed to cover the longer of the two loans"""
+        return -(-max(self.mortgage_years, self.cash_loan_years) // self.reset_years)
+
+    # index[k] is the index value drawn for year (k + 1) * reset_years
+
+    def mortgage_path(self, index: Sequence[float]) -> List[RatePeriod]:
+        if self.fixed_years == 0:
+            return self._floating_path(self.margin, self.mortgage_years, index)
+        first = self.fixed_years // self.reset_years - 1
+        floating = -(-(self.mortgage_years - self.fixed_years) // self.reset_years)
+        return rate_path(
+            self.mortgage_rate,
+            self.fixed_years,
+            index[first : first + floating],
+            self.margin,
+            self.reset_years,
+        )
+
+    def cash_loan_path(self, index: Sequence[float]) -> List[RatePeriod]:
+        if self.cash_loan_margin is None:
+            return [RatePeriod(1, self.cash_loan_rate)]
+        return self._floating_path(self.cash_loan_margin, self.cash_loan_years, index)
+
+    def _floating_path(
+        self, margin: float, years: int, index: Sequence[float]
+    ) -> List[RatePeriod]:
+        """Floats from month 1, on today's index until the first reset"""
+        floating = -(-years // self.reset_years) - 1
+        return rate_path(
+            self.model.initial + margin,
+            self.reset_years,
+            index[:floating],
+            margin,
+            self.reset_years,
+        )
+
+
+class Histogram:
+    """Fixed-range histogram with exact count, mean, minimum and maximum"""
+
+    def __init__(self, low: float, high: float, bins: int):
+        self.low = low
+        self.high = high
+        self.counts = array("q", bytes(8 * bins))
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, values: Iterable[float]):
+        counts = self.counts
+        last = len(counts) - 1
+        scale = len(counts) / (self.high - self.low) if self.high > self.low else 0.0
+        low = self.low
+        for value in values:
+            counts[min(max(int((value - low) * scale), 0), last)] += 1
+            self.count += 1
+            self.total += value
+            if value < self.minimum:
+                self.minimum = value
+            if value > self.maximum:
+                self.maximum = value
+
+    def merge(self, other: "Histogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, percent: float) -> float:
+        """Value below which percent of samples fall, accurate to one bin"""
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        width = (self.high - self.low) / len(self.counts)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                value = self.low + width * (i + (target - seen) / count)
+                return min(max(value, self.minimum), self.maximum)
+            seen += count
+        return self.maximum
+
+
+class SimulationChunk(NamedTuple):
+    """Work unit sent to a worker; its seed depends only on seed and index"""
+
+    setup: SimulationSetup
+    seed: int
+    index: int
+    paths: int
+    bounds: Dict[str, tuple]
+    bins: int
+
+
+class SimulationResult(NamedTuple):
+    """Outcome distributions of a simulation run"""
+
+    paths: int
+    seed: int
+    fixed_monthly: float  # Total monthly payment during the fixed period
+    histograms: Dict[str, Histogram]
+
+    def quantiles(
+        self, percents: Sequence[float] = (5, 25, 50, 75, 95)
+    ) -> Dict[str, Dict[float, float]]:
+        """Selected percentiles of every metric"""
+        return {
+            metric: {p: histogram.quantile(p) for p in percents}
+            for metric, histogram in self.histograms.items()
+        }
+
+
+def _evaluate(
+    setup: SimulationSetup, index_paths: List[List[float]]
+) -> Dict[str, list]:
+    """Metric columns for a list of index paths"""
+    calculator = VariableRateCalculator()
+    mortgage = calculator.calculate_batch(
+        setup.mortgage_amount,
+        [setup.mortgage_path(index) for index in index_paths],
+        setup.mortgage_years,
+    )
+    cash_loan = calculator.calculate_batch(
+        setup.cash_loan_amount,
+        [setup.cash_loan_path(index) for index in index_paths],
+        setup.cash_loan_years,
+    )
+    return {
+        "mortgage_max_monthly": mortgage.max_payment,
+        "total_max_monthly": list(
+            map(float.__add__, mortgage.max_payment, cash_loan.max_payment)
+        ),
+        "total_interest": list(
+            map(float.__add__, mortgage.total_interest, cash_loan.total_interest)
+        ),
+    }
+
+
+def _simulate_chunk(chunk: SimulationChunk) -> Dict[str, Histogram]:
+    """Draw and evaluate one chunk of paths (runs in a worker process)"""
+    setup = chunk.setup
+    # String seeds are hashed with SHA-512, so streams are stable everywhere
+    rng = random.Random(f"{chunk.seed}:{chunk.index}")
+    index_paths = [
+        setup.model.sample(rng, setup.resets, setup.reset_years)
+        for _ in range(chunk.paths)
+    ]
+    histograms = {}
+    for metric, values in _evaluate(setup, index_paths).items():
+        histograms[metric] = Histogram(*chunk.bounds[metric], chunk.bins)
+        histograms[metric].add(values)
+    return histograms
+
+
+def simulate(
+    setup: SimulationSetup,
+    paths: int = Config.SIMULATION["paths"],
+    seed: int = Config.SIMULATION["seed"],
+    workers: Optional[int] = None,
+    chunk_size: int = Config.SIMULATION["chunk_size"],
+    bins: int = Config.SIMULATION["bins"],
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> SimulationResult:
+    """
+    Run a Monte Carlo simulation of index-rate paths
+    Args:
+        setup: Loans and rate model
+        paths: Number of simulated index paths
+        seed: Results depend only on seed, paths and chunk_size,
+            not on the number of workers
+        workers: Worker processes; by default one for runs that fit in a
+            single chunk, otherwise one per CPU
+        chunk_size: Paths evaluated per batch call
+        bins: Histogram resolution of each metric
+        progress: Called with (paths done, paths) after every chunk; from
+            a background job pass job.checkpoint to make the run cancellable
+    """
+    # Histogram ranges from the all-floor and all-cap paths; every outcome
+    # rises with the rates, so all paths fall between the two
+    model = setup.model
+    extremes = _evaluate(
+        setup, [[model.floor] * setup.resets, [model.cap] * setup.resets]
+    )
+    bounds = {metric: tuple(values) for metric, values in extremes.items()}
+
+    chunks = [
+        SimulationChunk(
+            setup, seed, index, min(chunk_size, paths - start), bounds, bins
+        )
+        for index, start in enumerate(range(0, paths, chunk_size))
+    ]
+    if workers is None:
+        workers = 1 if len(chunks) <= 1 else os.cpu_count() or 1
+
+    histograms = {metric: Histogram(*bounds[metric], bins) for metric in METRICS}
+    done = 0
+    for chunk, chunk_histograms in map_chunks(_simulate_chunk, chunks, workers):
+        for metric, histogram in chunk_histograms.items():
+            histograms[metric].merge(histogram)
+        done += chunk.paths
+        if progress:
+            progress(done, paths)
+
+    first = VariableRateCalculator()
+    fixed_monthly = (
+        first.calculate(
+            setup.mortgage_amount, setup.mortgage_path([]), setup.mortgage_years
+        ).monthly_payment
+        + first.calculate(
+            setup.cash_loan_amount,
+            setup.cash_loan_path([]),
+            setup.cash_loan_years,
+        ).monthly_payment
+    )
+    return SimulationResult(paths, seed, fixed_monthly, histograms)
@@ -0,0 +1,260 @@
+"""Parallel scenario sweeps over investor presets and loan parameter grids
+
+Workers receive index ranges into the preset × grid product rather than
+the scenarios themselves, rebuild their slice from the axes and return
+one array('d') per result field, so the parent does almost no per-row
+work and the sweep scales with the number of processes.
+"""
+
+import itertools
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from catalog import get_catalog
+from loan import LoanCalculator, LoanSummary, LoanSummaryColumns
+
+
+@dataclass
+class SweepGrid:
+    """Loan parameter grid applied to every investor and apartment type"""
+
+    mortgage_rates: Sequence[float]  # As decimals, e.g. 0.0289
+    mortgage_years: Sequence[int]
+    cash_loan_rates: Sequence[float]  # As decimals, e.g. 0.045
+    cash_loan_years: Sequence[int]
+    own_money: Sequence[float]
+    parking_price: float = 0
+
+
+class SweepScenario(NamedTuple):
+    """Single point of the sweep's cartesian product"""
+
+    investor: str
+    apartment_type: str
+    price_per_sqm: float
+    total_sqm: float
+    advance_percentage: float
+    mortgage_rate: float
+    mortgage_years: int
+    cash_loan_rate: float
+    cash_loan_years: int
+    own_money: float
+    parking_price: float
+
+
+class SweepResult(NamedTuple):
+    """Scenario together with its calculated loan summary"""
+
+    scenario: SweepScenario
+    results: LoanSummary
+
+
+class SweepChunk(NamedTuple):
+    """Work unit sent to a worker: a range of scenario indices and the axes"""
+
+    grid: SweepGrid
+    presets: List[tuple]
+    start: int
+    stop: int
+
+
+class SweepBatch(NamedTuple):
+    """Results of one chunk of scenarios, one array per LoanSummary field"""
+
+    chunk: SweepChunk
+    results: LoanSummaryColumns
+
+    def scenarios(self) -> Iterator[SweepScenario]:
+        """The chunk's scenarios, rebuilt only when asked for"""
+        chunk = self.chunk
+        columns = scenario_columns(chunk.grid, chunk.presets, chunk.start, chunk.stop)
+        for preset, *loan in zip(*columns):
+            yield SweepScenario(*preset, *loan, chunk.grid.parking_price)
+
+    def rows(self) -> Iterator[SweepResult]:
+        """Scenario and LoanSummary pairs, for per-row consumers"""
+        return map(SweepResult, self.scenarios(), self.results)
+
+
+class SweepProgress(NamedTuple):
+    """Progress snapshot reported after every finished chunk"""
+
+    done: int
+    total: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Scenarios per second so far"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def iter_presets() -> Iterator[tuple]:
+    """Yield (investor, apartment_type, price_per_sqm, area, advance_percentage)"""
+    for name, apartment_type, area, updates in get_catalog().iter_units():
+        yield (
+            name,
+            apartment_type,
+            float(updates["cijena_po_kvadratu"]),
+            float(area),
+            float(updates["postotak_za_kaparu"]),
+        )
+
+
+def iter_scenarios(grid: SweepGrid) -> Iterator[SweepScenario]:
+    """Lazily yield every preset × grid combination in a stable order"""
+    presets = list(iter_presets())
+    for preset, *loan in itertools.product(*_axes(grid, presets)):
+        yield SweepScenario(*preset, *loan, grid.parking_price)
+
+
+def _axes(grid: SweepGrid, presets: List[tuple]) -> tuple:
+    """Axes of the scenario product, slowest-varying first"""
+    return (
+        presets,
+        grid.mortgage_rates,
+        grid.mortgage_years,
+        grid.cash_loan_rates,
+        grid.cash_loan_years,
+        grid.own_money,
+    )
+
+
+def count_scenarios(grid: SweepGrid, presets: Optional[List[tuple]] = None) -> int:
+    """Number of scenarios iter_scenarios will produce"""
+    if presets is None:
+        presets = list(iter_presets())
+    total = 1
+    for axis in _axes(grid, presets):
+        total *= len(axis)
+    return total
+
+
+def scenario_columns(
+    grid: SweepGrid, presets: List[tuple], start: int, stop: int
+) -> List[list]:
+    """
+    Values of every axis for scenarios start..stop-1 in iter_scenarios
+    order, computed from the index alone
+    """
+    columns = []
+    stride = 1
+    for axis in reversed(_axes(grid, presets)):
+        size = len(axis)
+        columns.append([axis[index // stride % size] for index in range(start, stop)])
+        stride *= size
+    columns.reverse()
+    return columns
+
+
+def evaluate_range(chunk: SweepChunk) -> LoanSummaryColumns:
+    """Rebuild and evaluate one range of scenarios (runs in a worker process)"""
+    presets, mortgage_rates, mortgage_years, cash_rates, cash_years, own_money = (
+        scenario_columns(chunk.grid, chunk.presets, chunk.start, chunk.stop)
+    )
+    calculator = LoanCalculator()
+    parking_price = chunk.grid.parking_price
+    total_prices = array(
+        "d",
+        (
+            calculator.calculate_property_costs(preset[2], preset[3], parking_price)
+            for preset in presets
+        ),
+    )
+    return calculator.calculate_complete_loan_details_batch(
+        total_prices,
+        own_money,
+        array("d", (preset[4] for preset in presets)),
+        mortgage_rates,
+        mortgage_years,
+        cash_rates,
+        cash_years,
+    )
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(
+    function: Callable[[list], list],
+    chunks: Iterable[list],
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[list, list]]:
+    """
+    Apply function to every chunk in a process pool, yielding
+    (chunk, output) pairs in input order. Only a small window of chunks
+    is in flight at a time, so memory stays bounded however long the
+    input is. workers=1 runs everything in the current process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield chunk, function(chunk)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(function, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    finally:
+        # Drop queued chunks when the consumer stops early, e.g. cancelled
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_sweep(
+    grid: SweepGrid,
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    progress: Optional[Callable[[SweepProgress], None]] = None,
+) -> Iterator[SweepBatch]:
+    """
+    Evaluate every scenario of the grid across a process pool
+    Args:
+        grid: Loan parameters combined with every preset apartment
+        workers: Number of worker processes (defaults to CPU count)
+        chunk_size: Scenarios evaluated by a worker at once
+        progress: Optional callback receiving a SweepProgress per chunk
+    Yields:
+        SweepBatch per chunk, in iter_scenarios order; use batch.rows()
+        for SweepResult records
+    """
+    presets = list(iter_presets())
+    total = count_scenarios(grid, presets)
+    chunks = (
+        SweepChunk(grid, presets, start, min(start + chunk_size, total))
+        for start in range(0, total, chunk_size)
+    )
+    start = time.perf_counter()
+
+    for chunk, results in map_chunks(evaluate_range, chunks, workers):
+        if progress:
+            progress(SweepProgress(chunk.stop, total, time.perf_counter() - start))
+        yield SweepBatch(chunk, results)
@@ -0,0 +1,227 @@
+"""Precomputed, memory-mapped payment tables for the preset catalog
+
+File layout:
+    8 bytes   magic
+    8 bytes   header length, little-endian
+    n bytes   JSON header (fields, axes, presets, byte order)
+    padding   up to a 64-byte boundary
+    float64   values in [preset][mortgage_rate][mortgage_years][own_money][field]
+              order, native byte order
+
+Usage:
+    python tables.py payment_tables.bin
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from catalog import get_catalog
+from config import Config
+from loan import LoanCalculator, LoanSummary
+
+MAGIC = b"KKTABLE1"
+ALIGNMENT = 64
+AXES = ("mortgage_rate", "mortgage_years", "own_money")
+
+
+@dataclass
+class TableGrid:
+    """Standard grid every catalog unit is precomputed on"""
+
+    mortgage_rates: Sequence[float] = field(
+        default_factory=lambda: [r / 10000 for r in range(200, 601, 25)]
+    )
+    mortgage_years: Sequence[int] = (10, 15, 20, 25, 30, 35, 40)
+    own_money: Sequence[float] = field(
+        default_factory=lambda: [float(a) for a in range(0, 100001, 5000)]
+    )
+    cash_loan_rate: float = float(Config.DEFAULTS["gotovinski_kredit_kamata"]) / 100
+    cash_loan_years: int = int(Config.DEFAULTS["gotovinski_kredit_godine"])
+    parking_price: float = 0
+
+
+def build_tables(path: str, grid: Optional[TableGrid] = None) -> int:
+    """
+    Precompute every catalog unit over the grid and write the table file
+    Returns: number of grid points written
+    """
+    grid = grid or TableGrid()
+    calculator = LoanCalculator()
+    units = list(get_catalog().iter_units())
+    points = list(
+        itertools.product(grid.mortgage_rates, grid.mortgage_years, grid.own_money)
+    )
+    rates, years, own = zip(*points)
+
+    header = json.dumps(
+        {
+            "byteorder": sys.byteorder,
+            "fields": LoanSummary._fields,
+            "axes": {
+                "mortgage_rate": list(grid.mortgage_rates),
+                "mortgage_years": list(grid.mortgage_years),
+                "own_money": list(grid.own_money),
+            },
+            "cash_loan_rate": grid.cash_loan_rate,
+            "cash_loan_years": grid.cash_loan_years,
+            "parking_price": grid.parking_price,
+            "presets": [[name, unit_type] for name, unit_type, _, _ in units],
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (-f.tell() % ALIGNMENT))
+
+        for _, _, area, updates in units:
+            total_price = calculator.calculate_property_costs(
+                float(updates["cijena_po_kvadratu"]), float(area), grid.parking_price
+            )
+            columns = calculator.calculate_complete_loan_details_batch(
+                total_price,
+                own,
+                float(updates["postotak_za_kaparu"]),
+                rates,
+                years,
+                grid.cash_loan_rate,
+                grid.cash_loan_years,
+            )
+            block = array("d")
+            for values in zip(*(columns[name] for name in LoanSummary._fields)):
+                block.extend(values)
+            block.tofile(f)
+
+    return len(units) * len(points)
+
+
+class PaymentTable:
+    """
+    Read-only view of a table file. Values are read straight from the
+    memory map, so worker processes opening the same file share its pages.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a payment table file")
+
+        (header_length,) = struct.unpack_from("<Q", self.map, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(self.map[start : start + header_length])
+        if self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(
+                f"{path} was built on a {self.header['byteorder']}-endian machine"
+            )
+
+        offset = start + header_length
+        offset += -offset % ALIGNMENT
+        self.values = memoryview(self.map)[offset:].cast("d")
+
+        self.fields = tuple(self.header["fields"])
+        self.axes = [self.header["axes"][axis] for axis in AXES]
+        self.index = {
+            (name, unit_type): position
+            for position, (name, unit_type) in enumerate(self.header["presets"])
+        }
+        # Stride in values of one step along each axis, then per preset
+        self.strides = []
+        stride = len(self.fields)
+        for axis in reversed(self.axes):
+            self.strides.insert(0, stride)
+            stride *= len(axis)
+        self.preset_stride = stride
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory map"""
+        if getattr(self, "values", None) is not None:
+            self.values.release()
+            self.values = None
+        self.map.close()
+        self.file.close()
+
+    @staticmethod
+    def _bracket(axis: List[float], value: float) -> Tuple[int, int, float]:
+        """Grid neighbours of value and the weight of the upper one"""
+        if not axis[0] <= value <= axis[-1]:
+            raise ValueError(f"{value} is outside the grid [{axis[0]}, {axis[-1]}]")
+        upper = bisect.bisect_left(axis, value)
+        if axis[upper] == value:
+            return upper, upper, 0.0
+        lower = upper - 1
+        return lower, upper, (value - axis[lower]) / (axis[upper] - axis[lower])
+
+    def lookup(
+        self,
+        name: str,
+        unit_type: str,
+        mortgage_rate: float,
+        mortgage_years: int,
+        own_money: float,
+    ) -> LoanSummary:
+        """
+        Results for a catalog unit, linearly interpolated between grid points
+        (exact grid points are returned as stored)
+        """
+        base = self.index[(name, unit_type)] * self.preset_stride
+        point = (mortgage_rate, mortgage_years, own_money)
+        brackets = [
+            self._bracket(axis, value) for axis, value in zip(self.axes, point)
+        ]
+
+        width = len(self.fields)
+        totals = [0.0] * width
+        values = self.values
+        for corner in itertools.product((0, 1), repeat=len(brackets)):
+            weight = 1.0
+            offset = base
+            for use_upper, (lower, upper, upper_weight), stride in zip(
+                corner, brackets, self.strides
+            ):
+                if use_upper:
+                    if upper == lower:
+                        weight = 0.0
+                        break
+                    weight *= upper_weight
+                    offset += upper * stride
+                else:
+                    weight *= 1 - upper_weight
+                    offset += lower * stride
+            if weight == 0.0:
+                continue
+            for i in range(width):
+                totals[i] += weight * values[offset + i]
+
+        return LoanSummary(*totals)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build precomputed payment tables")
+    parser.add_argument("path", help="output table file")
+    args = parser.parse_args(argv)
+    points = build_tables(args.path)
+    print(f"{points} grid points written to {args.path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Tests for background.py"""
+
+import threading
+
+import pytest
+
+from background import BackgroundRunner, JobCancelled
+from benchmark import generate_inputs
+from loan import InputValidator
+from scenarios import ScenarioSet
+from simulation import SimulationSetup, simulate
+
+SETUP = SimulationSetup(
+    mortgage_amount=250000,
+    mortgage_rate=0.0289,
+    mortgage_years=30,
+    fixed_years=5,
+    margin=0.015,
+)
+
+
+class ManualRoot:
+    """Stands in for tk.Tk; the test calls runner.poll() itself"""
+
+    def after(self, ms, function, *args):
+        return "after#1"
+
+    def after_cancel(self, identifier):
+        pass
+
+
+def test_inline_job_stops_at_the_next_chunk():
+    runner = BackgroundRunner()
+    reports, results = [], []
+
+    def work(job):
+        def progress(done, total):
+            reports.append(done)
+            if done >= 200:
+                job.cancel()
+            job.checkpoint(done, total)
+
+        return simulate(SETUP, paths=1000, chunk_size=100, workers=1, progress=progress)
+
+    runner.submit("simulate", work, on_done=results.append)
+    assert reports == [100, 200]
+    assert results == []
+
+
+def test_threaded_job_reports_progress_and_can_be_cancelled():
+    runner = BackgroundRunner(ManualRoot(), workers=1)
+    first_chunk, resume = threading.Event(), threading.Event()
+
+    def work(job):
+        def progress(done, total):
+            job.checkpoint(done, total)
+            first_chunk.set()
+            resume.wait(5)
+
+        return simulate(SETUP, paths=1000, chunk_size=100, workers=1, progress=progress)
+
+    seen, results = [], []
+    job = runner.submit(
+        "simulate",
+        work,
+        on_done=results.append,
+        on_progress=lambda done, total: seen.append((done, total)),
+    )
+    assert first_chunk.wait(5)
+    runner.poll()
+    runner.cancel("simulate")
+    resume.set()
+
+    with pytest.raises(JobCancelled):
+        job.future.result(5)
+    assert seen == [(100, 1000)]
+    assert results == []
+    runner.shutdown()
+
+
+def test_chunked_scenario_comparison_matches_single_batch():
+    scenarios = ScenarioSet()
+    for i, record in enumerate(generate_inputs(25)):
+        scenarios.add(f"S{i}", InputValidator.validate_inputs(record))
+
+    reports = []
+    chunked = scenarios.evaluate(
+        progress=lambda done, total: reports.append((done, total)), chunk_size=10
+    )
+    assert reports == [(10, 25), (20, 25), (25, 25)]
+    assert list(chunked) == list(scenarios.evaluate())
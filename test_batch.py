@@ -0,0 +1,75 @@
+"""Tests for batch.py"""
+
+import csv
+import io
+
+from batch import INPUT_FIELDS, process_stream
+from benchmark import generate_inputs
+from cents import ExactLoanCalculator
+from config import Config
+from loan import InputValidator, LoanCalculator
+
+
+def to_csv(records) -> io.StringIO:
+    stream = io.StringIO()
+    writer = csv.DictWriter(stream, INPUT_FIELDS)
+    writer.writeheader()
+    writer.writerows(records)
+    stream.seek(0)
+    return stream
+
+
+def run(records, calculator=None):
+    output, errors = io.StringIO(), io.StringIO()
+    counts = process_stream(to_csv(records), output, errors, "csv", calculator)
+    output.seek(0)
+    return counts, list(csv.DictReader(output)), errors.getvalue()
+
+
+def test_results_match_scalar_calculation():
+    records = generate_inputs(20)
+    (processed, failed), rows, _ = run(records)
+    assert (processed, failed) == (20, 0)
+
+    calculator = LoanCalculator()
+    for record, row in zip(records, rows):
+        v = InputValidator.validate_inputs(record)
+        expected = calculator.calculate_complete_loan_details(
+            calculator.calculate_property_costs(
+                v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+            ),
+            v["down_payment"],
+            v["advance_percentage"],
+            v["mortgage_rate"],
+            v["mortgage_years"],
+            v["cash_loan_rate"],
+            v["cash_loan_years"],
+        )
+        for field, value in expected.items():
+            assert float(row[field]) == value
+
+
+class FailingCalculator(LoanCalculator):
+    def calculate_loan_summary(self, total_price, *args, **kwargs):
+        if total_price > 500000:
+            raise ArithmeticError("too expensive")
+        return super().calculate_loan_summary(total_price, *args, **kwargs)
+
+
+def test_calculation_errors_are_reported_per_row():
+    records = generate_inputs(3)
+    records[1]["cijena_po_kvadratu"] = "9000"
+    records[1]["ukupno_kvadrata"] = "150"
+    (processed, failed), rows, errors = run(records, FailingCalculator())
+
+    assert (processed, failed) == (2, 1)
+    assert [row["row"] for row in rows] == ["1", "3"]
+    assert "2,Greška u izračunu: too expensive" in errors
+
+
+def test_engine_follows_config(monkeypatch):
+    records = generate_inputs(5)
+    monkeypatch.setitem(Config.EXACT, "enabled", True)
+    _, default_rows, _ = run(records)
+    _, exact_rows, _ = run(records, ExactLoanCalculator())
+    assert default_rows == exact_rows
@@ -0,0 +1,27 @@
+"""Tests for benchmark.py"""
+
+import json
+import os
+
+from benchmark import build_cases, compare, generate_inputs
+
+
+def test_committed_baseline_covers_every_case():
+    path = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    for size in ("small", "medium"):
+        for name in build_cases(generate_inputs(1)):
+            assert f"{name}[{size}]" in baseline["results"]
+
+
+def test_compare_reports_only_slowdowns_over_threshold():
+    baseline = {"results": {"a": {"per_call_us": 1.0}, "b": {"per_call_us": 1.0}}}
+    current = {
+        "results": {
+            "a": {"per_call_us": 1.05},
+            "b": {"per_call_us": 1.5},
+            "new": {"per_call_us": 9.0},
+        }
+    }
+    assert compare(current, baseline, 0.10) == ["b: 1.000 -> 1.500 µs/call (+50.0%)"]
@@ -0,0 +1,60 @@
+"""Tests for calculator.py"""
+
+import csv
+import os
+import subprocess
+import sys
+
+from batch import INPUT_FIELDS
+from benchmark import generate_inputs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Fails the run if anything imports tkinter
+NO_TKINTER = (
+    "import sys; sys.modules['tkinter'] = None; import calculator;"
+    " sys.exit(calculator.main(sys.argv[1:]))"
+)
+
+
+def run_batch(tmp_path, records, *options):
+    source = tmp_path / "ulaz.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, INPUT_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    output = tmp_path / "izlaz.csv"
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            NO_TKINTER,
+            "--batch",
+            str(source),
+            "--output",
+            str(output),
+            *options,
+        ],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, DISPLAY=""),
+    )
+    with open(output, newline="", encoding="utf-8") as f:
+        return completed, list(csv.DictReader(f))
+
+
+def test_batch_runs_without_tkinter(tmp_path):
+    completed, rows = run_batch(tmp_path, generate_inputs(10))
+    assert completed.returncode == 0, completed.stderr
+    assert [row["row"] for row in rows] == [str(i) for i in range(1, 11)]
+
+
+def test_invalid_rows_go_to_errors_and_set_exit_code(tmp_path):
+    records = generate_inputs(3)
+    records[1]["ukupno_kvadrata"] = "abc"
+    completed, rows = run_batch(tmp_path, records, "--exact")
+    assert completed.returncode == 1
+    assert [row["row"] for row in rows] == ["1", "3"]
+    assert completed.stderr.startswith("row,")
+    assert "\n2," in completed.stderr
@@ -0,0 +1,67 @@
+"""Tests for catalog.py"""
+
+import json
+import sqlite3
+
+import pytest
+
+from catalog import CatalogError, PresetCatalog
+
+
+def test_missing_database_is_an_error_not_a_new_file(tmp_path):
+    path = tmp_path / "katalg.db"
+    with pytest.raises(CatalogError):
+        PresetCatalog(str(path)).names()
+    assert not path.exists()
+
+
+def test_non_catalog_file_is_an_error(tmp_path):
+    path = tmp_path / "notes.db"
+    path.write_text("not a database")
+    with pytest.raises(CatalogError):
+        PresetCatalog(str(path)).names()
+
+
+def test_saved_database_round_trips(tmp_path):
+    path = str(tmp_path / "katalog.db")
+    built_in = PresetCatalog()
+    built_in.save(path)
+
+    saved = PresetCatalog(path)
+    assert saved.names() == built_in.names()
+    name = built_in.names()[0]
+    assert saved.preset(name).updates == built_in.preset(name).updates
+
+
+def test_json_catalog_filters_case_insensitively(tmp_path):
+    path = tmp_path / "katalog.json"
+    path.write_text(
+        json.dumps(
+            {
+                "projects": [
+                    {
+                        "name": "Pionir - Čavićeva",
+                        "updates": {"cijena_po_kvadratu": "2970"},
+                        "apartment_types": {"Jednosoban": "57.7", "Dvosoban": "71.85"},
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    catalog = PresetCatalog(str(path))
+    assert catalog.names("čavić") == ["Pionir - Čavićeva"]
+    assert catalog.apartment_types("Pionir - Čavićeva", "dvo") == ["Dvosoban"]
+    assert catalog.area("Pionir - Čavićeva", "Jednosoban") == "57.7"
+
+
+def test_unrelated_database_is_rejected_and_left_untouched(tmp_path):
+    path = tmp_path / "drugo.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE notes (text TEXT)")
+    connection.close()
+    before = path.read_bytes()
+
+    with pytest.raises(CatalogError, match="projects, units"):
+        PresetCatalog(str(path)).names()
+    assert path.read_bytes() == before
@@ -0,0 +1,82 @@
+"""Tests for cents.py"""
+
+import decimal
+import io
+import random
+
+import pytest
+
+from batch import process_stream
+from cents import (
+    ROUNDING_MODES,
+    ExactLoanCalculator,
+    round_div,
+    to_cents,
+)
+from loan import ValidationError
+
+
+@pytest.mark.parametrize("mode", ROUNDING_MODES)
+def test_round_div_matches_decimal(mode):
+    rng = random.Random(mode)
+    for _ in range(5000):
+        numerator = rng.randint(-10**6, 10**6)
+        denominator = rng.randint(1, 200)
+        expected = (decimal.Decimal(numerator) / denominator).quantize(
+            decimal.Decimal(1), rounding=mode
+        )
+        assert round_div(numerator, denominator, mode) == int(expected)
+
+
+def test_unknown_rounding_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ExactLoanCalculator(payment_rounding="ROUND_SOMETIMES")
+
+
+@pytest.mark.parametrize("amount", [float("nan"), float("inf"), -float("inf")])
+def test_to_cents_rejects_non_finite(amount):
+    with pytest.raises(ValidationError):
+        to_cents(amount)
+
+
+@pytest.mark.parametrize(
+    "principal, rate, years",
+    [(344680.76, 0.0289, 30), (66170.19, 0.045, 7), (1000, 0.0, 1), (0.004, 0.05, 5)],
+)
+def test_schedule_adds_up_to_totals(principal, rate, years):
+    calculator = ExactLoanCalculator()
+    totals = calculator.calculate_loan_details_cents(principal, rate, years)
+    schedule = calculator.schedule(principal, rate, years)
+
+    assert len(schedule) == totals.installments
+    rows = schedule.rows(0, len(schedule))
+    assert sum(round(row.payment * 100) for row in rows) == totals.total_payment
+    assert round(schedule.cumulative_interest(len(schedule)) * 100) == (
+        totals.total_interest
+    )
+    assert schedule.balance(len(schedule)) == 0
+
+
+def test_batch_matches_scalar():
+    calculator = ExactLoanCalculator()
+    loans = [(344680.76, 0.0289, 30), (66170.19, 0.045, 7), (0, 0.03, 5)] * 2
+    batch = calculator.calculate_loan_details_batch(*zip(*loans))
+    for i, loan in enumerate(loans):
+        assert batch[i] == calculator.calculate_loan_details(*loan)
+
+
+def test_exact_batch_reports_bad_rows_and_continues():
+    record = (
+        '"ukupno_kvadrata": 60, "cijena_parkirnog_mjesta": 0,'
+        ' "vlastito_ucesce": 20000, "postotak_za_kaparu": 20}\n'
+    )
+    source = io.StringIO(
+        '{"cijena_po_kvadratu": NaN, ' + record
+        + '{"cijena_po_kvadratu": 3000, ' + record
+    )
+    output, errors = io.StringIO(), io.StringIO()
+    processed, failed = process_stream(
+        source, output, errors, "jsonl", ExactLoanCalculator()
+    )
+    assert (processed, failed) == (1, 1)
+    assert '"row": 1' in errors.getvalue()
@@ -0,0 +1,153 @@
+"""Tests for export.py"""
+
+import csv
+import gzip
+import importlib.util
+
+import pytest
+
+from batch import INPUT_FIELDS
+from benchmark import generate_inputs
+from cents import ExactLoanCalculator
+from export import SCHEDULE_FIELDS, export_rows, iter_record_schedules
+from export import main as export_main
+from loan import InputValidator, LoanCalculator
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+@pytest.fixture(scope="module")
+def rows():
+    records = [
+        (i, InputValidator.validate_inputs(record))
+        for i, record in enumerate(generate_inputs(6), 1)
+    ]
+    return list(iter_record_schedules(records))
+
+
+def read_csv(path, opener=open):
+    with opener(path, "rt", newline="", encoding="utf-8") as stream:
+        reader = csv.reader(stream)
+        assert tuple(next(reader)) == SCHEDULE_FIELDS
+        return [
+            (int(r[0]), r[1], int(r[2])) + tuple(float(x) for x in r[3:])
+            for r in reader
+        ]
+
+
+def test_csv_parts_split_exactly_and_round_trip(tmp_path, rows):
+    stats = export_rows(
+        iter(rows),
+        str(tmp_path / "otplata.csv.gz"),
+        compression="gzip",
+        rows_per_file=1000,
+        chunk_rows=300,
+    )
+    assert stats.rows == len(rows)
+    assert [p.rsplit("/", 1)[1] for p in stats.paths[:2]] == [
+        "otplata-00001.csv.gz",
+        "otplata-00002.csv.gz",
+    ]
+    parts = [read_csv(path, gzip.open) for path in stats.paths]
+    assert all(len(part) == 1000 for part in parts[:-1])
+    assert [row for part in parts for row in part] == rows
+
+
+@pytest.mark.skipif(HAS_PYARROW, reason="pyarrow is installed")
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_missing_pyarrow_fails_before_reading_rows(tmp_path, fmt):
+    consumed = []
+
+    def source():
+        consumed.append(True)
+        yield (1, "stambeni", 1, 0.0, 0.0, 0.0, 0.0)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        export_rows(source(), str(tmp_path / f"otplata.{fmt}"), fmt)
+    assert consumed == []
+
+
+@pytest.mark.parametrize(
+    "fmt, compression", [("parquet", None), ("parquet", "zstd"), ("arrow", "lz4")]
+)
+def test_arrow_formats_round_trip(tmp_path, rows, fmt, compression):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    stats = export_rows(
+        iter(rows),
+        str(tmp_path / f"otplata.{fmt}"),
+        fmt,
+        compression,
+        rows_per_file=1000,
+        chunk_rows=300,
+    )
+    back = []
+    for path in stats.paths:
+        if fmt == "parquet":
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        assert table.column_names == list(SCHEDULE_FIELDS)
+        back.extend(zip(*(column.to_pylist() for column in table.columns)))
+    assert back == rows
+
+
+def test_exact_engine_exports_its_cent_installments():
+    calculator = ExactLoanCalculator()
+    validated = InputValidator.validate_inputs(generate_inputs(1)[0])
+    rows = list(iter_record_schedules([(1, validated)], calculator))
+    summary = calculator.calculate_loan_summary(
+        calculator.calculate_property_costs(
+            validated["price_per_sqm"],
+            validated["total_sqm"],
+            validated["parking_price"],
+        ),
+        validated["down_payment"],
+        validated["advance_percentage"],
+        validated["mortgage_rate"],
+        validated["mortgage_years"],
+        validated["cash_loan_rate"],
+        validated["cash_loan_years"],
+    )
+    for loan, prefix in (("stambeni", "mortgage"), ("gotovinski", "cash_loan")):
+        payments = [row[3] for row in rows if row[1] == loan]
+        cents = sum(round(payment * 100) for payment in payments)
+        assert cents == round(getattr(summary, f"{prefix}_total") * 100)
+
+
+def test_bad_records_are_reported_and_the_export_continues(tmp_path, capsys):
+    records = generate_inputs(3)
+    source = tmp_path / "ulaz.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, INPUT_FIELDS)
+        writer.writeheader()
+        writer.writerow(records[0])
+        f.write('"' + "x" * 200000 + '"\r\n')
+        writer.writerow(records[2])
+    output = tmp_path / "otplata.csv"
+
+    assert export_main([str(source), str(output), "--exact"]) == 1
+    assert "Redak 2: Neispravan CSV zapis" in capsys.readouterr().err
+    assert {row[0] for row in read_csv(output)} == {1, 3}
+
+
+def test_calculation_errors_go_to_on_error():
+    class FailingCalculator(LoanCalculator):
+        def schedule(self, principal, annual_rate, years):
+            if annual_rate > 0.05:
+                raise ArithmeticError("too high")
+            return super().schedule(principal, annual_rate, years)
+
+    validated = InputValidator.validate_inputs(generate_inputs(1)[0])
+    records = [
+        (1, validated),
+        (2, dict(validated, cash_loan_rate=0.09)),
+        (3, validated),
+    ]
+    errors = []
+    rows = iter_record_schedules(
+        records, FailingCalculator(), lambda record, e: errors.append((record, str(e)))
+    )
+    assert {row[0] for row in rows} == {1, 3}
+    assert errors == [(2, "too high")]
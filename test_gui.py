@@ -0,0 +1,227 @@
+"""Tests for gui.py, run headless on a stub GUI"""
+
+import threading
+
+import pytest
+
+from background import BackgroundRunner
+from benchmark import StubEntry, generate_inputs, make_stub_gui
+from config import Config
+from loan import LoanCalculator
+
+
+class TimerRoot:
+    """Stands in for tk.Tk, keeping after() timers until the test fires them"""
+
+    def __init__(self):
+        self.timers = {}
+        self.count = 0
+
+    def after(self, ms, function, *args):
+        self.count += 1
+        identifier = f"after#{self.count}"
+        self.timers[identifier] = (function, args)
+        return identifier
+
+    def after_cancel(self, identifier):
+        del self.timers[identifier]
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for function, args in timers.values():
+            function(*args)
+
+
+class StubVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def make_live_gui():
+    gui = make_stub_gui(LoanCalculator())
+    gui.root = TimerRoot()
+    gui.live_var = StubVar(True)
+    gui.computed = []
+    compute_results = gui.compute_results
+
+    def counting(validated):
+        gui.computed.append(validated)
+        return compute_results(validated)
+
+    gui.compute_results = counting
+    return gui
+
+
+def type_record(gui, record):
+    gui.inputs = {field_id: StubEntry(value) for field_id, value in record.items()}
+    gui.schedule_recalculation()
+
+
+def test_burst_of_edits_recalculates_once():
+    gui = make_live_gui()
+    first, second = generate_inputs(2)
+    for record in (first, second, first):
+        type_record(gui, record)
+
+    assert len(gui.root.timers) == 1
+    gui.root.fire()
+    assert len(gui.computed) == 1
+    assert gui.output_labels["ukupna_cijena"].text.endswith("EUR")
+
+
+def test_unchanged_or_incomplete_input_keeps_last_results():
+    gui = make_live_gui()
+    record = generate_inputs(1)[0]
+    type_record(gui, record)
+    gui.root.fire()
+    shown = {field_id: label.text for field_id, label in gui.output_labels.items()}
+
+    type_record(gui, dict(record))
+    gui.root.fire()
+    type_record(gui, dict(record, ukupno_kvadrata="12a"))
+    gui.root.fire()
+
+    assert len(gui.computed) == 1
+    assert {field_id: label.text for field_id, label in gui.output_labels.items()} == (
+        shown
+    )
+
+
+def test_live_off_does_not_schedule():
+    gui = make_live_gui()
+    gui.live_var = StubVar(False)
+    type_record(gui, generate_inputs(1)[0])
+    assert gui.root.timers == {}
+
+
+class StubCombobox:
+    """Stands in for a readonly ttk.Combobox and its StringVar"""
+
+    def __init__(self, value):
+        self.options = {"values": [value]}
+        self.value = value
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def __getitem__(self, key):
+        return self.options[key]
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class EditableEntry(StubEntry):
+    def delete(self, first, last=None):
+        self.value = ""
+
+    def insert(self, index, text):
+        self.value = text
+
+
+class KeyEvent:
+    def __init__(self, char, keysym=None):
+        self.char = char
+        self.keysym = keysym or char
+
+
+def make_preset_gui():
+    gui = make_live_gui()
+    gui.inputs = {
+        field_id: EditableEntry(value)
+        for field_id, value in generate_inputs(1)[0].items()
+    }
+    gui.preset_queries = {}
+    gui.preset_dropdowns = {}
+    for preset_id in Config.PRESETS:
+        gui.preset_queries[preset_id] = ""
+        gui.preset_dropdowns[preset_id] = StubCombobox(gui.default_option(preset_id))
+    gui.preset_vars = gui.preset_dropdowns
+    return gui
+
+
+def test_typing_filters_without_changing_the_applied_preset():
+    gui = make_preset_gui()
+    first, second = gui.catalog.names()[:2]
+    gui.preset_dropdowns["investor_type"].set(first)
+    gui.on_preset_selected("investor_type")
+    price = gui.inputs["cijena_po_kvadratu"].get()
+
+    for char in second[:4]:
+        gui.filter_dropdown("investor_type", KeyEvent(char))
+
+    dropdown = gui.preset_dropdowns["investor_type"]
+    assert second in dropdown["values"]
+    assert dropdown.get() == first
+    assert gui.inputs["cijena_po_kvadratu"].get() == price
+
+
+def test_return_applies_the_best_match_and_its_unit_types():
+    gui = make_preset_gui()
+    name = gui.catalog.names()[1]
+    for char in name:
+        gui.filter_dropdown("investor_type", KeyEvent(char))
+    gui.commit_dropdown("investor_type")
+
+    assert gui.preset_dropdowns["investor_type"].get() == name
+    assert gui.inputs["cijena_po_kvadratu"].get() == str(
+        gui.catalog.preset(name).updates["cijena_po_kvadratu"]
+    )
+    unit_types = gui.catalog.apartment_types(name)
+    assert gui.preset_dropdowns["apartment_type"]["values"][1:] == unit_types
+
+    gui.preset_dropdowns["apartment_type"].set(unit_types[0])
+    gui.on_preset_selected("apartment_type")
+    assert gui.inputs["ukupno_kvadrata"].get() == str(
+        gui.catalog.area(name, unit_types[0])
+    )
+
+
+def test_any_edit_cancels_a_running_calculation_even_when_not_live():
+    gui = make_live_gui()
+    gui.live_var = StubVar(False)
+    gui.runner = BackgroundRunner(gui.root, workers=1)
+    started, release = threading.Event(), threading.Event()
+    compute_results = gui.compute_results
+
+    def slow(validated):
+        started.set()
+        release.wait(5)
+        return compute_results(validated)
+
+    gui.compute_results = slow
+    record = generate_inputs(1)[0]
+    gui.inputs = {field_id: StubEntry(value) for field_id, value in record.items()}
+    gui.start_calculation(gui.read_validated_inputs())
+    job = gui.runner.jobs["calculate"]
+    assert started.wait(5)
+
+    gui.on_input_changed()
+    release.set()
+    job.future.exception(5)
+    gui.root.fire()
+
+    assert gui.runner.jobs == {}
+    assert gui.last_results is None
+    assert gui.output_labels["ukupna_cijena"].text == ""
+    gui.runner.shutdown()
+
+
+def test_closing_the_window_stops_the_workers():
+    gui = make_live_gui()
+    gui.root.destroyed = False
+    gui.root.destroy = lambda: setattr(gui.root, "destroyed", True)
+    gui.runner = BackgroundRunner(gui.root, workers=1)
+    type_record(gui, generate_inputs(1)[0])
+
+    gui.on_close()
+    assert gui.root.destroyed
+    assert gui.root.timers == {}
+    with pytest.raises(RuntimeError):
+        gui.runner.executor.submit(print)
@@ -0,0 +1,52 @@
+"""Tests for incremental.py"""
+
+import random
+
+from benchmark import generate_inputs
+from incremental import IncrementalLoanEvaluator
+from loan import InputValidator, LoanCalculator
+
+
+def full(calculator, v):
+    return calculator.calculate_complete_loan_details(
+        calculator.calculate_property_costs(
+            v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+        ),
+        v["down_payment"],
+        v["advance_percentage"],
+        v["mortgage_rate"],
+        v["mortgage_years"],
+        v["cash_loan_rate"],
+        v["cash_loan_years"],
+    )
+
+
+def test_random_edits_match_full_recalculation():
+    calculator = LoanCalculator()
+    evaluator = IncrementalLoanEvaluator(calculator)
+    pool = [InputValidator.validate_inputs(r) for r in generate_inputs(50)]
+    rng = random.Random(3)
+    current = dict(pool[0])
+    for _ in range(300):
+        # Change one or two fields, taking values from other valid records
+        for key in rng.sample(sorted(current), rng.randint(1, 2)):
+            current[key] = rng.choice(pool)[key]
+        assert evaluator.evaluate(current) == full(calculator, current)
+
+
+def test_only_dependent_nodes_are_recomputed():
+    evaluator = IncrementalLoanEvaluator()
+    validated = InputValidator.validate_inputs(generate_inputs(1)[0])
+    evaluator.evaluate(validated)
+    evaluator.evaluate(dict(validated, mortgage_rate=validated["mortgage_rate"] + 0.01))
+    evaluator.evaluate(dict(validated, mortgage_rate=validated["mortgage_rate"] + 0.01))
+    assert evaluator.recompute_counts == {
+        "total_price": 1,
+        "loan_split": 1,
+        "mortgage": 2,
+        "cash_loan": 1,
+    }
+
+    evaluator.invalidate()
+    evaluator.evaluate(validated)
+    assert evaluator.recompute_counts["total_price"] == 2
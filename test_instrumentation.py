@@ -0,0 +1,63 @@
+"""Tests for instrumentation.py"""
+
+import pytest
+
+from benchmark import StubEntry, generate_inputs, make_stub_gui
+from cents import ExactLoanCalculator
+from instrumentation import Instrumentation, percentile
+from loan import LoanCalculator
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    yield instrumentation
+    instrumentation.uninstall()
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_gui_calculation_is_broken_down_into_spans(instrumentation):
+    instrumentation.install(include_gui=True)
+    gui = make_stub_gui(LoanCalculator())
+    for record in generate_inputs(3):
+        gui.inputs = {field_id: StubEntry(value) for field_id, value in record.items()}
+        gui.calculate()
+
+    summary = instrumentation.summary()
+    for span in (
+        "LoanCalculatorGUI.calculate",
+        "LoanCalculatorGUI.read_validated_inputs",
+        "InputValidator.validate_inputs",
+        "LoanCalculatorGUI.compute_results",
+        "LoanCalculatorGUI.update_results",
+        "LoanCalculatorGUI.update_schedule",
+    ):
+        assert summary[span]["calls"] == 3, span
+
+
+def test_uninstall_restores_originals(instrumentation):
+    original = vars(LoanCalculator)["calculate_loan_details"]
+    instrumentation.install()
+    assert vars(LoanCalculator)["calculate_loan_details"] is not original
+    instrumentation.uninstall()
+    assert vars(LoanCalculator)["calculate_loan_details"] is original
+
+
+def test_exact_engine_overrides_are_timed(instrumentation):
+    instrumentation.install()
+    calculator = ExactLoanCalculator()
+    calculator.calculate_complete_loan_details(300000, 20000, 20, 0.0289, 30, 0.045, 7)
+    calculator.calculate_loan_details_batch([100000, 50000], 0.03, 20)
+    calculator.schedule(100000, 0.03, 20)
+
+    summary = instrumentation.summary()
+    assert summary["LoanCalculator.calculate_complete_loan_details"]["calls"] == 1
+    assert summary["ExactLoanCalculator.calculate_loan_details"]["calls"] == 2
+    assert summary["ExactLoanCalculator.calculate_loan_details_batch"]["calls"] == 1
+    assert summary["ExactLoanCalculator.schedule"]["calls"] == 1
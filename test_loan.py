@@ -0,0 +1,186 @@
+"""Tests for loan.py"""
+
+import builtins
+from array import array
+
+import pytest
+
+import loan
+from benchmark import generate_inputs
+from loan import (
+    AnnuityFactorCache,
+    InputValidator,
+    LoanCalculator,
+    ValidationError,
+    result_getter,
+)
+
+FIELDS = [rule[0] for rule in InputValidator.FIELD_RULES]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    ["nan", "NaN", "inf", "-inf", "1e400", "1_000", " 42 ", "4.5e1", "", "abc", "1,5"],
+)
+def test_validate_columns_agrees_with_validate_inputs(raw):
+    record = generate_inputs(1)[0]
+    record["cijena_parkirnog_mjesta"] = raw
+    try:
+        expected = InputValidator.validate_inputs(record)
+    except ValidationError as e:
+        expected = str(e)
+
+    bulk = InputValidator.validate_columns(
+        {field_id: [value] for field_id, value in record.items()}
+    )
+    if isinstance(expected, str):
+        assert not bulk.valid[0]
+        assert bulk.messages[0]["cijena_parkirnog_mjesta"] == expected
+    else:
+        assert bulk.valid[0]
+        assert {key: column[0] for key, column in bulk.columns.items()} == expected
+
+
+def test_non_finite_numbers_are_rejected():
+    for raw in ("nan", "inf", "1e400", float("nan")):
+        assert InputValidator.parse_number(raw) is None
+
+
+LOANS = [
+    (344680.76, 0.0289, 30),
+    (66170.19, 0.045, 7),
+    (100000, 0.0, 10),
+    (0, 0.035, 25),
+    (344680.76, 0.0289, 30),
+]
+
+
+def test_batch_matches_scalar_calculation():
+    calculator = LoanCalculator(AnnuityFactorCache())
+    batch = calculator.calculate_loan_details_batch(*zip(*LOANS))
+    assert len(batch) == len(LOANS)
+    for i, loan in enumerate(LOANS):
+        assert batch[i] == calculator.calculate_loan_details(*loan)
+
+
+def test_batch_broadcasts_scalars_and_rejects_mismatched_columns():
+    calculator = LoanCalculator()
+    principals = [100000, 250000, 0]
+    batch = calculator.calculate_loan_details_batch(principals, 0.03, 20)
+    for i, principal in enumerate(principals):
+        assert batch[i] == calculator.calculate_loan_details(principal, 0.03, 20)
+
+    with pytest.raises(ValueError):
+        calculator.calculate_loan_details_batch(principals, [0.03, 0.04], 20)
+
+
+def test_cache_is_bounded_and_counts_hits():
+    calculator = LoanCalculator(AnnuityFactorCache(maxsize=2))
+    # 0.04 is least recently used when 0.05 arrives, so it is looked up again
+    for rate in (0.03, 0.04, 0.03, 0.05, 0.04):
+        calculator.calculate_loan_details(100000, rate, 20)
+
+    stats = calculator.cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 4, 2)
+    assert (stats.size, stats.maxsize) == (2, 2)
+    assert stats.hit_rate == pytest.approx(0.2)
+
+    calculator.cache.clear()
+    assert calculator.cache.stats() == (0, 0, 0, 0, 2)
+
+
+def test_cached_results_match_uncached_formula():
+    calculator = LoanCalculator(AnnuityFactorCache())
+    for principal, rate, years in LOANS:
+        result = calculator.calculate_loan_details(principal, rate, years)
+        months = years * 12
+        if principal and rate:
+            i = rate / 12
+            expected = principal * i * (1 + i) ** months / ((1 + i) ** months - 1)
+        else:
+            expected = principal / months
+        assert result.monthly_payment == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("own_money", [0, 20000, 60000, 500000])
+@pytest.mark.parametrize("percentage", [0, 10, 20])
+def test_max_affordable_price_inverts_total_monthly(own_money, percentage):
+    calculator = LoanCalculator()
+    budgets = [300, 900, 1500, 2500]
+    terms = (0.0289, 30, 0.045, 7)
+    prices = calculator.calculate_max_affordable_price(
+        budgets, own_money, percentage, *terms
+    )
+    for budget, price in zip(budgets, prices):
+        results = calculator.calculate_complete_loan_details(
+            price, own_money, percentage, *terms
+        )
+        assert results["total_monthly"] == pytest.approx(budget, rel=1e-9)
+
+
+def test_max_affordable_price_per_sqm():
+    calculator = LoanCalculator()
+    terms = (20000, 20, 0.0289, 30, 0.045, 7)
+    price = calculator.calculate_max_affordable_price(1500, *terms)[0]
+    per_sqm = calculator.calculate_max_affordable_price_per_sqm(
+        1500, 60, 15000, *terms
+    )[0]
+    assert calculator.calculate_property_costs(per_sqm, 60, 15000) == (
+        pytest.approx(price)
+    )
+
+
+def test_summary_records_match_complete_details():
+    calculator = LoanCalculator()
+    records = [InputValidator.validate_inputs(r) for r in generate_inputs(20)]
+    columns = [
+        [
+            calculator.calculate_property_costs(
+                v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+            )
+            for v in records
+        ]
+    ] + [
+        [v[key] for v in records]
+        for key in (
+            "down_payment",
+            "advance_percentage",
+            "mortgage_rate",
+            "mortgage_years",
+            "cash_loan_rate",
+            "cash_loan_years",
+        )
+    ]
+    batch = calculator.calculate_complete_loan_details_batch(*columns)
+
+    assert len(batch) == len(records)
+    for i, args in enumerate(zip(*columns)):
+        details = calculator.calculate_complete_loan_details(*args)
+        summary = calculator.calculate_loan_summary(*args)
+        assert summary._asdict() == details
+        assert batch[i] == summary
+        assert result_getter(summary)("total_monthly") == (
+            result_getter(details)("total_monthly")
+        )
+    assert list(batch) == [batch[i] for i in range(len(batch))]
+    assert batch["total_price"] == array("d", columns[0])
+
+
+def test_malformed_columns_are_screened_before_float(monkeypatch):
+    calls = []
+
+    def checked_float(value):
+        # Anything reaching float() must parse, so no row raises
+        calls.append(value)
+        return builtins.float(value)
+
+    monkeypatch.setattr(loan, "float", checked_float, raising=False)
+    malformed = ["abc", "1,5", "", "1e", "--1", "1__0", "0x10", "12a"] * 500
+    record = generate_inputs(1)[0]
+    columns = {field_id: [value] * len(malformed) for field_id, value in record.items()}
+    columns["ukupno_kvadrata"] = malformed
+
+    bulk = InputValidator.validate_columns(columns)
+    assert bulk.error_count == len(malformed)
+    assert not any(bulk.valid)
+    assert "12a" not in calls
@@ -0,0 +1,79 @@
+"""Tests for optimizer.py"""
+
+import pytest
+
+from loan import LoanCalculator
+from optimizer import AllocationConstraints, OwnMoneyOptimizer
+
+PURCHASE = dict(
+    total_price=300000,
+    own_money=70000,
+    down_payment_percentage=20,
+    mortgage_rate=0.0289,
+    mortgage_years=30,
+    cash_loan_rate=0.045,
+    cash_loan_years=7,
+)
+
+
+def test_default_is_the_calculate_loan_amounts_split():
+    calculator = LoanCalculator()
+    result = OwnMoneyOptimizer(calculator).optimize(**PURCHASE, steps=4)
+    details = calculator.calculate_complete_loan_details(*PURCHASE.values())
+
+    assert result.default.mortgage_amount == details["mortgage_amount"]
+    assert result.default.cash_loan_amount == details["cash_loan_amount"]
+    assert result.default.total_monthly == pytest.approx(details["total_monthly"])
+    assert result.default.total_interest == pytest.approx(
+        details["mortgage_interest"] + details["cash_loan_interest"]
+    )
+
+
+@pytest.mark.parametrize("objective", ["total_interest", "total_monthly"])
+def test_best_candidate_is_the_grid_minimum(objective):
+    calculator = LoanCalculator()
+    result = OwnMoneyOptimizer(calculator).optimize(
+        **PURCHASE,
+        objective=objective,
+        constraints=AllocationConstraints(mortgage_years=(20, 30)),
+        steps=6,
+        keep_ranked=1000,
+    )
+    # Without a payment cap every candidate is feasible
+    assert len(result.ranked) == result.feasible == result.evaluated
+
+    for candidate in result.ranked:
+        mortgage = calculator.calculate_loan_details(
+            candidate.mortgage_amount,
+            PURCHASE["mortgage_rate"],
+            candidate.mortgage_years,
+        )
+        cash_loan = calculator.calculate_loan_details(
+            candidate.cash_loan_amount,
+            PURCHASE["cash_loan_rate"],
+            candidate.cash_loan_years,
+        )
+        assert candidate.total_interest == pytest.approx(
+            mortgage.total_interest + cash_loan.total_interest
+        )
+        assert getattr(result.best, objective) <= getattr(candidate, objective)
+    assert result.best == result.ranked[0]
+    assert getattr(result.best, objective) <= getattr(result.default, objective)
+
+
+def test_constraints_limit_the_candidates():
+    cap = 1500
+    result = OwnMoneyOptimizer().optimize(
+        **PURCHASE,
+        constraints=AllocationConstraints(reserve=10000, max_total_monthly=cap),
+        steps=8,
+    )
+    assert result.feasible < result.evaluated
+    for candidate in result.ranked:
+        assert candidate.kept >= 10000 - 1e-6
+        assert candidate.total_monthly <= cap
+
+
+def test_unknown_objective_is_rejected():
+    with pytest.raises(ValueError):
+        OwnMoneyOptimizer().optimize(**PURCHASE, objective="fastest")
@@ -0,0 +1,95 @@
+"""Tests for prepayment.py"""
+
+import pytest
+
+from prepayment import (
+    LoanTerms,
+    Prepayment,
+    PrepaymentFees,
+    PrepaymentSimulator,
+    PrepaymentStrategy,
+    expand,
+    simulate_loan,
+)
+
+TERMS = [LoanTerms(250000, 0.0289, 30), LoanTerms(30000, 0.045, 7)]
+PREPAYMENTS = [
+    [],
+    [Prepayment(12, 20000)],
+    [Prepayment(12, 5000, every=12), Prepayment(60, 30000)],
+    [Prepayment(1, 1500, every=1)],
+    [Prepayment(24, 10**6)],
+]
+
+
+def simulate_monthly(terms, prepayments, mode, fee_rate):
+    """Reference month-by-month loop"""
+    term = terms.years * 12
+    rate = terms.annual_rate / 12
+    growth = (1 + rate) ** term
+    payment = terms.amount * rate * growth / (growth - 1)
+    events = dict(prepayments)
+    balance = terms.amount
+    paid = prepaid = 0.0
+    month = 0
+    while balance > 1e-9:
+        month += 1
+        due = balance * (1 + rate)
+        if due <= payment + 1e-9 or month == term:
+            paid += due
+            balance = 0.0
+            break
+        paid += payment
+        balance = due - payment
+        amount = min(events.get(month, 0.0), balance)
+        if amount:
+            balance -= amount
+            prepaid += amount
+            if mode == "lower_annuity" and balance > 1e-9:
+                growth = (1 + rate) ** (term - month)
+                payment = balance * rate * growth / (growth - 1)
+    return month, paid, prepaid, prepaid * fee_rate, paid + prepaid - terms.amount
+
+
+@pytest.mark.parametrize("mode", ["shorten_term", "lower_annuity"])
+@pytest.mark.parametrize("prepayments", PREPAYMENTS)
+@pytest.mark.parametrize("terms", TERMS)
+def test_event_simulation_matches_monthly_loop(terms, prepayments, mode):
+    events = expand(prepayments, terms.years * 12)
+    outcome = simulate_loan(terms, events, mode, fee_rate=0.01)
+    installments, paid, prepaid, fees, interest = simulate_monthly(
+        terms, events, mode, 0.01
+    )
+    assert outcome.installments == installments
+    assert outcome.total_installments == pytest.approx(paid)
+    assert outcome.prepaid == pytest.approx(prepaid)
+    assert outcome.fees == pytest.approx(fees)
+    assert outcome.total_interest == pytest.approx(interest, abs=1e-6)
+
+
+def test_expand_merges_recurring_and_one_off_prepayments():
+    prepayments = [Prepayment(12, 100, every=12, until=36), Prepayment(24, 50)]
+    assert expand(prepayments, 360) == [(12, 100.0), (24, 150.0), (36, 100.0)]
+
+
+def test_compare_ranks_by_net_saving_with_fees():
+    simulator = PrepaymentSimulator(*TERMS, PrepaymentFees(mortgage=0.02))
+    strategies = [
+        PrepaymentStrategy("Stambeni", mortgage=[Prepayment(12, 20000)]),
+        PrepaymentStrategy("Gotovinski", cash_loan=[Prepayment(12, 20000)]),
+        PrepaymentStrategy(
+            "Gotovinski pa stambeni",
+            cash_loan=[Prepayment(1, 500, every=1)],
+            rollover=True,
+        ),
+    ]
+    ranked = simulator.compare(strategies)
+    assert [r.net_saved for r in ranked] == sorted(
+        (r.net_saved for r in ranked), reverse=True
+    )
+    assert simulator.baseline.interest_saved == 0.0
+
+    rolled = next(r for r in ranked if r.strategy.rollover)
+    assert rolled.mortgage.prepaid > 0
+    assert rolled.mortgage.installments < 360
+    assert simulator.compare(strategies, workers=2) == ranked
@@ -0,0 +1,73 @@
+"""Tests for scenarios.py"""
+
+import pytest
+
+from benchmark import generate_inputs
+from loan import InputValidator, LoanCalculator
+from scenarios import ScenarioSet
+
+
+def make_scenarios(count=4):
+    scenarios = ScenarioSet()
+    for i, record in enumerate(generate_inputs(count)):
+        scenarios.add(f"S{i}", InputValidator.validate_inputs(record))
+    return scenarios
+
+
+def test_results_match_scalar_summary():
+    calculator = LoanCalculator()
+    scenarios = make_scenarios()
+    for name, results in zip(scenarios, scenarios.evaluate(calculator)):
+        v = scenarios.inputs(name)
+        assert results == calculator.calculate_loan_summary(
+            calculator.calculate_property_costs(
+                v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+            ),
+            v["down_payment"],
+            v["advance_percentage"],
+            v["mortgage_rate"],
+            v["mortgage_years"],
+            v["cash_loan_rate"],
+            v["cash_loan_years"],
+        )
+
+
+@pytest.mark.parametrize("baseline", [None, "S2"])
+def test_deltas_are_against_the_baseline(baseline):
+    comparisons = make_scenarios().compare(baseline)
+    base = next(c for c in comparisons if c.is_baseline)
+    assert base.name == (baseline or "S0")
+    assert [c.is_baseline for c in comparisons].count(True) == 1
+    assert all(delta == 0 for delta in base.deltas)
+    for comparison in comparisons:
+        for value, delta, base_value in zip(
+            comparison.results, comparison.deltas, base.results
+        ):
+            assert delta == value - base_value
+
+
+def test_add_replaces_and_remove_keeps_columns_aligned():
+    scenarios = make_scenarios()
+    replacement = InputValidator.validate_inputs(generate_inputs(9)[8])
+    scenarios.add("S1", replacement)
+    scenarios.remove("S0")
+    snapshot = scenarios.copy()
+    scenarios.remove("S3")
+
+    assert list(scenarios) == ["S1", "S2"]
+    assert scenarios.inputs("S1") == replacement
+    assert list(snapshot) == ["S1", "S2", "S3"]
+    assert all(len(column) == 3 for column in snapshot.columns.values())
+    assert ScenarioSet().compare() == []
+
+
+def test_inputs_round_trip_with_validator_types():
+    scenarios = make_scenarios(2)
+    validated = InputValidator.validate_inputs(generate_inputs(1)[0])
+    scenarios.add("S1", validated)
+    for snapshot in (scenarios, scenarios.copy()):
+        inputs = snapshot.inputs("S1")
+        assert inputs == validated
+        assert {key: type(value) for key, value in inputs.items()} == {
+            key: type(value) for key, value in validated.items()
+        }
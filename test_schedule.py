@@ -0,0 +1,60 @@
+"""Tests for schedule.py"""
+
+import pytest
+
+from loan import LoanCalculator
+from schedule import LazySchedule, build_schedule, iter_schedule
+
+LOANS = [(344680.76, 0.0289, 30), (66170.19, 0.045, 7), (12000, 0.0, 2)]
+
+
+@pytest.mark.parametrize("principal, rate, years", LOANS)
+def test_schedule_closes_at_zero_and_adds_up(principal, rate, years):
+    rows = list(iter_schedule(principal, rate, years))
+    details = LoanCalculator().calculate_loan_details(principal, rate, years)
+
+    assert [row.month for row in rows] == list(range(1, years * 12 + 1))
+    assert rows[-1].balance == 0.0
+    assert sum(row.principal for row in rows) == pytest.approx(principal)
+    assert sum(row.payment for row in rows) == pytest.approx(details.total_payment)
+    assert sum(row.interest for row in rows) == pytest.approx(details.total_interest)
+
+
+def test_build_schedule_matches_generator():
+    principal, rate, years = LOANS[0]
+    assert list(build_schedule(principal, rate, years)) == list(
+        iter_schedule(principal, rate, years)
+    )
+
+
+def test_empty_loan_has_no_rows():
+    assert list(iter_schedule(0, 0.03, 10)) == []
+    assert len(build_schedule(0, 0.03, 10)) == 0
+
+
+@pytest.mark.parametrize("principal, rate, years", LOANS)
+def test_lazy_schedule_matches_generator(principal, rate, years):
+    lazy = LazySchedule(principal, rate, years)
+    rows = list(iter_schedule(principal, rate, years))
+
+    assert len(lazy) == len(rows)
+    for expected, row in zip(rows, lazy.rows(0, len(lazy))):
+        assert row.month == expected.month
+        assert row[1:] == pytest.approx(expected[1:], abs=1e-6)
+    assert lazy[-1] == lazy[len(lazy) - 1]
+    assert lazy[-1].balance == 0.0
+
+    interest = 0.0
+    for month, row in enumerate(rows, 1):
+        interest += row.interest
+        if month % 37 == 0 or month == len(rows):
+            assert lazy.cumulative_interest(month) == pytest.approx(interest)
+
+
+def test_lazy_schedule_windows_are_clipped():
+    lazy = LazySchedule(100000, 0.03, 1)
+    assert [row.month for row in lazy.rows(-5, 3)] == [1, 2, 3]
+    assert [row.month for row in lazy.rows(10, 100)] == [11, 12]
+    with pytest.raises(IndexError):
+        lazy[12]
+    assert len(LazySchedule(0, 0.03, 10)) == 0
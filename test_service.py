@@ -0,0 +1,171 @@
+"""Tests for service.py"""
+
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from batch import validate_record
+from benchmark import generate_inputs
+from loan import LoanCalculator
+from service import LoanService
+
+
+def run_with_batcher(service, coroutine):
+    async def main():
+        task = asyncio.create_task(service.batcher.run())
+        try:
+            return await coroutine
+        finally:
+            task.cancel()
+
+    return asyncio.run(main())
+
+
+def expected(record):
+    calculator = LoanCalculator()
+    v = validate_record(record)
+    return calculator.calculate_loan_summary(
+        calculator.calculate_property_costs(
+            v["price_per_sqm"], v["total_sqm"], v["parking_price"]
+        ),
+        v["down_payment"],
+        v["advance_percentage"],
+        v["mortgage_rate"],
+        v["mortgage_years"],
+        v["cash_loan_rate"],
+        v["cash_loan_years"],
+    )._asdict()
+
+
+def test_concurrent_requests_share_one_batch():
+    service = LoanService(LoanCalculator())
+    records = generate_inputs(8)
+
+    async def requests():
+        return await asyncio.gather(
+            *(service.calculate(json.dumps(record).encode()) for record in records)
+        )
+
+    responses = run_with_batcher(service, requests())
+    assert [status for status, _ in responses] == [HTTPStatus.OK] * 8
+    assert [payload for _, payload in responses] == [expected(r) for r in records]
+    assert service.metrics.batches == 1
+    assert service.metrics.snapshot()["mean_batch_size"] == 8
+
+
+def test_bad_requests_are_rejected():
+    service = LoanService(LoanCalculator())
+    record = generate_inputs(1)[0]
+
+    async def requests():
+        return [
+            await service.calculate(b"{"),
+            await service.calculate(b"[1, 2]"),
+            await service.calculate(
+                json.dumps(dict(record, ukupno_kvadrata="abc")).encode()
+            ),
+            await service.calculate(json.dumps([record, record]).encode()),
+        ]
+
+    statuses = [status for status, _ in run_with_batcher(service, requests())]
+    assert statuses == [
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.UNPROCESSABLE_ENTITY,
+        HTTPStatus.OK,
+    ]
+
+
+def exchange(service, request: bytes) -> bytes:
+    """Send raw request bytes to handle_connection and return the response"""
+
+    async def main():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            response = await reader.read()
+            writer.close()
+            return response
+
+    return run_with_batcher(service, main())
+
+
+def post(body: bytes) -> bytes:
+    return (
+        b"POST /calculate HTTP/1.1\r\nConnection: close\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+
+
+def test_http_round_trip():
+    service = LoanService(LoanCalculator())
+    record = generate_inputs(1)[0]
+
+    head, _, body = exchange(service, post(json.dumps(record).encode())).partition(
+        b"\r\n\r\n"
+    )
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert json.loads(body) == expected(record)
+
+
+@pytest.mark.parametrize(
+    "request_bytes",
+    [
+        b"GARBAGE\r\n\r\n",
+        b"POST /calculate HTTP/1.1\r\nContent-Length: many\r\n\r\n",
+        b"POST /calculate HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+    ],
+)
+def test_malformed_http_gets_a_json_400(request_bytes):
+    service = LoanService(LoanCalculator())
+    head, _, body = exchange(service, request_bytes).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400 Bad Request")
+    assert "error" in json.loads(body)
+    assert service.metrics.errors == 1
+
+
+def test_unexpected_errors_get_a_logged_json_500(caplog):
+    service = LoanService(LoanCalculator())
+
+    async def broken(method, path, body):
+        raise RuntimeError("boom")
+
+    service.route = broken
+    head, _, body = exchange(service, post(b"{}")).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 500 Internal Server Error")
+    assert "error" in json.loads(body)
+    assert "boom" in caplog.text
+
+
+class FailingCalculator(LoanCalculator):
+    def calculate_property_costs(self, price_per_sqm, total_sqm, parking_price):
+        if total_sqm > 150:
+            raise ArithmeticError("too large")
+        return super().calculate_property_costs(price_per_sqm, total_sqm, parking_price)
+
+
+def test_failing_record_does_not_fail_its_batch(caplog):
+    service = LoanService(FailingCalculator())
+    good, bad = generate_inputs(2)
+    good["ukupno_kvadrata"], bad["ukupno_kvadrata"] = "60", "180"
+
+    async def requests():
+        return await asyncio.gather(
+            service.calculate(json.dumps(good).encode()),
+            service.calculate(json.dumps(bad).encode()),
+        )
+
+    (good_status, good_payload), (bad_status, bad_payload) = run_with_batcher(
+        service, requests()
+    )
+    assert service.metrics.batches == 1
+    assert good_status == HTTPStatus.OK
+    assert good_payload == expected(good)
+    assert bad_status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert bad_payload == {"error": "Greška u izračunu: too large"}
+    assert "too large" in caplog.text
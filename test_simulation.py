@@ -0,0 +1,49 @@
+"""Tests for simulation.py"""
+
+import pytest
+
+from simulation import METRICS, SimulationSetup, simulate
+
+
+def make_setup(**overrides) -> SimulationSetup:
+    options = dict(
+        mortgage_amount=250000,
+        mortgage_rate=0.0289,
+        mortgage_years=30,
+        fixed_years=5,
+        margin=0.015,
+        cash_loan_amount=30000,
+        cash_loan_rate=0.045,
+        cash_loan_years=7,
+    )
+    options.update(overrides)
+    return SimulationSetup(**options)
+
+
+def test_floating_from_month_one_has_dispersion():
+    setup = make_setup(fixed_years=0)
+    path = setup.mortgage_path([0.01, 0.02, 0.03] + [0.04] * 27)
+    assert path[0].annual_rate == pytest.approx(setup.model.initial + setup.margin)
+    assert [period.annual_rate for period in path[1:4]] == pytest.approx(
+        [0.025, 0.035, 0.045]
+    )
+
+    quantiles = simulate(setup, paths=400, chunk_size=200, workers=1).quantiles()
+    for metric in METRICS:
+        assert quantiles[metric][5] < quantiles[metric][95]
+
+
+@pytest.mark.parametrize("fixed_years, reset_years", [(-1, 1), (3, 2), (5, 0)])
+def test_invalid_fixed_period_is_rejected(fixed_years, reset_years):
+    with pytest.raises(ValueError):
+        make_setup(fixed_years=fixed_years, reset_years=reset_years)
+
+
+def test_results_do_not_depend_on_worker_count():
+    setup = make_setup(cash_loan_margin=0.03)
+    single = simulate(setup, paths=600, seed=7, workers=1, chunk_size=200)
+    parallel = simulate(setup, paths=600, seed=7, workers=2, chunk_size=200)
+    for metric in METRICS:
+        assert single.histograms[metric].counts == parallel.histograms[metric].counts
+        assert single.histograms[metric].total == parallel.histograms[metric].total
+    assert single.quantiles() == parallel.quantiles()
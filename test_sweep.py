@@ -0,0 +1,47 @@
+"""Tests for sweep.py"""
+
+from loan import LoanCalculator
+from sweep import SweepGrid, count_scenarios, iter_scenarios, run_sweep
+
+GRID = SweepGrid(
+    mortgage_rates=[0.0289, 0.035],
+    mortgage_years=[25, 30],
+    cash_loan_rates=[0.045],
+    cash_loan_years=[5, 10],
+    own_money=[0, 20000, 60000],
+    parking_price=15000,
+)
+
+
+def test_batches_match_scalar_calculation_in_scenario_order():
+    calculator = LoanCalculator()
+    batches = run_sweep(GRID, workers=1, chunk_size=7)
+    rows = [row for batch in batches for row in batch.rows()]
+
+    assert [row.scenario for row in rows] == list(iter_scenarios(GRID))
+    for scenario, results in rows:
+        total_price = calculator.calculate_property_costs(
+            scenario.price_per_sqm, scenario.total_sqm, scenario.parking_price
+        )
+        assert results == calculator.calculate_loan_summary(
+            total_price,
+            scenario.own_money,
+            scenario.advance_percentage,
+            scenario.mortgage_rate,
+            scenario.mortgage_years,
+            scenario.cash_loan_rate,
+            scenario.cash_loan_years,
+        )
+
+
+def test_worker_processes_give_identical_columns():
+    single = [b.results.columns for b in run_sweep(GRID, workers=1, chunk_size=50)]
+    parallel = [b.results.columns for b in run_sweep(GRID, workers=2, chunk_size=50)]
+    assert single == parallel
+
+
+def test_progress_reaches_total():
+    reports = []
+    for _ in run_sweep(GRID, workers=1, chunk_size=40, progress=reports.append):
+        pass
+    assert reports[-1].done == reports[-1].total == count_scenarios(GRID)
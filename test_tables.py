@@ -0,0 +1,74 @@
+"""Tests for tables.py"""
+
+import pytest
+
+from catalog import get_catalog
+from loan import LoanCalculator
+from tables import PaymentTable, TableGrid, build_tables
+
+GRID = TableGrid(
+    mortgage_rates=[0.025, 0.03, 0.035],
+    mortgage_years=(20, 30),
+    own_money=[0.0, 20000.0, 40000.0],
+)
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tables") / "payment_tables.bin")
+    build_tables(path, GRID)
+    with PaymentTable(path) as table:
+        yield table
+
+
+def summary(name, unit_type, rate, years, own):
+    calculator = LoanCalculator()
+    for unit in get_catalog().iter_units():
+        if unit[:2] == (name, unit_type):
+            _, _, area, updates = unit
+            break
+    total_price = calculator.calculate_property_costs(
+        float(updates["cijena_po_kvadratu"]), float(area), GRID.parking_price
+    )
+    return calculator.calculate_loan_summary(
+        total_price,
+        own,
+        float(updates["postotak_za_kaparu"]),
+        rate,
+        years,
+        GRID.cash_loan_rate,
+        GRID.cash_loan_years,
+    )
+
+
+def test_grid_points_are_stored_exactly(table):
+    for name, unit_type, _, _ in get_catalog().iter_units():
+        for point in [(0.025, 20, 0.0), (0.035, 30, 40000.0), (0.03, 20, 20000.0)]:
+            assert table.lookup(name, unit_type, *point) == summary(
+                name, unit_type, *point
+            )
+
+
+def test_lookup_interpolates_between_grid_points(table):
+    name, unit_type, _, _ = next(get_catalog().iter_units())
+    between = table.lookup(name, unit_type, 0.0275, 30, 10000.0)
+    corners = [
+        table.lookup(name, unit_type, rate, 30, own)
+        for rate in (0.025, 0.03)
+        for own in (0.0, 20000.0)
+    ]
+    for field, value in zip(between._fields, between):
+        assert value == pytest.approx(
+            sum(getattr(corner, field) for corner in corners) / 4
+        ), field
+
+
+def test_out_of_grid_and_foreign_files_are_rejected(table, tmp_path):
+    name, unit_type, _, _ = next(get_catalog().iter_units())
+    with pytest.raises(ValueError):
+        table.lookup(name, unit_type, 0.05, 30, 0.0)
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a table file")
+    with pytest.raises(ValueError):
+        PaymentTable(str(other))
@@ -0,0 +1,76 @@
+"""Tests for variable_rate.py"""
+
+import pytest
+
+from loan import AnnuityFactorCache, LoanCalculator
+from variable_rate import RatePeriod, VariableRateCalculator, rate_path
+
+PATHS = [
+    rate_path(0.0289, 5, [0.03, 0.045, 0.02], margin=0.015),
+    rate_path(0.0289, 3, [0.0, 0.01], reset_years=2),
+    rate_path(0.04, 10),
+]
+
+
+@pytest.mark.parametrize(
+    "principal, rate, years", [(250000, 0.0289, 30), (9000, 0.0, 3)]
+)
+def test_single_period_matches_calculate_loan_details(principal, rate, years):
+    result = VariableRateCalculator().calculate(principal, [RatePeriod(1, rate)], years)
+    details = LoanCalculator().calculate_loan_details(principal, rate, years)
+    assert result.monthly_payment == details.monthly_payment
+    assert result.total_payment == pytest.approx(details.total_payment)
+    assert result.total_interest == pytest.approx(details.total_interest)
+
+
+@pytest.mark.parametrize("periods", PATHS)
+def test_closed_form_matches_monthly_schedule(periods):
+    calculator = VariableRateCalculator()
+    result = calculator.calculate(250000, periods, 30)
+    rows = list(calculator.iter_schedule(250000, periods, 30))
+
+    assert len(rows) == 360
+    assert rows[-1].balance == 0.0
+    assert sum(row.principal for row in rows) == pytest.approx(250000)
+    assert sum(row.payment for row in rows) == pytest.approx(result.total_payment)
+    for period, payment in zip(periods, result.payments):
+        # Every period's first installment is its recalculated annuity
+        assert rows[period.start_month - 1].payment == pytest.approx(payment)
+
+
+def test_batch_matches_scalar():
+    calculator = VariableRateCalculator()
+    batch = calculator.calculate_batch([250000, 0, 120000], PATHS, [30, 30, 20])
+    for i, (principal, years) in enumerate([(250000, 30), (0, 30), (120000, 20)]):
+        scalar = calculator.calculate(principal, PATHS[i], years)
+        assert batch.first_payment[i] == pytest.approx(scalar.monthly_payment)
+        assert batch.max_payment[i] == pytest.approx(max(scalar.payments))
+        assert batch.total_interest[i] == pytest.approx(scalar.total_interest)
+
+
+@pytest.mark.parametrize(
+    "periods",
+    [
+        [RatePeriod(2, 0.03)],
+        [RatePeriod(1, 0.03), RatePeriod(1, 0.04)],
+        [RatePeriod(1, 0.03), RatePeriod(400, 0.04)],
+        [RatePeriod(1, -0.01)],
+    ],
+)
+def test_invalid_rate_paths_are_rejected(periods):
+    with pytest.raises(ValueError):
+        VariableRateCalculator().calculate(100000, periods, 30)
+
+
+def test_schedule_uses_the_calculator_annuity_factor():
+    calculator = LoanCalculator(AnnuityFactorCache())
+    variable = VariableRateCalculator(calculator)
+    periods = rate_path(0.0289, 5, [0.03, 0.0])
+    rows = list(variable.iter_schedule(250000, periods, 30))
+
+    assert rows[0].payment == calculator.calculate_loan_details(
+        250000, 0.0289, 30
+    ).monthly_payment
+    # Both rate periods with interest go through the shared cache
+    assert calculator.cache.stats().misses == 2
+    assert rows[-1].balance == 0.0
@@ -0,0 +1,36 @@
+"""Tests for widgets.py helpers that do not need a display"""
+
+import pytest
+
+from cents import ExactLoanCalculator
+from schedule import LazySchedule
+from widgets import downsample
+
+
+def test_downsample_is_bounded_and_ends_with_the_loan():
+    schedule = LazySchedule(250000, 0.0289, 30)
+    points = downsample(schedule, span=360, samples=50)
+
+    assert len(points) <= 51
+    months = [month for month, _, _ in points]
+    assert months == sorted(set(months))
+    assert months[0] == 0 and months[-1] == 360
+    assert points[0][1:] == (250000, 0)
+    assert points[-1][1] == 0.0
+    for month, balance, interest in points:
+        assert balance == pytest.approx(schedule.balance(month))
+        assert interest == pytest.approx(schedule.cumulative_interest(month))
+
+
+def test_shorter_loan_stops_at_its_last_month():
+    schedule = LazySchedule(30000, 0.045, 7)
+    months = [month for month, _, _ in downsample(schedule, span=360, samples=40)]
+    assert max(months) == 84
+    assert 84 in months
+
+
+def test_cent_schedule_and_empty_loan():
+    schedule = ExactLoanCalculator().schedule(30000, 0.045, 7)
+    assert downsample(schedule, span=84, samples=500)[-1][1] == 0
+    assert len(downsample(schedule, span=84, samples=500)) == 85
+    assert downsample(LazySchedule(0, 0.03, 10), span=120, samples=10) == []
@@ -0,0 +1,236 @@
+"""Variable-rate loans: a fixed period followed by periodic rate resets
+
+At every reset the annuity is recalculated on the remaining balance over
+the remaining term, as Croatian banks do for index-linked stambeni krediti.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence
+
+from loan import ArrayLike, LoanCalculator, _broadcast
+from schedule import ScheduleRow
+
+
+class RatePeriod(NamedTuple):
+    """Annual rate (as decimal) in effect from installment start_month on"""
+
+    start_month: int
+    annual_rate: float
+
+
+RatePath = Sequence[RatePeriod]
+
+
+def rate_path(
+    fixed_rate: float,
+    fixed_years: int,
+    floating_rates: Sequence[float] = (),
+    margin: float = 0.0,
+    reset_years: int = 1,
+) -> List[RatePeriod]:
+    """
+    Build a fixed-then-floating rate path
+    Args:
+        fixed_rate: Rate during the fixed period
+        fixed_years: Length of the fixed period
+        floating_rates: Index value for each reset after the fixed period;
+            the last one stays in effect until the end of the term
+        margin: Added to every index value
+        reset_years: Years between resets
+    """
+    periods = [RatePeriod(1, fixed_rate)]
+    for reset, index_rate in enumerate(floating_rates):
+        start_month = (fixed_years + reset * reset_years) * 12 + 1
+        periods.append(RatePeriod(start_month, index_rate + margin))
+    return periods
+
+
+def _period_lengths(periods: RatePath, months: int) -> List[int]:
+    """Installments covered by each period, validating the path"""
+    if not periods or periods[0].start_month != 1:
+        raise ValueError("Rate path must start at month 1")
+    lengths = []
+    for period, following in zip(periods, list(periods[1:]) + [None]):
+        if period.annual_rate < 0:
+            raise ValueError(
+                f"Negative rate in period from month {period.start_month}"
+            )
+        end = months + 1 if following is None else following.start_month
+        if not period.start_month < end <= months + 1:
+            raise ValueError(
+                f"Rate periods must increase and fit in {months} months"
+            )
+        lengths.append(end - period.start_month)
+    return lengths
+
+
+class VariableRateResult(NamedTuple):
+    """Totals of a variable-rate loan"""
+
+    payments: tuple  # Monthly annuity of each rate period
+    total_payment: float
+    total_interest: float
+
+    @property
+    def monthly_payment(self) -> float:
+        """Annuity during the first (fixed) period"""
+        return self.payments[0]
+
+    @property
+    def max_monthly_payment(self) -> float:
+        return max(self.payments)
+
+
+@dataclass
+class VariableRateBatchResult:
+    """Columnar totals, one entry per evaluated rate path"""
+
+    first_payment: array
+    max_payment: array
+    total_payment: array
+    total_interest: array
+
+    def __len__(self) -> int:
+        return len(self.total_payment)
+
+
+class VariableRateCalculator:
+    """
+    Closed-form variable-rate amortization. Between resets the balance
+    follows B_k = B * g^k - A * (g^k - 1) / i, so each period costs two
+    growth factors instead of a loop over its months.
+    """
+
+    def __init__(self, calculator: Optional[LoanCalculator] = None):
+        self.calculator = calculator or LoanCalculator()
+
+    def _amortize(
+        self,
+        principal: float,
+        periods: RatePath,
+        months: int,
+        growth: Callable[[float, int], float],
+    ) -> VariableRateResult:
+        lengths = _period_lengths(periods, months)
+        balance = principal
+        remaining = months
+        payments = []
+        total_payment = 0.0
+
+        for period, length in zip(periods, lengths):
+            monthly_rate = period.annual_rate / 12
+            if monthly_rate > 0:
+                term_growth = growth(monthly_rate, remaining)
+                payment = balance * (monthly_rate * term_growth) / (term_growth - 1)
+                if length < remaining:
+                    period_growth = growth(monthly_rate, length)
+                    balance = (
+                        balance * period_growth
+                        - payment * (period_growth - 1) / monthly_rate
+                    )
+            else:
+                payment = balance / remaining
+                balance -= payment * length
+            payments.append(payment)
+            total_payment += payment * length
+            remaining -= length
+
+        return VariableRateResult(
+            tuple(payments), total_payment, total_payment - principal
+        )
+
+    def calculate(
+        self, principal: float, periods: RatePath, years: int
+    ) -> VariableRateResult:
+        """
+        Totals of a variable-rate loan
+        Args:
+            principal: Loan amount
+            periods: Rate path, e.g. from rate_path()
+            years: Loan term in years
+        A single-period path gives the same values as calculate_loan_details.
+        """
+        if principal == 0:
+            return VariableRateResult((0.0,) * len(periods), 0.0, 0.0)
+        return self._amortize(
+            principal, periods, years * 12, self.calculator.cache.growth
+        )
+
+    def calculate_batch(
+        self, principals: ArrayLike, rate_paths: Sequence[RatePath], years: ArrayLike
+    ) -> VariableRateBatchResult:
+        """
+        Evaluate many rate-path assumptions in one call
+        principals and years may be scalars applied to every path.
+        """
+        principals, years = _broadcast(principals, years)
+        if len(principals) == 1:
+            principals = principals * len(rate_paths)
+            years = years * len(rate_paths)
+        if len(principals) != len(rate_paths):
+            raise ValueError(
+                f"Got {len(rate_paths)} rate paths for {len(principals)} loans"
+            )
+
+        size = len(rate_paths)
+        result = VariableRateBatchResult(
+            array("d", bytes(8 * size)),
+            array("d", bytes(8 * size)),
+            array("d", bytes(8 * size)),
+            array("d", bytes(8 * size)),
+        )
+        # Simulated paths rarely repeat a rate, so keep their growth factors
+        # in a per-batch dict instead of churning the shared LRU cache
+        growth_factors = {}
+
+        def growth(monthly_rate: float, months: int) -> float:
+            key = (monthly_rate, months)
+            factor = growth_factors.get(key)
+            if factor is None:
+                factor = growth_factors[key] = (1 + monthly_rate) ** months
+            return factor
+
+        for i, periods in enumerate(rate_paths):
+            if principals[i] == 0:
+                continue
+            details = self._amortize(
+                principals[i], periods, int(years[i] * 12), growth
+            )
+            result.first_payment[i] = details.payments[0]
+            result.max_payment[i] = max(details.payments)
+            result.total_payment[i] = details.total_payment
+            result.total_interest[i] = details.total_interest
+        return result
+
+    def iter_schedule(
+        self, principal: float, periods: RatePath, years: int
+    ) -> Iterator[ScheduleRow]:
+        """
+        Lazily yield the month-by-month schedule. The annuity is recomputed
+        from the running balance at each reset and the final installment
+        closes the loan at exactly zero.
+        """
+        if principal <= 0:
+            return
+        months = years * 12
+        lengths = _period_lengths(periods, months)
+        balance = principal
+        month = 0
+
+        for period, length in zip(periods, lengths):
+            remaining = months - month
+            monthly_rate = period.annual_rate / 12
+            # remaining / 12 * 12 == remaining exactly for any realistic term
+            payment = balance * self.calculator.payment_factor(
+                period.annual_rate, remaining / 12
+            )
+            for _ in range(length):
+                month += 1
+                interest = balance * monthly_rate
+                if month == months:
+                    yield ScheduleRow(month, interest + balance, interest, balance, 0.0)
+                    return
+                principal_part = payment - interest
+                balance -= principal_part
+                yield ScheduleRow(month, payment, interest, principal_part, balance)
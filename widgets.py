@@ -0,0 +1,368 @@
+"""Reusable Tk widgets for the calculator's result panels"""
+
+import tkinter as tk
+import tkinter.ttk as ttk
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from schedule import LazySchedule
+
+LOANS = (("stambeni", "Stambeni"), ("gotovinski", "Gotovinski"))
+
+
+class ScheduleTable(tk.Frame):
+    """
+    Month-by-month schedule view. Only visible_rows rows of labels are ever
+    created; scrolling rewrites their text from a LazySchedule, so a
+    480-month loan costs the same to show and scroll as a 12-month one.
+    """
+
+    COLUMNS = ("Mjesec", "Rata", "Kamata", "Glavnica", "Ostatak duga")
+
+    def __init__(
+        self,
+        parent: tk.Widget,
+        visible_rows: int = Config.SCHEDULE_VIEW["visible_rows"],
+    ):
+        super().__init__(parent, bg=Config.STYLES["bg_color"])
+        self.visible_rows = visible_rows
+        self.schedules: Dict[str, LazySchedule] = {}
+        self.top = 0
+        self.loan = tk.StringVar(master=self, value=LOANS[0][0])
+
+        font = (Config.STYLES["font_family"], Config.STYLES["font_size"])
+        width = Config.SCHEDULE_VIEW["column_width"]
+
+        selector = tk.Frame(self, bg=Config.STYLES["bg_color"])
+        selector.grid(row=0, column=0, columnspan=len(self.COLUMNS), sticky="w")
+        for value, text in LOANS:
+            tk.Radiobutton(
+                selector,
+                text=text,
+                value=value,
+                variable=self.loan,
+                command=self.on_loan_changed,
+                bg=Config.STYLES["bg_color"],
+                font=font,
+            ).pack(side=tk.LEFT, padx=5)
+
+        for column, title in enumerate(self.COLUMNS):
+            tk.Label(
+                self,
+                text=title,
+                width=width,
+                anchor="e",
+                bg=Config.STYLES["bg_color"],
+                fg=Config.STYLES["text_color"],
+                font=font + ("bold",),
+            ).grid(row=1, column=column, padx=2, pady=(5, 2))
+
+        # Fixed pool of cells, reused for whichever rows are in view
+        self.cells: List[List[tk.Label]] = []
+        self.texts: List[List[str]] = []
+        for slot in range(visible_rows):
+            row = []
+            for column in range(len(self.COLUMNS)):
+                label = tk.Label(
+                    self,
+                    text="",
+                    width=width,
+                    anchor="e",
+                    bg=Config.STYLES["bg_color"],
+                    font=font,
+                )
+                label.grid(row=slot + 2, column=column, padx=2)
+                row.append(label)
+            self.cells.append(row)
+            self.texts.append([""] * len(self.COLUMNS))
+
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self.on_scrollbar
+        )
+        self.scrollbar.grid(
+            row=2, column=len(self.COLUMNS), rowspan=visible_rows, sticky="ns"
+        )
+
+        step = Config.SCHEDULE_VIEW["wheel_rows"]
+        for widget in [self] + [label for row in self.cells for label in row]:
+            widget.bind("<MouseWheel>", self.on_mousewheel)
+            widget.bind("<Button-4>", lambda event: self.scroll_to(self.top - step))
+            widget.bind("<Button-5>", lambda event: self.scroll_to(self.top + step))
+
+        self.render()
+
+    @property
+    def schedule(self) -> Optional[LazySchedule]:
+        return self.schedules.get(self.loan.get())
+
+    def set_schedules(self, schedules: Dict[str, LazySchedule]):
+        """Show new schedules, keeping the scroll position where possible"""
+        self.schedules = schedules
+        self.scroll_to(self.top)
+
+    def clear(self):
+        self.set_schedules({})
+
+    def on_loan_changed(self):
+        self.scroll_to(0)
+
+    def scroll_to(self, top: int):
+        """Scroll so that row top (0-based) is the first one shown"""
+        length = len(self.schedule) if self.schedule else 0
+        self.top = max(0, min(top, length - self.visible_rows))
+        self.render()
+
+    def on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, unit)"""
+        if action == "moveto":
+            length = len(self.schedule) if self.schedule else 0
+            self.scroll_to(round(float(amount) * length))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def on_mousewheel(self, event):
+        step = Config.SCHEDULE_VIEW["wheel_rows"]
+        self.scroll_to(self.top - step if event.delta > 0 else self.top + step)
+
+    def render(self):
+        """Fill the cell pool with the rows in view"""
+        schedule = self.schedule
+        length = len(schedule) if schedule else 0
+        for slot in range(self.visible_rows):
+            index = self.top + slot
+            if index < length:
+                row = schedule[index]
+                texts = (
+                    str(row.month),
+                    f"{row.payment:.2f}",
+                    f"{row.interest:.2f}",
+                    f"{row.principal:.2f}",
+                    f"{row.balance:.2f}",
+                )
+            else:
+                texts = ("",) * len(self.COLUMNS)
+
+            for column, text in enumerate(texts):
+                # Only touch Tk for cells whose text actually changed
+                if self.texts[slot][column] != text:
+                    self.texts[slot][column] = text
+                    self.cells[slot][column].config(text=text)
+
+        if length:
+            self.scrollbar.set(
+                self.top / length, min(self.top + self.visible_rows, length) / length
+            )
+        else:
+            self.scrollbar.set(0, 1)
+
+
+def downsample(
+    schedule: LazySchedule, span: int, samples: int
+) -> List[Tuple[int, float, float]]:
+    """
+    (month, balance, cumulative interest) at about samples evenly spaced
+    months over 0..span, evaluated in closed form; the loan's last month is
+    always included so the lines end exactly where the loan does
+    """
+    months = len(schedule)
+    if not months:
+        return []
+    samples = max(min(samples, span), 1)
+    points = sorted(
+        {min(round(span * i / samples), months) for i in range(samples + 1)}
+        | {months}
+    )
+    return [
+        (month, schedule.balance(month), schedule.cumulative_interest(month))
+        for month in points
+    ]
+
+
+class BalanceChart(tk.Canvas):
+    """
+    Remaining balance (solid) and cumulative interest (dashed) of both
+    loans over time. Every canvas item is created once; redraws only move
+    line coordinates and change label text, with at most one point per
+    pixel column however long the schedules are.
+    """
+
+    def __init__(self, parent: tk.Widget):
+        style = Config.CHART
+        super().__init__(
+            parent,
+            width=style["width"],
+            height=style["height"],
+            bg=style["bg_color"],
+            highlightthickness=0,
+        )
+        self.schedules: Dict[str, LazySchedule] = {}
+        self.size = (style["width"], style["height"])
+        font = (Config.STYLES["font_family"], style["font_size"])
+
+        self.axes = self.create_line(0, 0, 0, 0, 0, 0, fill=style["axis_color"])
+        self.y_label = self.create_text(0, 0, anchor="w", font=font)
+        self.x_label = self.create_text(0, 0, anchor="e", font=font)
+        self.lines = {}
+        for loan, text in LOANS:
+            color = style["colors"][loan]
+            self.lines[loan, "balance"] = self.create_line(
+                0, 0, 0, 0, fill=color, width=2, state="hidden"
+            )
+            self.lines[loan, "interest"] = self.create_line(
+                0, 0, 0, 0, fill=color, width=2, dash=(4, 2), state="hidden"
+            )
+        self.legend = [
+            self.create_text(
+                0, 0, anchor="nw", font=font, fill=style["colors"][loan], text=text
+            )
+            for loan, text in LOANS
+        ] + [
+            self.create_text(
+                0, 0, anchor="nw", font=font, text="— ostatak duga   - - kamata"
+            )
+        ]
+
+        self.bind("<Configure>", self.on_resize)
+        self.redraw()
+
+    def on_resize(self, event):
+        if (event.width, event.height) != self.size:
+            self.size = (event.width, event.height)
+            self.redraw()
+
+    def set_schedules(self, schedules: Dict[str, LazySchedule]):
+        self.schedules = schedules
+        self.redraw()
+
+    def clear(self):
+        self.set_schedules({})
+
+    def redraw(self):
+        width, height = self.size
+        pad = Config.CHART["padding"]
+        left, top, right, bottom = pad, pad, width - pad // 2, height - pad
+        plot_width = max(right - left, 1)
+
+        self.coords(self.axes, left, top, left, bottom, right, bottom)
+        for i, item in enumerate(self.legend):
+            self.coords(item, left + 5 + i * 75, 4)
+
+        schedules = {
+            loan: schedule for loan, schedule in self.schedules.items() if len(schedule)
+        }
+        span = max((len(schedule) for schedule in schedules.values()), default=0)
+        y_max = max(
+            (
+                max(schedule.principal, schedule.cumulative_interest(len(schedule)))
+                for schedule in schedules.values()
+            ),
+            default=0,
+        )
+
+        self.itemconfigure(self.y_label, text=f"{y_max:,.0f} EUR" if y_max else "")
+        self.coords(self.y_label, left + 4, top + 6)
+        self.itemconfigure(
+            self.x_label, text=f"{span // 12} god." if span else ""
+        )
+        self.coords(self.x_label, right, bottom + 10)
+
+        for (loan, kind), item in self.lines.items():
+            schedule = schedules.get(loan)
+            if schedule is None or not span or not y_max:
+                self.itemconfigure(item, state="hidden")
+                continue
+            points = downsample(schedule, span, plot_width)
+            value = 1 if kind == "balance" else 2
+            flat = []
+            for point in points:
+                flat.append(left + plot_width * point[0] / span)
+                flat.append(bottom - (bottom - top) * point[value] / y_max)
+            if len(flat) < 4:
+                flat *= 2
+            self.coords(item, *flat)
+            self.itemconfigure(item, state="normal")
+
+
+class ComparisonTable(tk.Frame):
+    """
+    Scenarios side by side, one column each, with the difference to the
+    baseline next to every value. Label columns are created the first
+    time that many scenarios are shown and reused afterwards.
+    """
+
+    ROWS = (
+        ("total_price", "Ukupna cijena:"),
+        ("mortgage_amount", "Stambeni kredit:"),
+        ("cash_loan_amount", "Gotovinski kredit:"),
+        ("mortgage_monthly", "Anuitet stambeni:"),
+        ("cash_loan_monthly", "Anuitet gotovinski:"),
+        ("total_monthly", "Ukupno mjesečno:"),
+        ("mortgage_interest", "Kamata stambeni:"),
+        ("cash_loan_interest", "Kamata gotovinski:"),
+    )
+
+    def __init__(self, parent: tk.Widget):
+        super().__init__(parent, bg=Config.STYLES["bg_color"])
+        self.font = (Config.STYLES["font_family"], Config.STYLES["font_size"])
+        self.headers: List[tk.Label] = []
+        self.cells: List[List[tk.Label]] = []
+        self.texts: Dict[tk.Label, Tuple[str, str]] = {}
+
+        for row, (_, title) in enumerate(self.ROWS, start=1):
+            tk.Label(
+                self, text=title, bg=Config.STYLES["bg_color"], font=self.font
+            ).grid(row=row, column=0, padx=5, sticky="e")
+
+    def _ensure_columns(self, count: int):
+        while len(self.cells) < count:
+            column = len(self.cells) + 1
+            header = tk.Label(
+                self, bg=Config.STYLES["bg_color"], font=self.font + ("bold",)
+            )
+            header.grid(row=0, column=column, padx=5, pady=(0, 5))
+            self.headers.append(header)
+            cells = []
+            for row in range(len(self.ROWS)):
+                label = tk.Label(
+                    self, anchor="e", bg=Config.STYLES["bg_color"], font=self.font
+                )
+                label.grid(row=row + 1, column=column, padx=5, sticky="e")
+                cells.append(label)
+            self.cells.append(cells)
+
+    def _set(self, label: tk.Label, text: str, color: str):
+        if self.texts.get(label) != (text, color):
+            self.texts[label] = (text, color)
+            label.config(text=text, fg=color)
+
+    def show(self, comparisons: list):
+        """Render a list of scenarios.ScenarioComparison"""
+        self._ensure_columns(len(comparisons))
+        colors = Config.COMPARISON
+        for column, comparison in enumerate(comparisons):
+            header = self.headers[column]
+            header.grid()
+            name = comparison.name
+            self._set(
+                header,
+                f"{name} (osnova)" if comparison.is_baseline else name,
+                Config.STYLES["text_color"],
+            )
+            for label, (field, _) in zip(self.cells[column], self.ROWS):
+                label.grid()
+                value = getattr(comparison.results, field)
+                delta = getattr(comparison.deltas, field)
+                if comparison.is_baseline or abs(delta) < 0.005:
+                    text = f"{value:.2f} EUR"
+                    color = Config.STYLES["text_color"]
+                else:
+                    # Every row is an amount the borrower pays, so more is worse
+                    text = f"{value:.2f} EUR ({delta:+.2f})"
+                    color = colors["worse_color" if delta > 0 else "better_color"]
+                self._set(label, text, color)
+
+        for column in range(len(comparisons), len(self.cells)):
+            self.headers[column].grid_remove()
+            for label in self.cells[column]:
+                label.grid_remove()